@@ -0,0 +1,105 @@
+import argparse
+import random
+import time
+from typing import Callable
+
+from lab1.src.alphabet import Alphabet
+from lab1.src.caesar_cipher import CaesarCipher
+
+SIZES = {"1KB": 1024, "1MB": 1024**2, "100MB": 100 * 1024**2}
+
+
+def legacy_shift(alphabet: Alphabet, text: str, key: int) -> str:
+    """
+    Reference copy of the original character-by-character shift.
+
+    Args:
+        alphabet (Alphabet): The alphabet to shift within.
+        text (str): The text to be shifted.
+        key (int): The shift key.
+
+    Returns:
+        str: The shifted text.
+    """
+    shifted_text = ""
+    for char in text:
+        if char in alphabet.value:
+            char_index = (alphabet.value.index(char) + key) % len(alphabet.value)
+            shifted_text += alphabet.value[char_index]
+        else:
+            shifted_text += char
+    return shifted_text
+
+
+def make_text(alphabet: Alphabet, size: int, seed: int = 0) -> str:
+    """
+    Generate reproducible text mixing alphabet letters, spaces and punctuation.
+
+    Args:
+        alphabet (Alphabet): The alphabet to draw letters from.
+        size (int): The number of characters to generate.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        str: The generated text.
+    """
+    rng = random.Random(seed)
+    pool = alphabet.value + " " * 8 + ".,!?\n"
+    block = "".join(rng.choices(pool, k=min(size, 64 * 1024)))
+    return (block * (size // len(block) + 1))[:size]
+
+
+def measure(func: Callable[[], str], size: int) -> float:
+    """
+    Run func once and return its throughput.
+
+    Args:
+        func (Callable[[], str]): The operation to time.
+        size (int): The number of characters processed by func.
+
+    Returns:
+        float: Throughput in characters per second.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return size / elapsed if elapsed else float("inf")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Caesar cipher throughput in million characters per second"
+    )
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument(
+        "--legacy-limit",
+        type=int,
+        default=SIZES["1MB"],
+        help="skip the legacy implementation above this many characters",
+    )
+    parser.add_argument("--alphabet", choices=["EN", "UK"], default="EN")
+    args = parser.parse_args()
+
+    alphabet = Alphabet[args.alphabet]
+    cipher = CaesarCipher(alphabet)
+    key = 5
+
+    print(f"{'size':>6} {'legacy Mch/s':>12} {'table Mch/s':>12} {'speedup':>8}")
+    for label in args.sizes:
+        size = SIZES[label]
+        text = make_text(alphabet, size)
+        expected = None
+        legacy = None
+        if size <= args.legacy_limit:
+            legacy = measure(lambda: legacy_shift(alphabet, text, key), size)
+            expected = legacy_shift(alphabet, text, key)
+        table = measure(lambda: cipher.cipher(text, key), size)
+        if expected is not None and cipher.cipher(text, key) != expected:
+            raise SystemExit(f"{label}: output differs from the legacy shift")
+        legacy_cell = f"{legacy / 1e6:12.2f}" if legacy else f"{'skipped':>12}"
+        speedup = f"{table / legacy:7.1f}x" if legacy else f"{'-':>8}"
+        print(f"{label:>6} {legacy_cell} {table / 1e6:12.2f} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
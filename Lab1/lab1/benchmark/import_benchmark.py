@@ -0,0 +1,135 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from typing import NamedTuple
+
+# The cipher core must import without the GUI or process pools, and nothing may
+# pull in NumPy, which this lab does not use.
+CORE_MODULES = (
+    "lab1.src.alphabet",
+    "lab1.src.caesar_cipher",
+    "lab1.src.caesar_cracker",
+    "lab1.src.incremental",
+    "lab1.src.main",
+)
+ENTRY_MODULES = ("lab1.src.cli", "lab1.src.container", "lab1.src.service")
+CORE_FORBIDDEN = ("tkinter", "numpy", "asyncio", "multiprocessing", "concurrent")
+ENTRY_FORBIDDEN = ("tkinter", "numpy")
+DEFAULT_MAX_REGRESSION = 25.0
+
+
+class ImportResult(NamedTuple):
+    """The import cost of a module."""
+
+    milliseconds: float
+    modules: frozenset[str]
+
+
+def measure_import(module: str, repeat: int) -> ImportResult:
+    """
+    Import a module in fresh interpreters under `-X importtime`.
+
+    Args:
+        module (str): The module to import.
+        repeat (int): The number of interpreters to start; the fastest counts.
+
+    Returns:
+        ImportResult: The cumulative import time of the module and the names
+            of every module imported with it.
+    """
+    best = float("inf")
+    modules: set[str] = set()
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in completed.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            name = name.strip()
+            modules.add(name)
+            if name == module and cumulative.strip().isdigit():
+                best = min(best, int(cumulative) / 1000)
+    return ImportResult(best, frozenset(modules))
+
+
+def forbidden_imports(result: ImportResult, forbidden: tuple[str, ...]) -> list[str]:
+    """
+    Find the forbidden packages among the imported modules.
+
+    Args:
+        result (ImportResult): The measured import.
+        forbidden (tuple[str, ...]): Names of top-level packages.
+
+    Returns:
+        list[str]: The forbidden packages that were imported.
+    """
+    packages = {name.partition(".")[0] for name in result.modules}
+    return [name for name in forbidden if name in packages]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m lab1.benchmark.import_benchmark",
+        description="Measure import times and gate on forbidden imports.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="fail on regressions against this baseline")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=DEFAULT_MAX_REGRESSION,
+        help="allowed slowdown in percent",
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    failures = []
+    print(f"{'module':<32} {'ms':>8}  forbidden imports")
+    for modules, forbidden in (
+        (CORE_MODULES, CORE_FORBIDDEN),
+        (ENTRY_MODULES, ENTRY_FORBIDDEN),
+    ):
+        for module in modules:
+            result = measure_import(module, args.repeat)
+            results[module] = {"milliseconds": result.milliseconds}
+            loaded = forbidden_imports(result, forbidden)
+            if loaded:
+                failures.append(f"{module} imports {', '.join(loaded)}")
+            print(f"{module:<32} {result.milliseconds:8.1f}  {', '.join(loaded)}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        for module, timing in results.items():
+            if module not in baseline:
+                continue
+            expected = baseline[module]["milliseconds"]
+            slowdown = (timing["milliseconds"] / expected - 1) * 100
+            if slowdown > args.max_regression:
+                failures.append(f"{module}: imports {slowdown:.1f}% slower")
+    if failures:
+        print("\n".join(failures), file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from functools import partial
+from typing import Callable, NamedTuple
+
+from lab1.src.alphabet import Alphabet
+from lab1.src.caesar_cipher import CaesarCipher
+
+SIZES = {"1KB": 1024, "64KB": 64 * 1024, "1MB": 1024**2}
+MIXES = ("letters", "prose", "foreign")
+DEFAULT_MAX_REGRESSION = 10.0
+
+
+class Case(NamedTuple):
+    """A single benchmark case."""
+
+    name: str
+    func: Callable[[], object]
+    size: int
+
+
+def make_text(alphabet: Alphabet, mix: str, size: int, seed: int = 0) -> str:
+    """
+    Generate reproducible text with the given character mix.
+
+    Args:
+        alphabet (Alphabet): The alphabet to draw letters from.
+        mix (str): "letters" for alphabet characters only, "prose" for letters
+            with spaces and punctuation, "foreign" for mostly non-alphabet text.
+        size (int): The number of characters to generate.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        str: The generated text.
+    """
+    letters = alphabet.value
+    pools = {
+        "letters": letters,
+        "prose": letters + " " * 10 + ".,;!?\n",
+        "foreign": letters[:4] + "0123456789 ΑΒΓΔαβγδ中文字😀",
+    }
+    rng = random.Random(seed)
+    return "".join(rng.choices(pools[mix], k=size))
+
+
+def build_cases(sizes: list[str]) -> list[Case]:
+    """
+    Build every benchmark case.
+
+    Args:
+        sizes (list[str]): Labels of the input sizes to include.
+
+    Returns:
+        list[Case]: The benchmark cases.
+    """
+    cases = []
+    for alphabet in Alphabet:
+        cipher = CaesarCipher(alphabet)
+        for mix in MIXES:
+            for label in sizes:
+                text = make_text(alphabet, mix, SIZES[label])
+                size = len(text.encode("utf-8"))
+                encrypted = cipher.cipher(text, 5)
+                prefix = f"caesar/{alphabet.name}/{mix}/{label}"
+                cases.append(
+                    Case(f"{prefix}/cipher", partial(cipher.cipher, text, 5), size)
+                )
+                cases.append(
+                    Case(
+                        f"{prefix}/decipher",
+                        partial(cipher.decipher, encrypted, 5),
+                        size,
+                    )
+                )
+    return cases
+
+
+def run_case(case: Case, min_time: float, repeat: int) -> dict:
+    """
+    Time a case and measure its peak memory.
+
+    The case is looped until a run takes at least min_time, and the best of
+    repeat runs is kept. Peak memory is measured in a separate traced call so
+    tracing does not distort the timings.
+
+    Args:
+        case (Case): The case to run.
+        min_time (float): Minimum duration of a timed run in seconds.
+        repeat (int): The number of timed runs.
+
+    Returns:
+        dict: ops/s, MB/s and peak memory of the case.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            case.func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            case.func()
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    tracemalloc.start()
+    case.func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": 1 / best,
+        "mb_per_sec": case.size / best / 1024**2,
+        "peak_memory": peak,
+    }
+
+
+def find_regressions(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """
+    Compare results against a baseline.
+
+    Args:
+        results (dict): Results of the current run, keyed by case name.
+        baseline (dict): Results of the baseline run, keyed by case name.
+        max_regression (float): Allowed slowdown in percent.
+
+    Returns:
+        list[str]: A description of every case that slowed down too much.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]["ops_per_sec"]
+        slowdown = (1 - result["ops_per_sec"] / expected) * 100
+        if slowdown > max_regression:
+            regressions.append(f"{name}: {slowdown:.1f}% slower than baseline")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m lab1.benchmark.suite",
+        description="Benchmark the Caesar cipher and gate on a saved baseline.",
+    )
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("-k", "--filter", default="", help="run cases containing this")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="fail on regressions against this baseline")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=DEFAULT_MAX_REGRESSION,
+        help="allowed slowdown in percent",
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'case':<40} {'ops/s':>12} {'MB/s':>10} {'peak KB':>10}")
+    for case in build_cases(args.sizes):
+        if args.filter not in case.name:
+            continue
+        result = results[case.name] = run_case(case, args.min_time, args.repeat)
+        print(
+            f"{case.name:<40} {result['ops_per_sec']:12.1f} "
+            f"{result['mb_per_sec']:10.2f} {result['peak_memory'] / 1024:10.1f}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = find_regressions(results, baseline, args.max_regression)
+        if regressions:
+            print("\n".join(regressions), file=sys.stderr)
+            raise SystemExit(1)
+        print(f"No case is more than {args.max_regression}% slower than the baseline")
+
+
+if __name__ == "__main__":
+    main()
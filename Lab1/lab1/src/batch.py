@@ -0,0 +1,172 @@
+import codecs
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from lab1.src import instrumentation
+from lab1.src.alphabet import AnyAlphabet
+
+# Symbol codes are single bytes, so a text can hold at most this many distinct
+# characters, alphabet letters included, to be indexed.
+MAX_SYMBOLS = 256
+TABLE_CACHE_SIZE = 256
+# Marks unmapped bytes in charmap decoding tables, so it cannot be a symbol.
+_UNDEFINED = "\ufffe"
+
+
+class IndexedText:
+    """
+    A text mapped once to one-byte symbol codes for shifting under many keys.
+
+    Building the index is the only pass over the text that looks characters
+    up. Every key afterwards is a `bytes.translate` of the codes through a
+    256-byte table and a decode back to text, both done in C.
+
+    Texts whose characters all fit in latin-1 use their latin-1 bytes as codes
+    and decode at memory-copy speed. Other texts code the letters by their
+    index in the alphabet and every other distinct character by the codes
+    after them, and decode through a charmap table.
+
+    Attributes:
+        alphabet (AnyAlphabet): The alphabet the keys shift.
+        codes (bytes): One symbol code per character of the text.
+        symbols (str | None): The character of every code, or None when the
+            codes are latin-1.
+    """
+
+    def __init__(self, alphabet: AnyAlphabet, text: str) -> None:
+        """
+        Index a text.
+
+        Args:
+            alphabet (AnyAlphabet): The alphabet the keys shift.
+            text (str): The text to index.
+
+        Raises:
+            ValueError: If the text and the alphabet have more than MAX_SYMBOLS
+                distinct characters together.
+        """
+        self.alphabet = alphabet
+        letters = alphabet.value
+        with instrumentation.stage("lookup"):
+            try:
+                self.codes = text.encode("latin-1")
+                self._letter_codes = letters.encode("latin-1")
+                self.symbols: str | None = None
+            except UnicodeEncodeError:
+                others = "".join(sorted(set(text).difference(letters)))
+                symbols = letters + others
+                if len(symbols) > MAX_SYMBOLS or _UNDEFINED in others:
+                    raise ValueError("Text has too many distinct characters") from None
+                encoding_map = codecs.charmap_build(symbols)
+                self.codes = codecs.charmap_encode(text, "strict", encoding_map)[0]
+                self._letter_codes = bytes(range(len(letters)))
+                self.symbols = symbols
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def shift(self, key: int) -> str:
+        """
+        Shift every letter of the text by key.
+
+        Args:
+            key (int): The shift, negative to decrypt.
+
+        Returns:
+            str: The shifted text.
+        """
+        table = _code_table(self._letter_codes, key % len(self._letter_codes))
+        with instrumentation.stage("shift"):
+            shifted = self.codes.translate(table)
+        instrumentation.count("chars", len(shifted))
+        with instrumentation.stage("assemble"):
+            if self.symbols is None:
+                return shifted.decode("latin-1")
+            # A str table is the fast path of charmap_decode; typeshed only
+            # lists dict tables.
+            decoded = codecs.charmap_decode(
+                shifted, "strict", self.symbols  # type: ignore[arg-type]
+            )
+            return decoded[0]
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _code_table(letter_codes: bytes, key: int) -> bytes:
+    """
+    Build the `bytes.translate` table that shifts the codes of the letters.
+
+    Args:
+        letter_codes (bytes): The code of every letter, in alphabet order.
+        key (int): The shift, already reduced modulo the alphabet length.
+
+    Returns:
+        bytes: A 256-byte translation table.
+    """
+    return bytes.maketrans(letter_codes, letter_codes[key:] + letter_codes[:key])
+
+
+_worker_text: IndexedText | None = None
+
+
+def _init_worker(indexed: IndexedText) -> None:
+    """Keep the index of a worker process, so it is sent once per worker."""
+    global _worker_text
+    _worker_text = indexed
+
+
+def _shift_worker(key: int) -> str:
+    """Shift the index of the worker process by key."""
+    assert _worker_text is not None
+    return _worker_text.shift(key)
+
+
+def shift_many(
+    alphabet: AnyAlphabet, text: str, keys: Iterable[int], jobs: int | None = 1
+) -> Iterator[str]:
+    """
+    Shift one text by many keys, indexing the text only once.
+
+    Results are produced lazily and in key order, so memory does not grow with
+    the number of keys. Texts too varied to index are shifted key by key.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet the keys shift.
+        text (str): The text to shift.
+        keys (Iterable[int]): The shifts, negative to decrypt.
+        jobs (int | None): Worker processes; 1 shifts in this process and None
+            uses every CPU. Each worker receives the index once. Defaults to 1.
+
+    Yields:
+        str: The text shifted by each key.
+    """
+    try:
+        indexed = IndexedText(alphabet, text)
+    except ValueError:
+        letters = alphabet.value
+        for key in keys:
+            key %= len(letters)
+            yield text.translate(str.maketrans(letters, letters[key:] + letters[:key]))
+        return
+    if jobs == 1:
+        for key in keys:
+            yield indexed.shift(key)
+        return
+    # Imported here so that the cipher core does not load process pools.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(indexed,)
+    ) as executor:
+        pending: deque = deque()
+        for key in keys:
+            pending.append(executor.submit(_shift_worker, key))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+instrumentation.register_cache("code_table", _code_table)
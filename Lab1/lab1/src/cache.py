@@ -0,0 +1,335 @@
+import hashlib
+import hmac
+import io
+import json
+import os
+import secrets
+import sqlite3
+import tempfile
+import time
+from typing import BinaryIO, Callable, Iterable, NamedTuple
+
+DEFAULT_MAX_BYTES = 256 * 1024**2
+# Results are copied between files and the database this many bytes at a time.
+COPY_CHUNK_SIZE = 1024 * 1024
+SALT_BYTES = 32
+KEY_FILE_SUFFIX = ".key"
+# Bump when the output of a cipher changes, so older results are never reused.
+FORMAT_VERSION = 1
+# Seconds a writer waits for another process to release the database.
+LOCK_TIMEOUT = 30.0
+_EVICT_BATCH = 64
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a result cache, shaped like `functools` cache info."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    max_bytes: int
+
+
+class ResultCache:
+    """
+    A persistent, size-bounded LRU store of cipher results in SQLite.
+
+    Results are addressed by `key`, an HMAC-SHA256 of the digest of the input
+    and the cipher parameters under a random salt. The salt is kept in a
+    separate key file readable only by its owner, so neither the database
+    alone nor the keys in it reveal a cipher key or passphrase. The results
+    themselves are stored as they are: store only outputs that are safe to
+    keep, such as ciphertext, never decrypted plain text.
+
+    Once the stored results exceed `max_bytes`, the least recently used ones
+    are evicted. Several processes may share one database. Results are
+    streamed in and out in COPY_CHUNK_SIZE pieces.
+
+    Attributes:
+        path (str): The SQLite database file.
+        key_path (str): The file holding the salt.
+        max_bytes (int): The largest total size of the stored results.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        key_path: str | os.PathLike | None = None,
+    ) -> None:
+        """
+        Open or create the cache database and its key file.
+
+        Args:
+            path (str | os.PathLike): The SQLite database file.
+            max_bytes (int): The largest total size of the stored results.
+                Defaults to DEFAULT_MAX_BYTES.
+            key_path (str | os.PathLike | None): The file holding the salt,
+                created with owner-only permissions if it does not exist.
+                Defaults to the database path with KEY_FILE_SUFFIX appended.
+
+        Raises:
+            ValueError: If the key file does not hold a salt.
+        """
+        self.path = os.fspath(path)
+        self.key_path = (
+            self.path + KEY_FILE_SUFFIX if key_path is None else os.fspath(key_path)
+        )
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._salt = _load_salt(self.key_path)
+        self._db = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT)
+        # Readers do not block the writer, so workers can share the file.
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key BLOB PRIMARY KEY, "
+                "value BLOB NOT NULL, size INTEGER NOT NULL, used INTEGER NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS results_used ON results (used)"
+            )
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the database.
+        """
+        self._db.close()
+
+    def key(self, digest: bytes, **params) -> bytes:
+        """
+        Derive the key of a result from its input and cipher parameters.
+
+        Args:
+            digest (bytes): A digest of the input, see `text_digest` and
+                `file_digest`.
+            **params: The cipher, alphabet, key and every other setting the
+                result depends on. Values must be JSON serializable.
+
+        Returns:
+            bytes: The key, which does not reveal the parameters.
+        """
+        settings = json.dumps(
+            {"format": FORMAT_VERSION, **params}, sort_keys=True, ensure_ascii=False
+        )
+        message = digest + b"\0" + settings.encode("utf-8")
+        return hmac.new(self._salt, message, hashlib.sha256).digest()
+
+    def get(self, key: bytes) -> bytes | None:
+        """
+        Look a result up and mark it as recently used.
+
+        Args:
+            key (bytes): The key of the result.
+
+        Returns:
+            bytes | None: The result, or None if it is not stored.
+        """
+        buffer = io.BytesIO()
+        return buffer.getvalue() if self.get_file(key, buffer) else None
+
+    def get_file(self, key: bytes, writer: BinaryIO) -> bool:
+        """
+        Copy a result into a binary stream and mark it as recently used.
+
+        Args:
+            key (bytes): The key of the result.
+            writer (BinaryIO): The stream to write the result to.
+
+        Returns:
+            bool: True if the result was stored and copied.
+        """
+        # Marking the row first locks it until the copy is done, so another
+        # process cannot evict it halfway.
+        with self._db:
+            cursor = self._db.execute(
+                "UPDATE results SET used = ? WHERE key = ?", (time.time_ns(), key)
+            )
+            if not cursor.rowcount:
+                self.misses += 1
+                return False
+            (rowid,) = self._db.execute(
+                "SELECT rowid FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            with self._db.blobopen("results", "value", rowid, readonly=True) as blob:
+                while chunk := blob.read(COPY_CHUNK_SIZE):
+                    writer.write(chunk)
+        self.hits += 1
+        return True
+
+    def put(self, key: bytes, value: bytes) -> bool:
+        """
+        Store a result, evicting the least recently used ones to make room.
+
+        Args:
+            key (bytes): The key of the result.
+            value (bytes): The result.
+
+        Returns:
+            bool: True if stored, False if the result alone exceeds max_bytes.
+        """
+        return self._store(key, len(value), (value,))
+
+    def put_file(self, key: bytes, path: str | os.PathLike) -> bool:
+        """
+        Store the content of a file as a result without loading it whole.
+
+        Args:
+            key (bytes): The key of the result.
+            path (str | os.PathLike): The file holding the result.
+
+        Returns:
+            bool: True if stored, False if the file exceeds max_bytes.
+        """
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            return self._store(key, size, iter(lambda: file.read(COPY_CHUNK_SIZE), b""))
+
+    def _store(self, key: bytes, size: int, chunks: Iterable[bytes]) -> bool:
+        """
+        Write a result into a blob of its size, then evict to make room.
+
+        Args:
+            key (bytes): The key of the result.
+            size (int): The size of the result.
+            chunks (Iterable[bytes]): The result, in pieces.
+
+        Returns:
+            bool: True if stored, False if the result alone exceeds max_bytes.
+        """
+        if size > self.max_bytes:
+            return False
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, zeroblob(?), ?, ?)",
+                (key, size, size, time.time_ns()),
+            )
+            assert cursor.lastrowid is not None
+            with self._db.blobopen("results", "value", cursor.lastrowid) as blob:
+                for chunk in chunks:
+                    blob.write(chunk)
+            (total,) = self._db.execute("SELECT SUM(size) FROM results").fetchone()
+            while total > self.max_bytes:
+                oldest = self._db.execute(
+                    "SELECT key, size FROM results ORDER BY used LIMIT ?",
+                    (_EVICT_BATCH,),
+                ).fetchall()
+                for old_key, old_size in oldest:
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM results WHERE key = ?", (old_key,))
+                    total -= old_size
+                    self.evictions += 1
+        return True
+
+    def get_or_compute(self, text: str, compute: Callable[[str], str], **params) -> str:
+        """
+        Return the stored result for a text, or compute and store it.
+
+        The result is stored as it is, so use this for encryption only.
+
+        Args:
+            text (str): The input text.
+            compute (Callable[[str], str]): Computes the result of a text, such
+                as a bound `CaesarCipher.cipher` with its key applied.
+            **params: Every setting the result depends on, see `key`.
+
+        Returns:
+            str: The result.
+        """
+        key = self.key(text_digest(text), **params)
+        cached = self.get(key)
+        if cached is not None:
+            return cached.decode("utf-8", "surrogatepass")
+        result = compute(text)
+        self.put(key, result.encode("utf-8", "surrogatepass"))
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Report the statistics of this cache.
+
+        The hits and misses can be reported by `instrumentation.register_cache`.
+
+        Returns:
+            CacheInfo: Hits, misses and evictions of this instance, and the
+                stored entries and bytes of the database.
+        """
+        entries, size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, entries, size, self.max_bytes
+        )
+
+
+def _load_salt(path: str) -> bytes:
+    """
+    Read the salt of the cache keys, creating the key file if it is missing.
+
+    A new salt is written to a private temporary file and linked into place,
+    so processes starting together agree on the first salt written.
+
+    Args:
+        path (str): The key file.
+
+    Returns:
+        bytes: The salt.
+
+    Raises:
+        ValueError: If the file does not hold a salt.
+    """
+    if not os.path.exists(path):
+        # mkstemp creates the file readable and writable by its owner only.
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-"
+        )
+        try:
+            with open(fd, "wb") as file:
+                file.write(secrets.token_bytes(SALT_BYTES))
+            try:
+                os.link(temp_path, path)
+            except FileExistsError:
+                pass
+        finally:
+            os.unlink(temp_path)
+    with open(path, "rb") as file:
+        salt = file.read(SALT_BYTES + 1)
+    if len(salt) != SALT_BYTES:
+        raise ValueError(f"Cache key file {path!r} does not hold a salt")
+    return salt
+
+
+def text_digest(text: str) -> bytes:
+    """
+    Digest a text as the input of a result.
+
+    Args:
+        text (str): The input text.
+
+    Returns:
+        bytes: Its SHA-256 digest.
+    """
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+
+
+def file_digest(path: str | os.PathLike) -> bytes:
+    """
+    Digest a file as the input of a result, without loading it whole.
+
+    Args:
+        path (str | os.PathLike): The input file.
+
+    Returns:
+        bytes: Its SHA-256 digest.
+    """
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").digest()
@@ -1,8 +1,66 @@
+import queue
 import tkinter as tk
+from functools import partial
+from pathlib import Path
 from tkinter import filedialog, messagebox, simpledialog
+from typing import Callable
 
-from lab1.src.alphabet import Alphabet
+from lab1.src.alphabet import Alphabet, AnyAlphabet
+from lab1.src.background import BackgroundJob, Event, Message, Transform
 from lab1.src.caesar_cipher import CaesarCipher
+from lab1.src.caesar_cracker import DEFAULT_SAMPLE_SIZE, CaesarCracker
+from lab1.src.incremental import IncrementalSession
+from lab1.src.validation import InputReport, validate_stream, validate_text
+
+POLL_INTERVAL_MS = 50
+MESSAGES_PER_POLL = 16
+# Edits touching more characters than this are shifted on a worker thread.
+INCREMENTAL_LIMIT = 64 * 1024
+
+
+def _with_key(shift: Callable[[str, int], str], key: int) -> Transform:
+    """
+    Adapt a cipher method to the chunk transform signature of BackgroundJob.
+
+    Args:
+        shift (Callable[[str, int], str]): CaesarCipher.cipher or decipher.
+        key (int): The key to shift with.
+
+    Returns:
+        Transform: Shifts a chunk regardless of its position.
+    """
+    return lambda chunk, _: shift(chunk, key)
+
+
+def _check_text(alphabet: AnyAlphabet, text: str) -> InputReport | None:
+    """
+    Validate a text on the worker thread of a job.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet the text is shifted in.
+        text (str): The text to validate.
+
+    Returns:
+        InputReport | None: The report if the user has to confirm it.
+    """
+    report = validate_text(alphabet, text)
+    return None if report.ok else report
+
+
+def _check_file(alphabet: AnyAlphabet, path: Path) -> InputReport | None:
+    """
+    Validate a UTF-8 file on the worker thread of a job.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet the file is shifted in.
+        path (Path): The file to validate.
+
+    Returns:
+        InputReport | None: The report if the user has to confirm it.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as reader:
+        report = validate_stream(alphabet, reader)
+    return None if report.ok else report
 
 
 class CaesarApp:
@@ -15,6 +73,10 @@ class CaesarApp:
         file_menu (tk.Menu): File submenu in the menu bar.
         cipher_menu (tk.Menu): Cipher submenu in the menu bar.
         text (tk.Text): Text widget for user to input and view text.
+        status (tk.Label): Status bar showing the progress of running jobs.
+        job (BackgroundJob | None): The cipher job in progress, if any.
+        session (IncrementalSession | None): The plaintext and ciphertext of
+            the document under the last used key.
     """
 
     def __init__(self, root: tk.Tk) -> None:
@@ -26,6 +88,12 @@ class CaesarApp:
         """
         self.root = root
         self.cipher: CaesarCipher | None = None
+        self.job: BackgroundJob | None = None
+        self.session: IncrementalSession | None = None
+        self._session_key: tuple | None = None
+        self._seed_decrypt: bool | None = None
+        self._shown: str | None = None
+        self._original_text: str | None = None
         self._setup_ui()
 
     def _setup_ui(self) -> None:
@@ -39,6 +107,12 @@ class CaesarApp:
         self.menu.add_cascade(label="File", menu=self.file_menu)
         self.file_menu.add_command(label="Open...", command=self._open_file)
         self.file_menu.add_command(label="Save...", command=self._save_file)
+        self.file_menu.add_command(
+            label="Encrypt File...", command=lambda: self._process_file(False)
+        )
+        self.file_menu.add_command(
+            label="Decrypt File...", command=lambda: self._process_file(True)
+        )
         self.file_menu.add_command(label="Exit", command=self.root.quit)
 
         # Cipher menu setup
@@ -46,10 +120,17 @@ class CaesarApp:
         self.menu.add_cascade(label="Cipher", menu=self.cipher_menu)
         self.cipher_menu.add_command(label="Encrypt", command=self._encrypt_text)
         self.cipher_menu.add_command(label="Decrypt", command=self._decrypt_text)
+        self.cipher_menu.add_command(label="Crack", command=self._crack_text)
+        self.cipher_menu.add_command(label="Cancel", command=self._cancel_job)
+
+        # Status bar setup
+        self.status = tk.Label(self.root, anchor=tk.W)
+        self.status.pack(side=tk.BOTTOM, fill=tk.X)
 
         # Text widget setup
         self.text = tk.Text(self.root, wrap=tk.WORD)
         self.text.pack(expand=True, fill=tk.BOTH)
+        self.text.bind("<<Modified>>", self._on_modified)
 
         # Info menu setup
         self.info_menu = tk.Menu(self.menu)
@@ -81,6 +162,20 @@ class CaesarApp:
         with open(file_path, "w", encoding="utf-8") as file:
             file.write(self.text.get(1.0, tk.END))
 
+    def _use_cipher(self, language: Alphabet) -> CaesarCipher:
+        """
+        Return a cipher for the given alphabet, reusing the current one if possible.
+
+        Args:
+            language (Alphabet): The alphabet the cipher should use.
+
+        Returns:
+            CaesarCipher: The cipher for the alphabet.
+        """
+        if self.cipher is None or self.cipher.alphabet is not language:
+            self.cipher = CaesarCipher(language)
+        return self.cipher
+
     def _encrypt_text(self) -> None:
         """
         Encrypt the content of the text widget using the Caesar Cipher.
@@ -92,10 +187,12 @@ class CaesarApp:
                 if messagebox.askyesno("Language", "Use Ukrainian language?")
                 else Alphabet.EN
             )
-            self.cipher = CaesarCipher(language)
-            encrypted = self.cipher.cipher(self.text.get(1.0, tk.END), key)
-            self.text.delete(1.0, tk.END)
-            self.text.insert(tk.INSERT, encrypted)
+            cipher = self._use_cipher(language)
+            errors = cipher.key_errors(key)
+            if errors:
+                messagebox.showerror("Error", "\n".join(errors))
+                return
+            self._shift_text("Encrypting", cipher, key, False)
 
     def _decrypt_text(self) -> None:
         """
@@ -108,7 +205,272 @@ class CaesarApp:
                 if messagebox.askyesno("Language", "Use Ukrainian language?")
                 else Alphabet.EN
             )
-            self.cipher = CaesarCipher(language)
-            decrypted = self.cipher.decipher(self.text.get(1.0, tk.END), key)
+            cipher = self._use_cipher(language)
+            self._shift_text("Decrypting", cipher, key, True)
+
+    def _crack_text(self) -> None:
+        """
+        Decrypt the content of the text widget without a key using frequency analysis.
+        """
+        if self._job_running():
+            return
+        language = (
+            Alphabet.UK
+            if messagebox.askyesno("Language", "Use Ukrainian language?")
+            else Alphabet.EN
+        )
+        text = self.text.get(1.0, tk.END)
+        try:
+            key = CaesarCracker(language).rank(text, DEFAULT_SAMPLE_SIZE)[0].key
+        except ValueError as error:
+            messagebox.showerror("Crack", str(error))
+            return
+        cipher = self._use_cipher(language)
+        self._shift_text(f"Decrypting with key {key}", cipher, key, True)
+
+    def _process_file(self, decrypt: bool) -> None:
+        """
+        Encrypt or decrypt a file into another file on a worker thread.
+
+        The document is streamed from disk, so large files never pass through
+        the text widget.
+
+        Args:
+            decrypt (bool): Decrypt instead of encrypt.
+        """
+        if self._job_running():
+            return
+        source = filedialog.askopenfilename()
+        if not source:
+            return
+        target = filedialog.asksaveasfilename(defaultextension=".txt")
+        if not target:
+            return
+        key = simpledialog.askinteger("Key", "Enter key (integer):")
+        if key is None:
+            return
+        language = (
+            Alphabet.UK
+            if messagebox.askyesno("Language", "Use Ukrainian language?")
+            else Alphabet.EN
+        )
+        cipher = self._use_cipher(language)
+        errors = cipher.key_errors(key)
+        if errors:
+            messagebox.showerror("Error", "\n".join(errors))
+            return
+        label = "Decrypting file" if decrypt else "Encrypting file"
+        shift = cipher.decipher if decrypt else cipher.cipher
+        self._original_text = None
+        self.job = BackgroundJob()
+        self.job.start_file(
+            Path(source),
+            Path(target),
+            _with_key(shift, key),
+            partial(_check_file, language, Path(source)),
+        )
+        self.status.config(text=f"{label}: checking input...")
+        self._poll_job(label, False)
+
+    @staticmethod
+    def _confirm_input(report: InputReport) -> bool:
+        """
+        Show what the validation pre-pass of a job found and ask to go on.
+
+        Args:
+            report (InputReport): The report of the text to be shifted.
+
+        Returns:
+            bool: True if the input is clean or the user chose to go on.
+        """
+        if report.ok:
+            return True
+        return messagebox.askyesno(
+            "Check input", f"{report.summary()}\n\nContinue anyway?"
+        )
+
+    def _job_running(self) -> bool:
+        """
+        Check whether a job is still running and tell the user if it is.
+
+        Returns:
+            bool: True if a job is running.
+        """
+        if self.job is not None:
+            messagebox.showinfo("Busy", "Another operation is still running")
+            return True
+        return False
+
+    def _on_modified(self, event: tk.Event) -> None:
+        """
+        Forget the synced widget text once the user edits the document.
+
+        Args:
+            event (tk.Event): The <<Modified>> event.
+        """
+        if self.text.edit_modified():
+            self._shown = None
+            self.text.edit_modified(False)
+
+    def _show(self, text: str) -> None:
+        """
+        Replace the widget content with text the session knows.
+
+        Args:
+            text (str): The new content.
+        """
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, text)
+        self.text.edit_modified(False)
+        # Text.get(1.0, END) adds the newline that always ends a Text widget.
+        self._shown = text + "\n"
+
+    def _shift_text(
+        self, label: str, cipher: CaesarCipher, key: int, decrypt: bool
+    ) -> None:
+        """
+        Encrypt or decrypt the content of the text widget.
+
+        Only the span edited since the last operation with the same key is
+        shifted again; the rest is taken from the session. Larger changes are
+        shifted on a worker thread and seed the session when they finish.
+
+        Args:
+            label (str): Describes the operation in the status bar.
+            cipher (CaesarCipher): The cipher to shift with.
+            key (int): The key to shift with.
+            decrypt (bool): Decrypt instead of encrypt.
+        """
+        if self._job_running():
+            return
+        identity = (cipher.alphabet, key)
+        if self.session is None or self._session_key != identity:
+            self.session = IncrementalSession(
+                _with_key(cipher.cipher, key), _with_key(cipher.decipher, key)
+            )
+            self._session_key = identity
+        text = self._shown if self._shown is not None else self.text.get(1.0, tk.END)
+        update = self.session.decrypt if decrypt else self.session.encrypt
+        shifted = update(text, INCREMENTAL_LIMIT)
+        if shifted is None:
+            shift = cipher.decipher if decrypt else cipher.cipher
+            self._start_text_job(label, _with_key(shift, key), decrypt, cipher.alphabet)
+            return
+        self._show(shifted)
+        self.status.config(
+            text=f"{label}: done, {self.session.reprocessed} characters shifted"
+        )
+
+    def _start_text_job(
+        self,
+        label: str,
+        transform: Transform,
+        seed_decrypt: bool | None = None,
+        alphabet: AnyAlphabet | None = None,
+    ) -> None:
+        """
+        Process the content of the text widget on a worker thread.
+
+        Args:
+            label (str): Describes the operation in the status bar.
+            transform (Transform): Processes one chunk of the text.
+            seed_decrypt (bool | None): Whether the job decrypts for the
+                session, which is reset to the result once the job is done.
+                None leaves the session alone.
+            alphabet (AnyAlphabet | None): Validate the text against this
+                alphabet on the worker before shifting it. None skips the check.
+        """
+        if self._job_running():
+            return
+        self._seed_decrypt = seed_decrypt
+        self._original_text = self.text.get(1.0, tk.END)
+        check = None
+        if alphabet is not None:
+            check = partial(_check_text, alphabet, self._original_text)
+            self.status.config(text=f"{label}: checking input...")
+        self.job = BackgroundJob()
+        self.job.start_text(self._original_text, transform, check)
+        self._poll_job(label, True)
+
+    def _poll_job(self, label: str, clear: bool) -> None:
+        """
+        Apply queued job messages and reschedule itself until the job ends.
+
+        Processed chunks replace the widget content as they arrive. A cancelled
+        or failed text job restores the original text.
+
+        Args:
+            label (str): Describes the operation in the status bar.
+            clear (bool): Whether the widget still shows the original text.
+        """
+        job = self.job
+        if job is None:
+            return
+        for _ in range(MESSAGES_PER_POLL):
+            try:
+                message = job.messages.get_nowait()
+            except queue.Empty:
+                break
+            if message.event is Event.CHECK:
+                job.answer(self._confirm_input(message.value))
+            elif message.event is Event.CHUNK:
+                if clear:
+                    self.text.delete(1.0, tk.END)
+                    clear = False
+                self.text.insert(tk.END, str(message.value))
+            elif message.event is Event.PROGRESS:
+                done, total = message.value
+                self.status.config(text=f"{label}... {done * 100 // max(total, 1)}%")
+            else:
+                self._finish_job(label, message)
+                return
+        self.root.after(POLL_INTERVAL_MS, self._poll_job, label, clear)
+
+    def _finish_job(self, label: str, message: Message) -> None:
+        """
+        Report how a job ended.
+
+        Args:
+            label (str): Describes the operation in the status bar.
+            message (Message): The DONE, CANCELLED or ERROR message.
+        """
+        if message.event is not Event.DONE and self._original_text is not None:
             self.text.delete(1.0, tk.END)
-            self.text.insert(tk.INSERT, decrypted)
+            self.text.insert(tk.END, self._original_text)
+        elif self._seed_decrypt is not None and self._original_text is not None:
+            self._seed_session(self._original_text, self._seed_decrypt)
+        self._original_text = None
+        self._seed_decrypt = None
+        self.job = None
+        if message.event is Event.DONE:
+            self.status.config(text=f"{label}: done")
+        elif message.event is Event.CANCELLED:
+            self.status.config(text=f"{label}: cancelled")
+        else:
+            self.status.config(text=f"{label}: failed")
+            messagebox.showerror("Error", str(message.value))
+
+    def _seed_session(self, source: str, decrypt: bool) -> None:
+        """
+        Reset the session to the result of a finished text job.
+
+        Args:
+            source (str): The text the job processed.
+            decrypt (bool): Whether the job decrypted.
+        """
+        if self.session is None:
+            return
+        result = self.text.get(1.0, "end-1c")
+        if decrypt:
+            self.session.reset(result, source)
+        else:
+            self.session.reset(source, result)
+        self.text.edit_modified(False)
+        self._shown = result + "\n"
+
+    def _cancel_job(self) -> None:
+        """
+        Cancel the running job.
+        """
+        if self.job is not None:
+            self.job.cancel()
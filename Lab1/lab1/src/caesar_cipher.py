@@ -1,4 +1,12 @@
-from lab1.src.alphabet import Alphabet
+import os
+from functools import lru_cache
+from typing import Iterable, Iterator, TextIO
+
+from lab1.src import batch, byte_cipher, instrumentation
+from lab1.src.alphabet import Alphabet, AnyAlphabet
+
+TABLE_CACHE_SIZE = 256
+DEFAULT_CHUNK_SIZE = 1024 * 1024
 
 
 class CaesarCipher:
@@ -6,15 +14,15 @@ class CaesarCipher:
     A class to perform Caesar Cipher encryption and decryption.
 
     Attributes:
-        alphabet (Alphabet): The language's alphabet used for the cipher.
+        alphabet (AnyAlphabet): The language's alphabet used for the cipher.
     """
 
-    def __init__(self, alphabet: Alphabet = Alphabet.EN) -> None:
+    def __init__(self, alphabet: AnyAlphabet = Alphabet.EN) -> None:
         """
         Initialize the cipher with a specific language's alphabet.
 
         Args:
-            alphabet (Alphabet): The language's alphabet to be used. Defaults to English.
+            alphabet (AnyAlphabet): The language's alphabet to be used. Defaults to English.
         """
         self.alphabet = alphabet
 
@@ -28,7 +36,24 @@ class CaesarCipher:
         Returns:
             bool: True if the key is valid, False otherwise.
         """
-        return isinstance(key, int) and 0 <= key < len(self.alphabet.value)
+        return not self.key_errors(key)
+
+    def key_errors(self, key: int) -> list[str]:
+        """
+        Explain what is wrong with the key, for reporting to the user.
+
+        Args:
+            key (int): The key to check.
+
+        Returns:
+            list[str]: One message per problem, empty if the key is valid.
+        """
+        if not isinstance(key, int) or isinstance(key, bool):
+            return [f"key must be an integer, not {key!r}"]
+        size = len(self.alphabet.value)
+        if not 0 <= key < size:
+            return [f"key must be between 0 and {size - 1}, not {key}"]
+        return []
 
     def cipher(self, text: str, key: int) -> str:
         """
@@ -61,6 +86,188 @@ class CaesarCipher:
         """
         return self._shift(text, -key)
 
+    def cipher_many(
+        self, text: str, keys: Iterable[int], jobs: int | None = 1
+    ) -> Iterator[str]:
+        """
+        Encrypt one text under many keys, looking its characters up only once.
+
+        Ciphertexts are produced lazily in key order, so memory does not grow
+        with the number of keys.
+
+        Args:
+            text (str): The text to be encrypted.
+            keys (Iterable[int]): The encryption keys.
+            jobs (int | None): Worker processes; None uses every CPU. Defaults
+                to 1.
+
+        Returns:
+            Iterator[str]: The encrypted text for each key.
+
+        Raises:
+            ValueError: If a key is invalid, when that key is reached.
+        """
+        return batch.shift_many(self.alphabet, text, self._valid_keys(keys), jobs)
+
+    def decipher_many(
+        self, text: str, keys: Iterable[int], jobs: int | None = 1
+    ) -> Iterator[str]:
+        """
+        Decrypt one text under many keys, looking its characters up only once.
+
+        Args:
+            text (str): The text to be decrypted.
+            keys (Iterable[int]): The decryption keys.
+            jobs (int | None): Worker processes; None uses every CPU. Defaults
+                to 1.
+
+        Returns:
+            Iterator[str]: The decrypted text for each key.
+        """
+        return batch.shift_many(self.alphabet, text, (-key for key in keys), jobs)
+
+    def _valid_keys(self, keys: Iterable[int]) -> Iterator[int]:
+        """
+        Internal method to check keys as they are consumed.
+
+        Args:
+            keys (Iterable[int]): The keys to check.
+
+        Yields:
+            int: Every key.
+
+        Raises:
+            ValueError: If a key is invalid.
+        """
+        for key in keys:
+            if not self.validate_key(key):
+                raise ValueError(f"Invalid key: {key!r}")
+            yield key
+
+    def encrypt_stream(
+        self,
+        reader: TextIO,
+        writer: TextIO,
+        key: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Encrypt a text stream chunk by chunk using constant memory.
+
+        Args:
+            reader (TextIO): The stream to read plain text from.
+            writer (TextIO): The stream to write encrypted text to.
+            key (int): The encryption key.
+            chunk_size (int): The number of characters processed per chunk.
+
+        Returns:
+            int: The number of characters processed.
+
+        Raises:
+            ValueError: If the key is invalid or chunk_size is below 1.
+        """
+        if not self.validate_key(key):
+            raise ValueError("Invalid key")
+        return self._shift_stream(reader, writer, key, chunk_size)
+
+    def decrypt_stream(
+        self,
+        reader: TextIO,
+        writer: TextIO,
+        key: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Decrypt a text stream chunk by chunk using constant memory.
+
+        Args:
+            reader (TextIO): The stream to read encrypted text from.
+            writer (TextIO): The stream to write decrypted text to.
+            key (int): The decryption key.
+            chunk_size (int): The number of characters processed per chunk.
+
+        Returns:
+            int: The number of characters processed.
+
+        Raises:
+            ValueError: If chunk_size is below 1.
+        """
+        return self._shift_stream(reader, writer, -key, chunk_size)
+
+    def encrypt_file(
+        self,
+        source: str | os.PathLike,
+        target: str | os.PathLike,
+        key: int,
+        encoding: str,
+    ) -> int:
+        """
+        Encrypt a file in a single-byte encoding as raw bytes through mmap.
+
+        Every letter is one byte in encodings such as latin-1, cp1251 or
+        koi8-u, so the shift is a byte substitution and no text is decoded.
+
+        Args:
+            source (str | os.PathLike): The file to read plain text from.
+            target (str | os.PathLike): The file to write encrypted text to.
+            key (int): The encryption key.
+            encoding (str): The single-byte encoding of the file.
+
+        Returns:
+            int: The number of bytes processed.
+
+        Raises:
+            ValueError: If the key is invalid or the encoding is not a
+                single-byte encoding of the alphabet.
+        """
+        if not self.validate_key(key):
+            raise ValueError("Invalid key")
+        return byte_cipher.translate_file(
+            source, target, self._byte_table(key, encoding)
+        )
+
+    def decrypt_file(
+        self,
+        source: str | os.PathLike,
+        target: str | os.PathLike,
+        key: int,
+        encoding: str,
+    ) -> int:
+        """
+        Decrypt a file in a single-byte encoding as raw bytes through mmap.
+
+        Args:
+            source (str | os.PathLike): The file to read encrypted text from.
+            target (str | os.PathLike): The file to write decrypted text to.
+            key (int): The decryption key.
+            encoding (str): The single-byte encoding of the file.
+
+        Returns:
+            int: The number of bytes processed.
+
+        Raises:
+            ValueError: If the encoding is not a single-byte encoding of the
+                alphabet.
+        """
+        return byte_cipher.translate_file(
+            source, target, self._byte_table(-key, encoding)
+        )
+
+    def _byte_table(self, key: int, encoding: str) -> bytes:
+        """
+        Internal method to get the byte substitution table for a key.
+
+        Args:
+            key (int): The shift key.
+            encoding (str): The single-byte encoding of the text.
+
+        Returns:
+            bytes: A 256-byte `bytes.translate` table.
+        """
+        return _byte_translation_table(
+            self.alphabet, key % len(self.alphabet.value), encoding
+        )
+
     def _shift(self, text: str, key: int) -> str:
         """
         Internal method to shift the characters in the text by the given key.
@@ -72,13 +279,83 @@ class CaesarCipher:
         Returns:
             str: The shifted text.
         """
-        shifted_text = ""
-        for char in text:
-            if char in self.alphabet.value:
-                char_index = (self.alphabet.value.index(char) + key) % len(
-                    self.alphabet.value
-                )
-                shifted_text += self.alphabet.value[char_index]
-            else:
-                shifted_text += char
-        return shifted_text
+        with instrumentation.stage("lookup"):
+            table = _translation_table(self.alphabet, key % len(self.alphabet.value))
+        with instrumentation.stage("shift"):
+            shifted = text.translate(table)
+        instrumentation.count("chars", len(text))
+        return shifted
+
+    def _shift_stream(
+        self, reader: TextIO, writer: TextIO, key: int, chunk_size: int
+    ) -> int:
+        """
+        Internal method to shift a text stream chunk by chunk.
+
+        Args:
+            reader (TextIO): The stream to read text from.
+            writer (TextIO): The stream to write shifted text to.
+            key (int): The shift key.
+            chunk_size (int): The number of characters processed per chunk.
+
+        Returns:
+            int: The number of characters processed.
+
+        Raises:
+            ValueError: If chunk_size is below 1.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be at least 1, not {chunk_size}")
+        processed = 0
+        while True:
+            with instrumentation.stage("io"):
+                chunk = reader.read(chunk_size)
+            if not chunk:
+                return processed
+            shifted = self._shift(chunk, key)
+            with instrumentation.stage("io"):
+                writer.write(shifted)
+            processed += len(chunk)
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _translation_table(alphabet: AnyAlphabet, key: int) -> dict[int, int]:
+    """
+    Build the `str.translate` table that shifts every alphabet character by key.
+
+    Tables are cached per (alphabet, key) pair, so repeated calls with the same
+    settings skip the build entirely.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet to build the table for.
+        key (int): The shift key, already reduced modulo the alphabet length.
+
+    Returns:
+        dict[int, int]: Mapping of source code points to shifted code points.
+    """
+    letters = alphabet.value
+    return str.maketrans(letters, letters[key:] + letters[:key])
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _byte_translation_table(alphabet: AnyAlphabet, key: int, encoding: str) -> bytes:
+    """
+    Build the `bytes.translate` table that shifts every encoded alphabet letter.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet to build the table for.
+        key (int): The shift key, already reduced modulo the alphabet length.
+        encoding (str): The single-byte encoding of the text.
+
+    Returns:
+        bytes: A 256-byte translation table.
+
+    Raises:
+        ValueError: If the encoding is not a single-byte encoding of the alphabet.
+    """
+    letters = byte_cipher.encode_alphabet(alphabet, encoding)
+    return bytes.maketrans(letters, letters[key:] + letters[:key])
+
+
+instrumentation.register_cache("translation_table", _translation_table)
+instrumentation.register_cache("byte_translation_table", _byte_translation_table)
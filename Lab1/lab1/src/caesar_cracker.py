@@ -0,0 +1,154 @@
+from collections import Counter
+from typing import NamedTuple, TextIO
+
+from lab1.src.alphabet import Alphabet, AnyAlphabet
+from lab1.src.caesar_cipher import CaesarCipher
+
+DEFAULT_SAMPLE_SIZE = 64 * 1024
+
+# Relative letter frequencies in percent, keyed by lowercase letter.
+# fmt: off
+REFERENCE_FREQUENCIES: dict[AnyAlphabet, dict[str, float]] = {
+    Alphabet.EN: {
+        "a": 8.167, "b": 1.492, "c": 2.782, "d": 4.253, "e": 12.702, "f": 2.228,
+        "g": 2.015, "h": 6.094, "i": 6.966, "j": 0.153, "k": 0.772, "l": 4.025,
+        "m": 2.406, "n": 6.749, "o": 7.507, "p": 1.929, "q": 0.095, "r": 5.987,
+        "s": 6.327, "t": 9.056, "u": 2.758, "v": 0.978, "w": 2.360, "x": 0.150,
+        "y": 1.974, "z": 0.074,
+    },
+    Alphabet.UK: {
+        "а": 8.41, "б": 1.61, "в": 5.43, "г": 1.56, "ґ": 0.01, "д": 3.38,
+        "е": 5.10, "є": 0.74, "ж": 0.87, "з": 2.10, "и": 6.22, "й": 1.29,
+        "к": 3.91, "л": 3.58, "м": 3.04, "н": 6.50, "о": 9.36, "п": 2.93,
+        "р": 4.90, "с": 4.49, "т": 5.31, "у": 3.46, "ф": 0.27, "х": 1.20,
+        "ц": 0.93, "ч": 1.41, "ш": 0.73, "щ": 0.44, "ь": 1.75, "ю": 0.90,
+        "я": 2.09,
+    },
+}
+# fmt: on
+
+
+class Candidate(NamedTuple):
+    """A key candidate with its chi-squared score, lower is better."""
+
+    key: int
+    score: float
+
+
+class CaesarCracker:
+    """
+    Recover Caesar keys by frequency analysis.
+
+    The ciphertext histogram is computed once. Deciphering with a key rotates
+    that histogram, so every key is scored by rotating it instead of
+    deciphering the text. Each alphabet lists its uppercase letters before its
+    lowercase ones, so the rotated histogram is folded by case before it is
+    compared with the reference frequencies.
+
+    Attributes:
+        cipher (CaesarCipher): The cipher used to decipher with the best key.
+    """
+
+    def __init__(self, alphabet: AnyAlphabet = Alphabet.EN) -> None:
+        """
+        Initialize the cracker for a specific language's alphabet.
+
+        Args:
+            alphabet (AnyAlphabet): The language's alphabet. Defaults to English.
+
+        Raises:
+            ValueError: If there are no reference frequencies for the alphabet.
+        """
+        frequencies = REFERENCE_FREQUENCIES.get(alphabet)
+        if frequencies is None:
+            raise ValueError(f"No reference frequencies for {alphabet!r}")
+        self.cipher = CaesarCipher(alphabet)
+        letters = alphabet.value
+        half = len(letters) // 2
+        total = sum(frequencies.values())
+        self._expected = [frequencies[char] / total for char in letters[half:]]
+
+    def histogram(self, text: str) -> list[int]:
+        """
+        Count every alphabet character of the text in a single pass.
+
+        Args:
+            text (str): The text to count.
+
+        Returns:
+            list[int]: The count of each alphabet character, by position.
+        """
+        counts = Counter(text)
+        return [counts[char] for char in self.cipher.alphabet.value]
+
+    def rank(self, text: str, sample_size: int | None = None) -> list[Candidate]:
+        """
+        Score every key against the reference frequencies.
+
+        Keys that fold to the same histogram only differ in letter case, so
+        ties are broken in favour of the key that yields fewer uppercase letters.
+
+        Args:
+            text (str): The ciphertext.
+            sample_size (int | None): Score only this many leading characters.
+
+        Returns:
+            list[Candidate]: Every key, best first.
+
+        Raises:
+            ValueError: If the text contains no alphabet characters.
+        """
+        if sample_size is not None:
+            text = text[:sample_size]
+        counts = self.histogram(text)
+        total = sum(counts)
+        if not total:
+            raise ValueError("Text contains no characters of the alphabet")
+        size = len(counts)
+        half = size // 2
+        scored = []
+        for key in range(size):
+            rotated = counts[key:] + counts[:key]
+            score = 0.0
+            for position, ratio in enumerate(self._expected):
+                expected = ratio * total
+                observed = rotated[position] + rotated[position + half]
+                score += (observed - expected) ** 2 / expected
+            scored.append((score, sum(rotated[:half]), key))
+        scored.sort()
+        return [Candidate(key, score) for score, _, key in scored]
+
+    def rank_stream(
+        self, reader: TextIO, sample_size: int = DEFAULT_SAMPLE_SIZE
+    ) -> list[Candidate]:
+        """
+        Score every key using only the beginning of a text stream.
+
+        Args:
+            reader (TextIO): The stream to read ciphertext from.
+            sample_size (int): The number of characters to read and score.
+
+        Returns:
+            list[Candidate]: Every key, best first.
+
+        Raises:
+            ValueError: If the sample contains no alphabet characters.
+        """
+        return self.rank(reader.read(sample_size))
+
+    def crack(self, text: str, sample_size: int | None = None) -> tuple[int, str]:
+        """
+        Find the most likely key and decipher the text with it.
+
+        Args:
+            text (str): The ciphertext.
+            sample_size (int | None): Score only this many leading characters.
+
+        Returns:
+            tuple[int, str]: The best key and the deciphered text.
+
+        Raises:
+            ValueError: If the scored text contains no alphabet characters.
+        """
+        key = self.rank(text, sample_size)[0].key
+        return key, self.cipher.decipher(text, key)
@@ -0,0 +1,185 @@
+from lab1.src.background import Transform
+
+COMPARE_BLOCK_SIZE = 4096
+
+
+def common_prefix(a: str, b: str) -> int:
+    """
+    Measure the common prefix of two strings.
+
+    Blocks are compared with slice equality, so matching text is compared at
+    memcmp speed and only the first differing block is scanned per character.
+
+    Args:
+        a (str): The first string.
+        b (str): The second string.
+
+    Returns:
+        int: The length of the longest common prefix.
+    """
+    limit = min(len(a), len(b))
+    start = 0
+    while start < limit:
+        end = min(start + COMPARE_BLOCK_SIZE, limit)
+        if a[start:end] != b[start:end]:
+            return next(
+                position for position in range(start, end) if a[position] != b[position]
+            )
+        start = end
+    return limit
+
+
+def common_suffix(a: str, b: str, limit: int) -> int:
+    """
+    Measure the common suffix of two strings.
+
+    Args:
+        a (str): The first string.
+        b (str): The second string.
+        limit (int): The longest suffix to consider.
+
+    Returns:
+        int: The length of the longest common suffix, at most limit.
+    """
+    limit = min(limit, len(a), len(b))
+    length = 0
+    while length < limit:
+        size = min(COMPARE_BLOCK_SIZE, limit - length)
+        a_end, b_end = len(a) - length, len(b) - length
+        a_start, b_start = a_end - size, b_end - size
+        if a[a_start:a_end] != b[b_start:b_end]:
+            return length + next(
+                offset
+                for offset in range(size)
+                if a[a_end - 1 - offset] != b[b_end - 1 - offset]
+            )
+        length += size
+    return limit
+
+
+class IncrementalSession:
+    """
+    Keeps a plaintext and its ciphertext in step across edits.
+
+    An update diffs the new text against the previous text of the same side
+    and reprocesses only the changed span. Text before the span keeps its
+    positions and is reused as is. Text after the span is reused too when its
+    positions moved by a multiple of the key period, which is always the case
+    for the position-independent Caesar shift.
+
+    Attributes:
+        period (int): The number of positions after which the shifts repeat.
+        plaintext (str): The current plaintext.
+        ciphertext (str): The current ciphertext.
+        reprocessed (int): The number of characters shifted by the last update.
+    """
+
+    def __init__(self, encrypt: Transform, decrypt: Transform, period: int = 1):
+        """
+        Initialize an empty session for a key.
+
+        Args:
+            encrypt (Transform): Encrypts a chunk at a position.
+            decrypt (Transform): Decrypts a chunk at a position.
+            period (int): The key period. Defaults to 1 for the Caesar shift.
+        """
+        self._encrypt = encrypt
+        self._decrypt = decrypt
+        self.period = period
+        self.plaintext = ""
+        self.ciphertext = ""
+        self.reprocessed = 0
+
+    def reset(self, plaintext: str, ciphertext: str) -> None:
+        """
+        Replace the document with a fully processed pair.
+
+        Args:
+            plaintext (str): The plaintext.
+            ciphertext (str): The ciphertext of the plaintext under the key.
+        """
+        self.plaintext = plaintext
+        self.ciphertext = ciphertext
+
+    def encrypt(self, plaintext: str, max_span: int | None = None) -> str | None:
+        """
+        Encrypt an edited plaintext.
+
+        Args:
+            plaintext (str): The new plaintext.
+            max_span (int | None): Give up if more characters than this would
+                have to be encrypted.
+
+        Returns:
+            str | None: The ciphertext, or None if the edit is too large.
+        """
+        ciphertext = self._update(
+            self.plaintext, plaintext, self.ciphertext, self._encrypt, max_span
+        )
+        if ciphertext is not None:
+            self.plaintext, self.ciphertext = plaintext, ciphertext
+        return ciphertext
+
+    def decrypt(self, ciphertext: str, max_span: int | None = None) -> str | None:
+        """
+        Decrypt an edited ciphertext.
+
+        Args:
+            ciphertext (str): The new ciphertext.
+            max_span (int | None): Give up if more characters than this would
+                have to be decrypted.
+
+        Returns:
+            str | None: The plaintext, or None if the edit is too large.
+        """
+        plaintext = self._update(
+            self.ciphertext, ciphertext, self.plaintext, self._decrypt, max_span
+        )
+        if plaintext is not None:
+            self.plaintext, self.ciphertext = plaintext, ciphertext
+        return plaintext
+
+    def verify(self) -> bool:
+        """
+        Check the session against a full re-encryption of the plaintext.
+
+        Returns:
+            bool: True if the ciphertext matches.
+        """
+        return self._encrypt(self.plaintext, 0) == self.ciphertext
+
+    def _update(
+        self,
+        old: str,
+        new: str,
+        output: str,
+        transform: Transform,
+        max_span: int | None,
+    ) -> str | None:
+        """
+        Internal method to reprocess the span of new that differs from old.
+
+        Args:
+            old (str): The previous input.
+            new (str): The edited input.
+            output (str): The output of the previous input.
+            transform (Transform): Processes a chunk at a position.
+            max_span (int | None): The most characters to reprocess.
+
+        Returns:
+            str | None: The output of the edited input, or None if the span
+                is longer than max_span.
+        """
+        if new == old:
+            self.reprocessed = 0
+            return output
+        start = common_prefix(old, new)
+        suffix = 0
+        if (len(new) - len(old)) % self.period == 0:
+            suffix = common_suffix(old, new, min(len(old), len(new)) - start)
+        end = len(new) - suffix
+        if max_span is not None and end - start > max_span:
+            return None
+        self.reprocessed = end - start
+        tail = len(output) - suffix
+        return output[:start] + transform(new[start:end], start) + output[tail:]
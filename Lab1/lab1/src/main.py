@@ -1,8 +1,17 @@
-import tkinter as tk
+def main() -> None:
+    """
+    Open the Caesar cipher window.
+
+    Tkinter and the app are imported here so that importing this module, or
+    the cipher modules next to it, does not load the GUI toolkit.
+    """
+    import tkinter as tk
+
+    from lab1.src.caesar_app import CaesarApp
+
+    app = CaesarApp(tk.Tk())
+    app.root.mainloop()
 
-from lab1.src.caesar_app import CaesarApp
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = CaesarApp(root)
-    root.mainloop()
+    main()
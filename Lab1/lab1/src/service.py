@@ -0,0 +1,339 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+from lab1.src.alphabet import AnyAlphabet, get_alphabet
+from lab1.src.caesar_cipher import CaesarCipher
+
+MAX_BODY_SIZE = 64 * 1024**2
+QUEUE_SIZE = 256
+BATCH_SIZE = 32
+BATCH_CHARS = 1024**2
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    """An error that is reported to the client as an HTTP status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            status (int): The HTTP status code.
+            message (str): The message sent as the response body.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class Job(NamedTuple):
+    """A single encryption or decryption request."""
+
+    action: str
+    alphabet: AnyAlphabet
+    key: int
+    text: str
+
+
+def run_batch(jobs: list[Job]) -> list[str]:
+    """
+    Process a batch of jobs in a worker process.
+
+    Args:
+        jobs (list[Job]): The jobs to process.
+
+    Returns:
+        list[str]: The result of every job, in order.
+    """
+    results = []
+    for job in jobs:
+        cipher = CaesarCipher(job.alphabet)
+        if job.action == "encrypt":
+            results.append(cipher.cipher(job.text, job.key))
+        else:
+            results.append(cipher.decipher(job.text, job.key))
+    return results
+
+
+def parse_job(method: str, target: str, body: bytes) -> Job:
+    """
+    Build a job from an HTTP request.
+
+    Requests look like `POST /encrypt?key=5&alphabet=UK` with the text as body.
+
+    Args:
+        method (str): The HTTP method.
+        target (str): The request target with the query string.
+        body (bytes): The UTF-8 encoded text.
+
+    Returns:
+        Job: The parsed job.
+
+    Raises:
+        HttpError: If the request is not a valid job.
+    """
+    url = urlsplit(target)
+    action = url.path.strip("/")
+    if action not in ("encrypt", "decrypt"):
+        raise HttpError(404, f"Unknown endpoint {url.path}")
+    if method != "POST":
+        raise HttpError(405, "Use POST")
+    params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+    try:
+        alphabet = get_alphabet(params.get("alphabet", "EN"))
+        key = int(params["key"])
+        text = body.decode("utf-8")
+    except (KeyError, ValueError) as error:
+        raise HttpError(400, f"Invalid request: {error}") from None
+    if not CaesarCipher(alphabet).validate_key(key):
+        raise HttpError(400, "Invalid key")
+    return Job(action, alphabet, key, text)
+
+
+class CipherService:
+    """
+    Asyncio HTTP front end that batches cipher jobs onto a process pool.
+
+    Jobs wait in a bounded queue. Whenever a worker is free, the batcher takes
+    every queued job (up to the batch limits) and sends them as one task, so
+    batches grow with the load. A full queue is answered with 503.
+
+    Attributes:
+        workers (int): The number of worker processes.
+        queue (asyncio.Queue): Jobs waiting for a worker.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        queue_size: int = QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        batch_chars: int = BATCH_CHARS,
+        max_body_size: int = MAX_BODY_SIZE,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            workers (int | None): Worker processes. Defaults to the CPU count.
+            queue_size (int): Maximum number of jobs waiting for a worker.
+            batch_size (int): Maximum number of jobs sent to a worker at once.
+            batch_chars (int): Stop growing a batch past this many characters.
+            max_body_size (int): Largest accepted request body in bytes.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_chars = batch_chars
+        self.max_body_size = max_body_size
+        self.queue: asyncio.Queue[tuple[Job, asyncio.Future]] = asyncio.Queue(
+            queue_size
+        )
+        # Forked workers would inherit the sockets of open connections and keep
+        # them alive after the server closes them, so workers are spawned.
+        self._executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._slots = asyncio.Semaphore(self.workers)
+        self._tasks: set[asyncio.Task] = set()
+        self.servers: list[asyncio.Server] = []
+
+    async def submit(self, job: Job) -> str:
+        """
+        Queue a job and wait for its result.
+
+        Args:
+            job (Job): The job to process.
+
+        Returns:
+            str: The processed text.
+
+        Raises:
+            HttpError: If the queue is full.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((job, future))
+        except asyncio.QueueFull:
+            raise HttpError(503, "Server is busy, retry later") from None
+        return await future
+
+    async def _batcher(self) -> None:
+        """Group queued jobs into batches and dispatch them to free workers."""
+        while True:
+            batch = [await self.queue.get()]
+            await self._slots.acquire()
+            chars = len(batch[0][0].text)
+            while (
+                len(batch) < self.batch_size
+                and chars < self.batch_chars
+                and not self.queue.empty()
+            ):
+                batch.append(self.queue.get_nowait())
+                chars += len(batch[-1][0].text)
+            task = asyncio.create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: list[tuple[Job, asyncio.Future]]) -> None:
+        """Run a batch on the process pool and resolve its futures."""
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self._executor, run_batch, [job for job, _ in batch]
+            )
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: dict) -> bytes:
+        """Read a Content-Length or chunked request body."""
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks: list[bytes] = []
+            size = 0
+            while True:
+                line = await reader.readuntil(b"\r\n")
+                length = int(line.split(b";")[0], 16)
+                if length == 0:
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    return b"".join(chunks)
+                size += length
+                if size > self.max_body_size:
+                    raise HttpError(413, "Request body is too large")
+                chunks.append(await reader.readexactly(length))
+                await reader.readexactly(2)
+        length = int(headers.get("content-length", "0"))
+        if length > self.max_body_size:
+            raise HttpError(413, "Request body is too large")
+        return await reader.readexactly(length)
+
+    async def _handle_request(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[int, str, bool] | None:
+        """Read one request and produce its status, body and keep-alive flag."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            return 400, "Malformed request line", False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get("connection", "").lower() != "close"
+        try:
+            body = await self._read_body(reader, headers)
+            job = parse_job(method, target, body)
+            return 200, await self.submit(job), keep_alive
+        except HttpError as error:
+            return error.status, str(error), keep_alive and error.status != 413
+        except ValueError:
+            return 400, "Malformed request body", False
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serve HTTP/1.1 requests on one connection until it is closed.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's reader.
+            writer (asyncio.StreamWriter): The connection's writer.
+        """
+        try:
+            while True:
+                response = await self._handle_request(reader)
+                if response is None:
+                    break
+                status, text, keep_alive = response
+                payload = text.encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    "Content-Type: text/plain; charset=utf-8\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    "\r\n".encode("latin-1") + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+        ):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(
+        self, host: str = "127.0.0.1", port: int = 8000, unix: str | None = None
+    ) -> None:
+        """
+        Serve requests until cancelled.
+
+        Args:
+            host (str): The TCP host to bind.
+            port (int): The TCP port to bind.
+            unix (str | None): Listen on this Unix-domain socket path instead.
+        """
+        batcher = asyncio.create_task(self._batcher())
+        if unix is not None:
+            server = await asyncio.start_unix_server(self.handle_connection, unix)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        self.servers.append(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self._executor.shutdown(cancel_futures=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m lab1.src.service",
+        description="Serve Caesar cipher encryption over local HTTP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix", help="listen on a Unix-domain socket path")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    service = CipherService(args.workers, args.queue_size, args.batch_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import dataclasses
+import unittest
+
+from lab1.src.alphabet import (
+    DIGITS,
+    EN_DIGITS,
+    Alphabet,
+    CustomAlphabet,
+    combine_alphabets,
+    get_alphabet,
+    register_alphabet,
+    register_range,
+)
+from lab1.src.caesar_cipher import CaesarCipher
+
+
+class TestAlphabet(unittest.TestCase):
+    def test_lookup(self):
+        """Test that the lookup structures agree with the alphabet string."""
+        for alphabet in Alphabet:
+            lookup = alphabet.lookup
+            self.assertEqual("".join(lookup.chars), alphabet.value)
+            self.assertEqual(lookup.members, set(alphabet.value))
+            for position, char in enumerate(alphabet.value):
+                self.assertEqual(lookup.index[char], position)
+
+    def test_lookup_is_shared_and_immutable(self):
+        """Test that the lookup is built once and cannot be reassigned."""
+        self.assertIs(Alphabet.UK.lookup, Alphabet.UK.lookup)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            Alphabet.EN.lookup.chars = ()  # type: ignore
+
+    def test_range_lookup_is_dense(self):
+        """Test that contiguous alphabets find positions by code point offset."""
+        greek = register_range("TEST_GREEK", "α", "ω")
+        self.assertEqual(len(greek.value), 25)
+        self.assertIsNotNone(greek.lookup.offsets)
+        self.assertIsNone(Alphabet.EN.lookup.offsets)
+        for alphabet in (greek, DIGITS, Alphabet.EN, Alphabet.UK):
+            for position, char in enumerate(alphabet.value):
+                self.assertEqual(alphabet.lookup.position(char), position)
+            for char in " ~\x00€":
+                self.assertIsNone(alphabet.lookup.position(char))
+
+    def test_registry(self):
+        """Test registering, combining and looking up alphabets by name."""
+        custom = register_alphabet("TEST_BASES", "TGCA")
+        self.assertIs(get_alphabet("TEST_BASES"), custom)
+        self.assertIs(get_alphabet("UK"), Alphabet.UK)
+        self.assertEqual(custom, CustomAlphabet("TEST_BASES", "TGCA"))
+        # Reversed letters still cover one code point range.
+        self.assertEqual(
+            register_alphabet("TEST_REVERSED", "3210").lookup.position("0"), 3
+        )
+        combined = combine_alphabets("TEST_COMBINED", custom, DIGITS)
+        self.assertEqual(combined.value, "TGCA0123456789")
+        with self.assertRaises(KeyError):
+            get_alphabet("TEST_MISSING")
+
+    def test_registry_rejects_invalid_alphabets(self):
+        """Test that taken names and unusable letters are rejected."""
+        for name, letters in (
+            ("EN", "01"),
+            ("", "01"),
+            ("TEST_SHORT", "0"),
+            ("TEST_DUPLICATE", "0100"),
+            ("TEST_SURROGATE", "0\ud800"),
+        ):
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                register_alphabet(name, letters)
+        with self.assertRaises(ValueError):
+            combine_alphabets("TEST_OVERLAP", Alphabet.EN, EN_DIGITS)
+
+    def test_cipher_accepts_registered_alphabets(self):
+        """Test that the cipher shifts within a registered alphabet."""
+        cipher = CaesarCipher(EN_DIGITS)
+        self.assertEqual(cipher.cipher("Xyz 89!", 3), "a12 BC!")
+        self.assertEqual(cipher.decipher("a12 BC!", 3), "Xyz 89!")
+        self.assertTrue(cipher.validate_key(61))
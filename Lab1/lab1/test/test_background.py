@@ -0,0 +1,106 @@
+import pathlib
+import tempfile
+import unittest
+
+from lab1.src.background import BackgroundJob, Event
+from lab1.src.caesar_cipher import CaesarCipher
+
+
+def drain(job: BackgroundJob) -> list:
+    """Wait for a job and return all of its messages."""
+    job.join(10)
+    messages = []
+    while not job.messages.empty():
+        messages.append(job.messages.get_nowait())
+    return messages
+
+
+class TestBackgroundJob(unittest.TestCase):
+    def setUp(self):
+        """Setup a CaesarCipher instance and a sample text for testing."""
+        self.cipher = CaesarCipher()
+        self.text = "HELLO, WORLD! " * 100
+
+    def test_text_job(self):
+        """Test that chunks arrive in order with progress and a final DONE."""
+        job = BackgroundJob(chunk_size=64)
+        job.start_text(self.text, lambda chunk, _: self.cipher.cipher(chunk, 5))
+        messages = drain(job)
+        chunks = [message.value for message in messages if message.event is Event.CHUNK]
+        self.assertEqual("".join(chunks), self.cipher.cipher(self.text, 5))
+        self.assertEqual(messages[-2].value, (len(self.text), len(self.text)))
+        self.assertIs(messages[-1].event, Event.DONE)
+
+    def test_cancel(self):
+        """Test that a cancelled job stops between chunks."""
+        job = BackgroundJob(chunk_size=64)
+
+        def transform(chunk, offset):
+            job.cancel()
+            return chunk
+
+        job.start_text(self.text, transform)
+        messages = drain(job)
+        self.assertEqual([message.event for message in messages].count(Event.CHUNK), 1)
+        self.assertIs(messages[-1].event, Event.CANCELLED)
+
+    def test_error(self):
+        """Test that an exception in the worker is reported as ERROR."""
+        job = BackgroundJob()
+        job.start_text(self.text, lambda chunk, _: self.cipher.cipher(chunk, -1))
+        message = drain(job)[-1]
+        self.assertIs(message.event, Event.ERROR)
+        self.assertIsInstance(message.value, ValueError)
+
+    def test_check(self):
+        """Test that a check runs first and waits for the answer to a finding."""
+        for proceed, last in ((True, Event.DONE), (False, Event.CANCELLED)):
+            with self.subTest(proceed=proceed):
+                job = BackgroundJob(chunk_size=64)
+                job.start_text(self.text, lambda chunk, _: chunk, lambda: "finding")
+                self.assertEqual(job.messages.get(timeout=10), (Event.CHECK, "finding"))
+                self.assertTrue(job.running)
+                job.answer(proceed)
+                events = [message.event for message in drain(job)]
+                self.assertEqual(Event.CHUNK in events, proceed)
+                self.assertIs(events[-1], last)
+
+        job = BackgroundJob(chunk_size=64)
+        job.start_text(self.text, lambda chunk, _: chunk, lambda: None)
+        events = [message.event for message in drain(job)]
+        self.assertNotIn(Event.CHECK, events)
+        self.assertIs(events[-1], Event.DONE)
+
+        job = BackgroundJob()
+        job.start_text(self.text, lambda chunk, _: chunk, lambda: 1 / 0)
+        self.assertIs(drain(job)[-1].event, Event.ERROR)
+
+    def test_file_job(self):
+        """Test file-to-file processing and that cancelling leaves no output."""
+        with tempfile.TemporaryDirectory() as directory:
+            source = pathlib.Path(directory, "plain.txt")
+            target = pathlib.Path(directory, "out", "encrypted.txt")
+            source.write_text(self.text, encoding="utf-8")
+
+            job = BackgroundJob(chunk_size=100)
+            job.start_file(
+                source, target, lambda chunk, _: self.cipher.cipher(chunk, 3)
+            )
+            self.assertIs(drain(job)[-1].event, Event.DONE)
+            self.assertEqual(
+                target.read_text(encoding="utf-8"), self.cipher.cipher(self.text, 3)
+            )
+
+            cancelled = pathlib.Path(directory, "cancelled.txt")
+            job = BackgroundJob(chunk_size=100)
+            job.cancel()
+            job.start_file(source, cancelled, lambda chunk, _: chunk)
+            self.assertIs(drain(job)[-1].event, Event.CANCELLED)
+            self.assertEqual(
+                sorted(path.name for path in cancelled.parent.iterdir()),
+                ["out", "plain.txt"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from lab1.src.alphabet import Alphabet, register_range
+from lab1.src.batch import IndexedText, shift_many
+from lab1.src.caesar_cipher import CaesarCipher
+
+
+class TestBatch(unittest.TestCase):
+    def test_indexed_text(self):
+        """Test latin-1 and charmap codes against single-key encryption."""
+        for alphabet, text in (
+            (Alphabet.EN, "Hello, World! Ünïcödé"),
+            (Alphabet.UK, "Привіт, Світе! Hello 😀"),
+            (Alphabet.EN, "Hello 😀"),
+        ):
+            indexed = IndexedText(alphabet, text)
+            self.assertEqual(len(indexed), len(text))
+            cipher = CaesarCipher(alphabet)
+            for key in (0, 1, 7, len(alphabet.value) - 1):
+                self.assertEqual(indexed.shift(key), cipher.cipher(text, key))
+                self.assertEqual(indexed.shift(-key), cipher.decipher(text, key))
+        self.assertIsNone(IndexedText(Alphabet.EN, "abc").symbols)
+        self.assertIsNotNone(IndexedText(Alphabet.UK, "abc").symbols)
+
+    def test_too_many_symbols(self):
+        """Test that varied texts fall back to shifting key by key."""
+        text = "".join(map(chr, range(0x4E00, 0x4F00))) + "abc"
+        with self.assertRaises(ValueError):
+            IndexedText(Alphabet.EN, text)
+        with self.assertRaises(ValueError):
+            IndexedText(Alphabet.EN, "￾")
+        expected = [CaesarCipher(Alphabet.EN).cipher(text, key) for key in (1, 2)]
+        self.assertEqual(list(shift_many(Alphabet.EN, text, [1, 2])), expected)
+        wide = register_range("TEST_BATCH_WIDE", "一", "俿")
+        self.assertEqual(list(shift_many(wide, "一x", [1])), ["丁x"])
+
+    def test_cipher_many(self):
+        """Test lazy, ordered results in and out of process."""
+        cipher = CaesarCipher(Alphabet.UK)
+        text = "Київ — столиця України. Kyiv!\n" * 50
+        keys = range(0, 60, 5)
+        expected = [cipher.cipher(text, key) for key in keys]
+        self.assertEqual(list(cipher.cipher_many(text, keys)), expected)
+        self.assertEqual(list(cipher.cipher_many(text, keys, jobs=2)), expected)
+        self.assertEqual(
+            list(cipher.decipher_many(expected[3], [15, 20])),
+            [text, cipher.decipher(expected[3], 20)],
+        )
+
+        results = cipher.cipher_many(text, [1, 2, 99])
+        self.assertEqual(next(results), cipher.cipher(text, 1))
+        self.assertEqual(next(results), cipher.cipher(text, 2))
+        with self.assertRaises(ValueError):
+            next(results)
+
+
+if __name__ == "__main__":
+    unittest.main()
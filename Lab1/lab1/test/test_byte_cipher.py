@@ -0,0 +1,40 @@
+import pathlib
+import tempfile
+import unittest
+
+from lab1.src.alphabet import Alphabet
+from lab1.src.byte_cipher import encode_alphabet, is_single_byte, translate_file
+
+
+class TestByteCipher(unittest.TestCase):
+    def test_is_single_byte(self):
+        """Test that single-byte encodings are told apart from multi-byte ones."""
+        for encoding in ("latin-1", "cp1251", "koi8-u", "ascii"):
+            self.assertTrue(is_single_byte(encoding), encoding)
+        for encoding in ("utf-8", "utf-16", "utf-32"):
+            self.assertFalse(is_single_byte(encoding), encoding)
+
+    def test_encode_alphabet(self):
+        """Test encoding alphabets and rejecting unusable encodings."""
+        self.assertEqual(len(encode_alphabet(Alphabet.UK, "koi8-u")), 62)
+        with self.assertRaises(ValueError):
+            encode_alphabet(Alphabet.UK, "latin-1")
+        with self.assertRaises(ValueError):
+            encode_alphabet(Alphabet.EN, "utf-8")
+
+    def test_translate_file(self):
+        """Test translating a file across block boundaries and an empty file."""
+        table = bytes.maketrans(b"ab", b"ba")
+        with tempfile.TemporaryDirectory() as directory:
+            source = pathlib.Path(directory, "source.bin")
+            target = pathlib.Path(directory, "target.bin")
+            source.write_bytes(b"abc" * 1000)
+            self.assertEqual(translate_file(source, target, table, block_size=7), 3000)
+            self.assertEqual(target.read_bytes(), b"bac" * 1000)
+            source.write_bytes(b"")
+            self.assertEqual(translate_file(source, target, table), 0)
+            self.assertEqual(target.read_bytes(), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
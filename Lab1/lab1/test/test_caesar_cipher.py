@@ -1,3 +1,6 @@
+import io
+import pathlib
+import tempfile
 import unittest
 
 from lab1.src.alphabet import Alphabet
@@ -20,6 +23,18 @@ class TestCaesarCipher(unittest.TestCase):
         self.assertFalse(self.cipher.validate_key(-1))
         self.assertFalse(self.cipher.validate_key(len(Alphabet.EN.value)))
         self.assertFalse(self.cipher.validate_key("A"))  # type: ignore
+        self.assertFalse(self.cipher.validate_key(True))
+
+    def test_key_errors(self):
+        """Test that the problem with a key is explained."""
+        self.assertEqual(self.cipher.key_errors(5), [])
+        self.assertEqual(
+            self.cipher.key_errors(52), ["key must be between 0 and 51, not 52"]
+        )
+        self.assertEqual(
+            self.cipher.key_errors("A"),  # type: ignore
+            ["key must be an integer, not 'A'"],
+        )
 
     def test_cipher(self):
         """Test the cipher method."""
@@ -48,3 +63,74 @@ class TestCaesarCipher(unittest.TestCase):
             "HELLO, WORLD!"  # Assuming a right shift of 5 for the English alphabet
         )
         self.assertEqual(self.cipher.decipher(text, 5), expected)
+
+    def test_cipher_decipher_ukrainian(self):
+        """Test a round trip with the Ukrainian alphabet, wrapping past the end."""
+        cipher = CaesarCipher(Alphabet.UK)
+        text = "Привіт, Світе! яя"
+        encrypted = cipher.cipher(text, 3)
+        self.assertEqual(encrypted[-2:], "ВВ")
+        self.assertEqual(cipher.decipher(encrypted, 3), text)
+
+    def test_encrypt_decrypt_stream(self):
+        """Test that streaming in small chunks matches the one-shot result."""
+        text = "HELLO, WORLD! " * 50
+        encrypted = io.StringIO()
+        self.assertEqual(
+            self.cipher.encrypt_stream(io.StringIO(text), encrypted, 5, chunk_size=7),
+            len(text),
+        )
+        self.assertEqual(encrypted.getvalue(), self.cipher.cipher(text, 5))
+        decrypted = io.StringIO()
+        self.cipher.decrypt_stream(
+            io.StringIO(encrypted.getvalue()), decrypted, 5, chunk_size=7
+        )
+        self.assertEqual(decrypted.getvalue(), text)
+
+    def test_stream_rejects_empty_chunks(self):
+        """Test that chunk sizes below one are rejected instead of reading nothing."""
+        for chunk_size in (0, -1):
+            with self.subTest(chunk_size=chunk_size):
+                with self.assertRaises(ValueError):
+                    self.cipher.encrypt_stream(
+                        io.StringIO("Hello"), io.StringIO(), 3, chunk_size=chunk_size
+                    )
+                with self.assertRaises(ValueError):
+                    self.cipher.decrypt_stream(
+                        io.StringIO("Hello"), io.StringIO(), 3, chunk_size=chunk_size
+                    )
+
+    def test_encrypt_decrypt_file(self):
+        """Test the mmap byte path against the text cipher in single-byte encodings."""
+        text = "Привіт, Світе! ґҐ яя 123\n" * 100
+        cipher = CaesarCipher(Alphabet.UK)
+        with tempfile.TemporaryDirectory() as directory:
+            for encoding in ("cp1251", "koi8-u"):
+                with self.subTest(encoding=encoding):
+                    plain = pathlib.Path(directory, "plain.txt")
+                    encrypted = pathlib.Path(directory, "encrypted.txt")
+                    decrypted = pathlib.Path(directory, "decrypted.txt")
+                    plain.write_bytes(text.encode(encoding))
+                    cipher.encrypt_file(plain, encrypted, 7, encoding)
+                    self.assertEqual(
+                        encrypted.read_bytes().decode(encoding), cipher.cipher(text, 7)
+                    )
+                    cipher.decrypt_file(encrypted, decrypted, 7, encoding)
+                    self.assertEqual(decrypted.read_bytes(), plain.read_bytes())
+            with self.assertRaises(ValueError):
+                cipher.encrypt_file(plain, encrypted, 7, "utf-8")
+
+    def test_encrypt_decrypt_file_in_place(self):
+        """Test that a file can be encrypted and decrypted onto itself."""
+        text = "Hello, World! " * 100
+        cipher = CaesarCipher(Alphabet.EN)
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "text.txt")
+            path.write_bytes(text.encode("latin-1"))
+            self.assertEqual(cipher.encrypt_file(path, path, 3, "latin-1"), len(text))
+            self.assertEqual(
+                path.read_bytes().decode("latin-1"), cipher.cipher(text, 3)
+            )
+            self.assertEqual(cipher.decrypt_file(path, path, 3, "latin-1"), len(text))
+            self.assertEqual(path.read_bytes().decode("latin-1"), text)
+            self.assertEqual(sorted(pathlib.Path(directory).iterdir()), [path])
@@ -0,0 +1,70 @@
+import io
+import unittest
+
+from lab1.src.alphabet import DIGITS, EN_DIGITS, Alphabet, CustomAlphabet
+from lab1.src.caesar_cipher import CaesarCipher
+from lab1.src.caesar_cracker import CaesarCracker
+
+
+class TestCaesarCracker(unittest.TestCase):
+    EN_TEXT = (
+        "It was the best of times, it was the worst of times, it was the age of "
+        "wisdom, it was the age of foolishness."
+    )
+    UK_TEXT = (
+        "Реве та стогне Дніпр широкий, сердитий вітер завива, додолу верби гне "
+        "високі, горами хвилю підійма."
+    )
+
+    def test_crack_every_key(self):
+        """Test that the key and plain text are recovered for every key."""
+        for alphabet, text in (
+            (Alphabet.EN, self.EN_TEXT),
+            (Alphabet.UK, self.UK_TEXT),
+        ):
+            cipher = CaesarCipher(alphabet)
+            cracker = CaesarCracker(alphabet)
+            for key in range(len(alphabet.value)):
+                with self.subTest(alphabet=alphabet, key=key):
+                    self.assertEqual(
+                        cracker.crack(cipher.cipher(text, key)), (key, text)
+                    )
+
+    def test_rank_returns_every_key(self):
+        """Test that rank scores every key once, best first."""
+        ranked = CaesarCracker().rank(CaesarCipher().cipher(self.EN_TEXT, 3))
+        self.assertEqual(sorted(candidate.key for candidate in ranked), list(range(52)))
+        self.assertEqual(ranked[0].key, 3)
+        self.assertEqual(ranked, sorted(ranked, key=lambda candidate: candidate.score))
+
+    def test_rank_stream_reads_only_sample(self):
+        """Test that rank_stream scores a prefix and leaves the rest unread."""
+        reader = io.StringIO(CaesarCipher().cipher(self.EN_TEXT * 100, 11))
+        ranked = CaesarCracker().rank_stream(reader, sample_size=200)
+        self.assertEqual(ranked[0].key, 11)
+        self.assertEqual(reader.tell(), 200)
+
+    def test_histogram(self):
+        """Test that the histogram counts each letter by alphabet position."""
+        counts = CaesarCracker(Alphabet.UK).histogram("Ґанок, ґава! Aa")
+        letters = Alphabet.UK.value
+        self.assertEqual(counts[letters.index("Ґ")], 1)
+        self.assertEqual(counts[letters.index("ґ")], 1)
+        self.assertEqual(counts[letters.index("а")], 3)
+        self.assertEqual(sum(counts), 9)
+
+    def test_rank_without_letters(self):
+        """Test that text without alphabet characters is rejected."""
+        with self.assertRaises(ValueError):
+            CaesarCracker().rank("1234, 5678!")
+
+    def test_alphabet_without_frequencies(self):
+        """Test that alphabets without reference frequencies are rejected."""
+        for alphabet in (DIGITS, EN_DIGITS, CustomAlphabet("TEST", "abAB")):
+            with self.subTest(alphabet=alphabet.name):
+                with self.assertRaises(ValueError):
+                    CaesarCracker(alphabet)
+
+
+if __name__ == "__main__":
+    unittest.main()
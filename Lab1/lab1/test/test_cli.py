@@ -0,0 +1,169 @@
+import contextlib
+import io
+import pathlib
+import tempfile
+import unittest
+
+from lab1.src.cli import main
+
+TEXTS = {
+    "a.txt": "Hello, World! The quick brown fox.\n",
+    "sub/b.txt": "Jumps over the lazy dog 42 times.\n" * 20,
+}
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        """Setup a directory of plain text inputs."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self.directory.name)
+        for name, text in TEXTS.items():
+            path = self.root / "plain" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_cli(self, *args: str) -> str:
+        """Run the CLI on two worker processes and return what it printed."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main([*args, "-j", "2"])
+        return output.getvalue()
+
+    def assertRestored(self, name: str):
+        for relative, text in TEXTS.items():
+            path = self.root / name / relative
+            self.assertEqual(path.read_text(encoding="utf-8"), text)
+
+    def test_round_trip(self):
+        """Test text, single-byte and container round trips of a directory."""
+        for number, options in enumerate(([], ["-e", "latin-1"], ["-c"])):
+            encrypted = str(self.root / f"encrypted{number}")
+            decrypted = f"decrypted{number}"
+            with self.subTest(options=options):
+                output = self.run_cli(
+                    "encrypt",
+                    str(self.root / "plain"),
+                    "-o",
+                    encrypted,
+                    "-k",
+                    "3",
+                    *options,
+                )
+                self.assertIn("Total: 2 files", output)
+                self.run_cli(
+                    "decrypt",
+                    encrypted,
+                    "-o",
+                    str(self.root / decrypted),
+                    "-k",
+                    "3",
+                    *options,
+                )
+                self.assertRestored(decrypted)
+                outputs = sorted(
+                    path.name for path in pathlib.Path(encrypted).rglob("*")
+                )
+                suffix = ".sslc" if "-c" in options else ""
+                self.assertEqual(outputs, ["a.txt" + suffix, "b.txt" + suffix, "sub"])
+        encrypted = (self.root / "encrypted0" / "a.txt").read_text(encoding="utf-8")
+        self.assertEqual(encrypted, "Khoor, Zruog! Wkh txlfn eurzq irA.\n")
+
+    def test_replaces_existing_outputs(self):
+        """Test that outputs replace earlier files without leaving temporary files."""
+        target = self.root / "encrypted" / "a.txt"
+        target.parent.mkdir()
+        target.write_text("stale output that is longer than the new one " * 10)
+        self.run_cli(
+            "encrypt", str(self.root / "plain"), "-o", str(target.parent), "-k", "1"
+        )
+        self.assertEqual(
+            target.read_text(encoding="utf-8"), "Ifmmp, Xpsme! Uif rvjdl cspxo gpy.\n"
+        )
+        self.assertFalse(list(target.parent.rglob(".tmp-*")))
+
+    def test_invalid_arguments(self):
+        """Test that invalid keys and inputs exit with an error and write nothing."""
+        output = self.root / "encrypted"
+        plain = str(self.root / "plain")
+        for args in (
+            ["encrypt", plain, "-o", str(output), "-k", "52"],
+            ["encrypt", plain, "-o", str(output), "-k=-1"],
+            ["encrypt", plain, "-o", str(output), "-k", "x"],
+            ["encrypt", plain, "-o", str(output), "-k", "3", "-a", "NONE"],
+            ["encrypt", plain, "-o", str(output), "-k", "3", "-e", "utf-8"],
+            ["encrypt", str(self.root / "none"), "-o", str(output), "-k", "3"],
+            ["decrypt", plain, "-o", str(output), "-k", "3", "-c", "--check"],
+        ):
+            with self.subTest(args=args):
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr), self.assertRaises(
+                    SystemExit
+                ) as context:
+                    main(args)
+                self.assertEqual(context.exception.code, 2)
+                self.assertIn("error", stderr.getvalue())
+                self.assertFalse(output.exists())
+
+    def test_check(self):
+        """Test that --check reports foreign letters and stops before writing."""
+        output = self.root / "encrypted"
+        args = [
+            "encrypt",
+            str(self.root / "plain"),
+            "-o",
+            str(output),
+            "-k",
+            "3",
+            "--check",
+        ]
+        report = self.run_cli(*args)
+        self.assertIn("Total: 2 files", report)
+        (self.root / "plain" / "c.txt").write_text("Hello, Світ!\n", encoding="utf-8")
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), self.assertRaises(
+            SystemExit
+        ) as context:
+            main(args)
+        self.assertIn("unencrypted", str(context.exception.code))
+        self.assertIn("c.txt", stdout.getvalue())
+        self.assertFalse((output / "c.txt").exists())
+
+    def test_cache(self):
+        """Test that a second run copies encrypted outputs from the cache."""
+        cache = str(self.root / "cache.db")
+        encrypted = str(self.root / "encrypted")
+        encrypt = [
+            "encrypt",
+            str(self.root / "plain"),
+            "-o",
+            encrypted,
+            "-k",
+            "3",
+            "--cache",
+            cache,
+        ]
+        self.assertIn("Cache: 0 hits, 2 misses", self.run_cli(*encrypt))
+        outputs = {
+            path: path.read_bytes() for path in pathlib.Path(encrypted).rglob("*.txt")
+        }
+        self.assertIn("Cache: 2 hits, 0 misses", self.run_cli(*encrypt))
+        self.assertEqual({path: path.read_bytes() for path in outputs}, outputs)
+        decrypt = [
+            "decrypt",
+            encrypted,
+            "-o",
+            str(self.root / "decrypted"),
+            "-k",
+            "3",
+            "--cache",
+            cache,
+        ]
+        self.assertIn("never cached", self.run_cli(*decrypt))
+        self.assertRestored("decrypted")
+
+
+if __name__ == "__main__":
+    unittest.main()
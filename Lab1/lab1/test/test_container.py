@@ -0,0 +1,111 @@
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+
+from lab1.src.alphabet import Alphabet, CustomAlphabet
+from lab1.src.caesar_cipher import CaesarCipher
+from lab1.src.container import (
+    ContainerError,
+    Header,
+    read_container,
+    scan,
+    write_container,
+)
+
+
+class TestContainer(unittest.TestCase):
+    def setUp(self):
+        """Setup a temporary directory and a sample text."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name) / "text.sslc"
+        self.text = "Привіт, Світе! Hello, World!\n" * 300
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def decrypt(self, key: int, **kwargs) -> str:
+        """Decrypt the container into a string."""
+        writer = io.StringIO()
+        read_container(self.path, writer, key, **kwargs)
+        return writer.getvalue()
+
+    def test_round_trip(self):
+        """Test that containers decrypt in order, in and out of process."""
+        chars = write_container(
+            io.StringIO(self.text), self.path, Alphabet.UK, 5, "cp1251", 1000
+        )
+        self.assertEqual(chars, len(self.text))
+        found = scan(self.path)
+        self.assertTrue(found.complete)
+        self.assertEqual(found.chars, len(self.text))
+        self.assertEqual(
+            found.header, Header("caesar", "UK", Alphabet.UK.value, "cp1251")
+        )
+        self.assertIs(found.header.get_alphabet(), Alphabet.UK)
+        self.assertEqual(self.decrypt(5), self.text)
+        self.assertEqual(self.decrypt(5, jobs=2), self.text)
+        # Nine cp1251 blocks of one byte per character and the end marker.
+        overhead = len(found.header.to_bytes()) + 10 * 20
+        self.assertEqual(os.path.getsize(self.path), len(self.text) + overhead)
+
+    def test_unregistered_alphabet(self):
+        """Test that the header carries the letters of custom alphabets."""
+        alphabet = CustomAlphabet("TEST_ABC", "abc")
+        write_container(io.StringIO("abcabc xyz"), self.path, alphabet, 1)
+        self.assertEqual(scan(self.path).header.get_alphabet(), alphabet)
+        self.assertEqual(self.decrypt(1), "abcabc xyz")
+
+    def test_interrupted_write(self):
+        """Test that an interrupted container is detected and resumed."""
+        write_container(
+            io.StringIO(self.text), self.path, Alphabet.UK, 5, block_chars=700
+        )
+        expected = self.path.read_bytes()
+        self.path.write_bytes(expected[: len(expected) // 2])
+
+        found = scan(self.path)
+        self.assertFalse(found.complete)
+        self.assertEqual(found.chars % 700, 0)
+        with self.assertRaises(ContainerError):
+            self.decrypt(5)
+        self.assertEqual(self.decrypt(5, partial=True), self.text[: found.chars])
+
+        with self.assertRaises(ContainerError):
+            write_container(
+                io.StringIO(self.text), self.path, Alphabet.EN, 5, resume=True
+            )
+        write_container(
+            io.StringIO(self.text),
+            self.path,
+            Alphabet.UK,
+            5,
+            block_chars=700,
+            resume=True,
+        )
+        self.assertEqual(self.path.read_bytes(), expected)
+
+    def test_corruption(self):
+        """Test that damaged containers are rejected."""
+        write_container(
+            io.StringIO(self.text), self.path, Alphabet.EN, 3, block_chars=500
+        )
+        data = bytearray(self.path.read_bytes())
+        data[len(data) // 2] ^= 0xFF
+        self.path.write_bytes(bytes(data))
+        with self.assertRaises(ContainerError):
+            self.decrypt(3)
+        self.path.write_bytes(b"not a container")
+        with self.assertRaises(ContainerError):
+            scan(self.path)
+
+    def test_key_is_not_stored(self):
+        """Test that the header holds no key and a wrong key decrypts wrongly."""
+        write_container(io.StringIO(self.text), self.path, Alphabet.EN, 3)
+        header = scan(self.path).header
+        self.assertEqual(header.params, {})
+        cipher = CaesarCipher(Alphabet.EN)
+        self.assertEqual(
+            self.decrypt(4), cipher.decipher(cipher.cipher(self.text, 3), 4)
+        )
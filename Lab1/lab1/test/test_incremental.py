@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from lab1.src.alphabet import Alphabet
+from lab1.src.caesar_cipher import CaesarCipher
+from lab1.src.incremental import IncrementalSession, common_prefix, common_suffix
+
+
+def random_edit(rng: random.Random, text: str) -> str:
+    """Replace, insert or delete a random span of text."""
+    start = rng.randrange(len(text) + 1)
+    end = min(len(text), start + rng.randrange(20))
+    insert = "".join(rng.choices("abcXYZ ,.", k=rng.randrange(20)))
+    if rng.random() < 0.3:
+        size = end - start
+        insert = insert[:size].ljust(size, "q")
+    return text[:start] + insert + text[end:]
+
+
+class TestIncrementalSession(unittest.TestCase):
+    def setUp(self):
+        """Setup a session for key 7 over a sample document."""
+        self.cipher = CaesarCipher(Alphabet.EN)
+        self.session = IncrementalSession(
+            lambda chunk, _: self.cipher.cipher(chunk, 7),
+            lambda chunk, _: self.cipher.decipher(chunk, 7),
+        )
+        self.text = "The quick brown fox jumps over the lazy dog. " * 500
+
+    def test_common_prefix_and_suffix(self):
+        """Test the block-wise string comparisons across block boundaries."""
+        a = "x" * 10000
+        for position in (0, 4095, 4096, 9999):
+            after = position + 1
+            b = a[:position] + "y" + a[after:]
+            self.assertEqual(common_prefix(a, b), position)
+            self.assertEqual(common_suffix(a, b, len(a)), len(a) - 1 - position)
+        self.assertEqual(common_prefix(a, a + "z"), len(a))
+        self.assertEqual(common_suffix(a, "z" + a, 50), 50)
+
+    def test_edits_match_full_encryption(self):
+        """Test random edits against a full re-encryption."""
+        rng = random.Random(0)
+        text = self.text
+        self.assertEqual(self.session.encrypt(text), self.cipher.cipher(text, 7))
+        for _ in range(200):
+            text = random_edit(rng, text)
+            self.assertEqual(self.session.encrypt(text), self.cipher.cipher(text, 7))
+            self.assertLess(self.session.reprocessed, 40)
+        self.assertTrue(self.session.verify())
+
+    def test_decrypt_updates_plaintext(self):
+        """Test that edits of the ciphertext side are decrypted incrementally."""
+        ciphertext = self.cipher.cipher(self.text, 7)
+        self.session.reset(self.text, ciphertext)
+        edited = ciphertext[:100] + "Zzz" + ciphertext[100:]
+        self.assertEqual(self.session.decrypt(edited), self.cipher.decipher(edited, 7))
+        self.assertEqual(self.session.reprocessed, 3)
+        self.assertTrue(self.session.verify())
+
+    def test_max_span(self):
+        """Test that too large an edit leaves the session untouched."""
+        self.assertIsNone(self.session.encrypt(self.text, 100))
+        self.assertEqual(self.session.plaintext, "")
+        self.session.reset(self.text, self.cipher.cipher(self.text, 7))
+        self.assertIsNotNone(self.session.encrypt(self.text + "tail", 100))
+        self.assertEqual(self.session.reprocessed, 4)
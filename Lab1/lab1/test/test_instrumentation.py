@@ -0,0 +1,70 @@
+import io
+import json
+import unittest
+
+from lab1.src import instrumentation
+from lab1.src.alphabet import Alphabet
+from lab1.src.caesar_cipher import CaesarCipher
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.cipher = CaesarCipher(Alphabet.EN)
+
+    def test_disabled_by_default(self):
+        """Test that nothing is recorded outside an instrument block."""
+        self.assertIs(instrumentation.stage("shift"), instrumentation.stage("io"))
+        with instrumentation.instrument() as metrics:
+            pass
+        self.cipher.cipher("Hello", 3)
+        self.assertEqual(metrics.counters, {})
+        self.assertEqual(metrics.stage_calls, {})
+
+    def test_records_stages_counters_and_caches(self):
+        """Test that cipher calls report their stages, characters and cache use."""
+        with instrumentation.instrument() as metrics:
+            self.cipher.cipher("Hello, World!", 7)
+            self.cipher.cipher("Hello, World!", 7)
+        self.assertEqual(metrics.counters["chars"], 26)
+        self.assertEqual(metrics.stage_calls, {"lookup": 2, "shift": 2})
+        hits, misses = metrics.caches["translation_table"]
+        self.assertEqual(hits + misses, 2)
+        self.assertGreaterEqual(hits, 1)
+        self.assertGreater(metrics.snapshot()["chars_per_second"], 0)
+
+    def test_stream_records_io(self):
+        """Test that streams report reads and writes as the io stage."""
+        writer = io.StringIO()
+        with instrumentation.instrument() as metrics:
+            self.cipher.encrypt_stream(io.StringIO("abc" * 10), writer, 1, 8)
+        # Four reads with data, one empty read and four writes.
+        self.assertEqual(metrics.stage_calls["io"], 9)
+        self.assertEqual(metrics.stage_calls["shift"], 4)
+        self.assertEqual(metrics.counters["chars"], 30)
+
+    def test_nested_blocks_collect_alone(self):
+        """Test that an inner block takes over until it exits."""
+        with instrumentation.instrument() as outer:
+            self.cipher.cipher("abc", 1)
+            with instrumentation.instrument() as inner:
+                self.cipher.cipher("abcd", 1)
+            self.cipher.cipher("ab", 1)
+        self.assertEqual(outer.counters["chars"], 5)
+        self.assertEqual(inner.counters["chars"], 4)
+
+    def test_exports(self):
+        """Test the JSON and Prometheus dumps."""
+        with instrumentation.instrument("caesar") as metrics:
+            self.cipher.cipher("abc", 1)
+        snapshot = json.loads(metrics.to_json())
+        self.assertEqual(snapshot["counters"], {"chars": 3})
+        self.assertEqual(snapshot["stages"]["shift"]["calls"], 1)
+        text = metrics.to_prometheus()
+        self.assertTrue(text.endswith("\n"))
+        self.assertIn("# TYPE caesar_stage_seconds_total counter\n", text)
+        self.assertIn('caesar_stage_calls_total{stage="lookup"} 1\n', text)
+        self.assertIn('caesar_events_total{event="chars"} 3\n', text)
+        self.assertIn('caesar_cache_hit_ratio{cache="translation_table"} ', text)
+        for line in text.splitlines():
+            if not line.startswith("#"):
+                float(line.rsplit(" ", 1)[1])
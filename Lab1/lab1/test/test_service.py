@@ -0,0 +1,47 @@
+import asyncio
+import unittest
+
+from lab1.src.alphabet import Alphabet
+from lab1.src.service import CipherService, HttpError, Job, parse_job
+
+
+class TestService(unittest.TestCase):
+    def test_parse_job(self):
+        """Test parsing of valid and invalid requests."""
+        self.assertEqual(
+            parse_job("POST", "/encrypt?key=5&alphabet=UK", "Привіт".encode()),
+            Job("encrypt", Alphabet.UK, 5, "Привіт"),
+        )
+        for method, target, status in (
+            ("POST", "/encrypt?key=99", 400),
+            ("POST", "/encrypt", 400),
+            ("GET", "/decrypt?key=5", 405),
+            ("POST", "/other?key=5", 404),
+        ):
+            with self.subTest(target=target):
+                with self.assertRaises(HttpError) as context:
+                    parse_job(method, target, b"HELLO")
+                self.assertEqual(context.exception.status, status)
+
+    def test_chunked_request(self):
+        """Test a chunked request end to end over TCP."""
+
+        async def scenario() -> bytes:
+            service = CipherService(workers=1)
+            server_task = asyncio.create_task(service.serve(port=0))
+            while not service.servers:
+                await asyncio.sleep(0.01)
+            port = service.servers[0].sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(
+                b"POST /encrypt?key=5 HTTP/1.1\r\nTransfer-Encoding: chunked\r\n"
+                b"Connection: close\r\n\r\n7\r\nHELLO, \r\n6\r\nWORLD!\r\n0\r\n\r\n"
+            )
+            response = await reader.read()
+            writer.close()
+            server_task.cancel()
+            return response
+
+        response = asyncio.run(scenario())
+        self.assertTrue(response.startswith(b"HTTP/1.1 200 OK"))
+        self.assertTrue(response.endswith(b"\r\n\r\nMJQQT, bTWQI!"))
@@ -0,0 +1,66 @@
+import io
+import random
+import unittest
+from collections import Counter
+
+from lab1.src import validation
+from lab1.src.alphabet import EN_DIGITS, Alphabet
+from lab1.src.validation import validate_stream, validate_text
+
+
+def expected_report(alphabet, text: str) -> tuple:
+    """Classify a text character by character."""
+    members = alphabet.lookup.members
+    counts = Counter(text)
+    return (
+        sum(count for char, count in counts.items() if char in members),
+        {
+            char: count
+            for char, count in counts.items()
+            if char.isalpha() and char not in members
+        },
+        tuple(sorted({validation._script(char) for char in counts if char.isalpha()})),
+    )
+
+
+class TestValidation(unittest.TestCase):
+    def test_report(self):
+        """Test coverage, foreign letters and mixed scripts."""
+        report = validate_text(Alphabet.UK, "Київ, Kyiv!")
+        self.assertEqual(report.length, 11)
+        self.assertEqual(report.letters, 3)
+        self.assertEqual(report.foreign, {"ї": 1, "K": 1, "y": 1, "i": 1, "v": 1})
+        self.assertEqual(report.scripts, ("CYRILLIC", "LATIN"))
+        self.assertFalse(report.ok)
+        self.assertIn("Letters mix scripts: CYRILLIC, LATIN", report.summary())
+
+        report = validate_text(Alphabet.EN, "Hello, World! 123")
+        self.assertTrue(report.ok)
+        self.assertAlmostEqual(report.coverage, 10 / 17)
+
+    def test_random_texts(self):
+        """Test every coding path against a character by character check."""
+        rng = random.Random(24)
+        pools = (
+            "Hello, World! é123",
+            "Привіт, світ — «так» Hi",
+            "a\0b😀c",
+            "￾ x" + "".join(map(chr, range(0x4E00, 0x4F2C))),
+        )
+        for _ in range(300):
+            text = "".join(rng.choices(rng.choice(pools), k=rng.randint(0, 80)))
+            for alphabet in (Alphabet.EN, Alphabet.UK, EN_DIGITS):
+                with self.subTest(text=text, alphabet=alphabet.name):
+                    letters, foreign, scripts = expected_report(alphabet, text)
+                    for report in (
+                        validate_text(alphabet, text),
+                        validate_stream(alphabet, io.StringIO(text), 7),
+                    ):
+                        self.assertEqual(report.length, len(text))
+                        self.assertEqual(report.letters, letters)
+                        self.assertEqual(report.foreign, foreign)
+                        self.assertEqual(report.scripts, scripts)
+
+
+if __name__ == "__main__":
+    unittest.main()
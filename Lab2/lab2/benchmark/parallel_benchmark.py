@@ -0,0 +1,102 @@
+import argparse
+import os
+import random
+import time
+
+from lab2.src.alphabet import Alphabet
+from lab2.src.mode import Mode
+from lab2.src.parallel import DEFAULT_SEGMENT_CHARS, ParallelEngine
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+KEYS: dict[Mode, dict] = {
+    Mode.LINEAR: {"A": 3, "B": 5},
+    Mode.NON_LINEAR: {"A": 2, "B": 3, "C": 4},
+    Mode.PASSPHRASE: {"passphrase": "Secret"},
+}
+
+
+def make_text(alphabet: Alphabet, size: int, seed: int = 0) -> str:
+    """
+    Generate reproducible text quickly by repeating a random block.
+
+    Args:
+        alphabet (Alphabet): The alphabet to draw letters from.
+        size (int): The number of characters to generate.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        str: The generated text.
+    """
+    rng = random.Random(seed)
+    pool = alphabet.value + " " * 8 + ".,!?\n"
+    block = "".join(rng.choices(pool, k=min(size, 64 * 1024)))
+    return (block * (size // len(block) + 1))[:size]
+
+
+def time_run(
+    engine: ParallelEngine, cipher: TrithemiusCipher, text: str, mode: Mode
+) -> float:
+    """
+    Encrypt text once on a warm pool and check the round trip.
+
+    Args:
+        engine (ParallelEngine): The engine to run on.
+        cipher (TrithemiusCipher): The cipher compiling the key.
+        text (str): The text to encrypt.
+        mode (Mode): The mode of the cipher.
+
+    Returns:
+        float: Seconds spent encrypting.
+    """
+    start = time.perf_counter()
+    encrypted = cipher.parallel_cipher(text, mode, engine, **KEYS[mode])
+    elapsed = time.perf_counter() - start
+    if cipher.parallel_decipher(encrypted, mode, engine, **KEYS[mode]) != text:
+        raise SystemExit(f"{mode.name}: round trip differs on {engine.jobs} jobs")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Scaling of the shared-memory engine from 1 to N processes"
+    )
+    parser.add_argument(
+        "--size-mb", type=int, default=1024, help="millions of characters (MiB)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        default=list(range(1, (os.cpu_count() or 1) + 1)),
+        help="worker counts to measure; 1 is the serial baseline",
+    )
+    parser.add_argument(
+        "--mode", choices=[mode.name for mode in KEYS], default="LINEAR"
+    )
+    parser.add_argument("--segment-chars", type=int, default=DEFAULT_SEGMENT_CHARS)
+    args = parser.parse_args()
+
+    mode = Mode[args.mode]
+    cipher = TrithemiusCipher(Alphabet.EN)
+    size = args.size_mb * 1024**2
+    text = make_text(Alphabet.EN, size)
+    jobs_list = sorted(set(args.jobs) | {1})
+
+    print(f"{args.mode} mode, {size} characters, {os.cpu_count()} CPUs")
+    print(f"{'jobs':>5} {'seconds':>9} {'Mch/s':>8} {'speedup':>8} {'efficiency':>10}")
+    baseline = 0.0
+    for jobs in jobs_list:
+        with ParallelEngine(jobs, args.segment_chars) as engine:
+            # Warm the pool so process start-up is not measured.
+            cipher.parallel_cipher(text[: jobs * 1024], mode, engine, **KEYS[mode])
+            elapsed = time_run(engine, cipher, text, mode)
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(
+            f"{jobs:>5} {elapsed:9.3f} {size / elapsed / 1e6:8.2f} "
+            f"{speedup:7.2f}x {speedup / jobs:10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable
+
+from lab2.src.alphabet import Alphabet
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+SIZES = {"1KB": 1024, "1MB": 1024**2, "16MB": 16 * 1024**2}
+PASSPHRASES = {Alphabet.EN: "Secret", Alphabet.UK: "Таємниця"}
+
+
+def legacy_cipher(
+    cipher: TrithemiusCipher, alphabet: Alphabet, text: str, mode: Mode, **kwargs
+) -> str:
+    """
+    Reference copy of the previous loop that recomputes k for every character.
+
+    Args:
+        cipher (TrithemiusCipher): The cipher computing k.
+        alphabet (Alphabet): The alphabet of the cipher.
+        text (str): The text to be encrypted.
+        mode (Mode): The mode of the cipher.
+        **kwargs: Key arguments for the corresponding mode.
+
+    Returns:
+        str: The encrypted text.
+    """
+    encrypted_text = []
+    index, chars = alphabet.lookup.index, alphabet.lookup.chars
+    n = len(chars)
+    for idx, char in enumerate(text):
+        x = index.get(char)
+        if x is not None:
+            k = cipher._calculate_k(mode, idx, **kwargs)
+            y = (x + k) % n
+            encrypted_text.append(chars[y])
+        else:
+            encrypted_text.append(char)
+    return "".join(encrypted_text)
+
+
+def make_text(alphabet: Alphabet, size: int, seed: int = 0) -> str:
+    """
+    Generate reproducible text mixing alphabet letters, spaces and punctuation.
+
+    Args:
+        alphabet (Alphabet): The alphabet to draw letters from.
+        size (int): The number of characters to generate.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        str: The generated text.
+    """
+    rng = random.Random(seed)
+    pool = alphabet.value + " " * 8 + ".,!?\n"
+    block = "".join(rng.choices(pool, k=min(size, 64 * 1024)))
+    return (block * (size // len(block) + 1))[:size]
+
+
+def measure(func: Callable[[], str], size: int) -> tuple[float, int]:
+    """
+    Run func once for its throughput and once more for its peak memory.
+
+    Args:
+        func (Callable[[], str]): The operation to time.
+        size (int): The number of characters processed by func.
+
+    Returns:
+        tuple[float, int]: Characters per second and peak bytes allocated.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (size / elapsed if elapsed else float("inf")), peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Per-character k versus compiled shift schedules"
+    )
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument(
+        "--legacy-limit",
+        type=int,
+        default=SIZES["1MB"],
+        help="skip the legacy implementation above this many characters",
+    )
+    parser.add_argument("--alphabet", choices=["EN", "UK"], default="EN")
+    args = parser.parse_args()
+
+    alphabet = Alphabet[args.alphabet]
+    cipher = TrithemiusCipher(alphabet)
+    keys: dict[Mode, dict] = {
+        Mode.LINEAR: {"A": 3, "B": 5},
+        Mode.NON_LINEAR: {"A": 2, "B": 3, "C": 4},
+        Mode.PASSPHRASE: {"passphrase": PASSPHRASES[alphabet]},
+    }
+
+    print(
+        f"{'mode':>10} {'size':>6} {'legacy Mch/s':>12} {'legacy MB':>10} "
+        f"{'compiled Mch/s':>14} {'compiled MB':>11} {'speedup':>8}"
+    )
+    for mode, key in keys.items():
+        schedule = cipher.compile_key(mode, **key)
+        for label in args.sizes:
+            size = SIZES[label]
+            text = make_text(alphabet, size)
+            compiled, compiled_peak = measure(lambda: schedule.encrypt(text), size)
+            legacy_cells = f"{'skipped':>12} {'-':>10}"
+            speedup = f"{'-':>8}"
+            if size <= args.legacy_limit:
+                legacy, legacy_peak = measure(
+                    lambda: legacy_cipher(cipher, alphabet, text, mode, **key), size
+                )
+                expected = legacy_cipher(cipher, alphabet, text, mode, **key)
+                if expected != schedule.encrypt(text):
+                    raise SystemExit(f"{mode.name} {label}: output differs")
+                legacy_cells = f"{legacy / 1e6:12.2f} {legacy_peak / 1024**2:10.1f}"
+                speedup = f"{compiled / legacy:7.1f}x"
+            print(
+                f"{mode.name:>10} {label:>6} {legacy_cells} {compiled / 1e6:14.2f} "
+                f"{compiled_peak / 1024**2:11.1f} {speedup}"
+            )
+        print(
+            f"{mode.name:>10} schedule: period {schedule.period}, "
+            f"{schedule.shifts.itemsize * schedule.period} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
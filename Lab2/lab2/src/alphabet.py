@@ -1,4 +1,14 @@
+from array import array
+from dataclasses import dataclass
 from enum import Enum
+from functools import cache
+
+# This module mirrors Lab1/lab1/src/alphabet.py. The labs are separate
+# Poetry projects without a shared package, so the registry is copied rather
+# than imported; change both copies together.
+
+# The UTF-16 surrogate code points cannot appear in text read from files.
+_SURROGATES = range(0xD800, 0xE000)
 
 
 class Alphabet(Enum):
@@ -6,3 +16,198 @@ class Alphabet(Enum):
 
     EN = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
     UK = "АБВГҐДЕЄЖЗИЙКЛМНОПРСТУФХЦЧШЩЬЮЯабвгґдеєжзийклмнопрстуфхцчшщьюя"
+
+    @property
+    def lookup(self) -> "AlphabetLookup":
+        """The shared precomputed lookup structures for this alphabet."""
+        return get_lookup(self)
+
+
+@dataclass(frozen=True, slots=True)
+class CustomAlphabet:
+    """
+    An alphabet registered at runtime.
+
+    Custom alphabets look like `Alphabet` members to the ciphers: the letters
+    are the `value`, the registered name is the `name`, and the instances are
+    hashable, so every per-alphabet cache works with them unchanged.
+
+    Attributes:
+        name (str): The name the alphabet is registered under.
+        value (str): The letters of the alphabet, in cipher order.
+    """
+
+    name: str
+    value: str
+
+    @property
+    def lookup(self) -> "AlphabetLookup":
+        """The shared precomputed lookup structures for this alphabet."""
+        return get_lookup(self)
+
+
+# Any alphabet the ciphers accept.
+AnyAlphabet = Alphabet | CustomAlphabet
+
+
+@dataclass(frozen=True, slots=True)
+class AlphabetLookup:
+    """
+    Immutable lookup structures precomputed for an alphabet.
+
+    Attributes:
+        index (dict[str, int]): Maps each character to its position.
+        chars (tuple[str, ...]): Maps each position to its character.
+        members (frozenset[str]): The set of characters in the alphabet.
+        start (int): The lowest code point of the alphabet.
+        offsets (array | None): Maps each code point minus start to its
+            position when the letters cover a contiguous code point range, so
+            positions are found by indexing instead of hashing. None otherwise.
+    """
+
+    index: dict[str, int]
+    chars: tuple[str, ...]
+    members: frozenset[str]
+    start: int
+    offsets: array | None
+
+    def position(self, char: str) -> int | None:
+        """
+        Find the position of a character in the alphabet.
+
+        Args:
+            char (str): A single character.
+
+        Returns:
+            int | None: The position, or None if the character is not a letter.
+        """
+        if self.offsets is None:
+            return self.index.get(char)
+        offset = ord(char) - self.start
+        if 0 <= offset < len(self.offsets):
+            return self.offsets[offset]
+        return None
+
+
+@cache
+def get_lookup(alphabet: AnyAlphabet) -> AlphabetLookup:
+    """
+    Build the lookup structures for an alphabet once and share them afterwards.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet to build lookups for.
+
+    Returns:
+        AlphabetLookup: The lookup structures for the alphabet.
+    """
+    letters = alphabet.value
+    start = min(map(ord, letters))
+    offsets = None
+    if max(map(ord, letters)) - start + 1 == len(letters):
+        offsets = array("l", [0]) * len(letters)
+        for position, char in enumerate(letters):
+            offsets[ord(char) - start] = position
+    return AlphabetLookup(
+        index={char: position for position, char in enumerate(letters)},
+        chars=tuple(letters),
+        members=frozenset(letters),
+        start=start,
+        offsets=offsets,
+    )
+
+
+_registry: dict[str, AnyAlphabet] = {member.name: member for member in Alphabet}
+
+
+def register_alphabet(name: str, letters: str) -> CustomAlphabet:
+    """
+    Register an alphabet made of arbitrary letters.
+
+    Args:
+        name (str): The name to register the alphabet under.
+        letters (str): The letters, in cipher order.
+
+    Returns:
+        CustomAlphabet: The registered alphabet.
+
+    Raises:
+        ValueError: If the name is taken or the letters are not usable.
+    """
+    if not name or name in _registry:
+        raise ValueError(f"Alphabet name {name!r} is empty or already registered")
+    if len(letters) < 2:
+        raise ValueError("An alphabet needs at least two letters")
+    if len(set(letters)) != len(letters):
+        raise ValueError("Alphabet letters must be unique")
+    if any(ord(char) in _SURROGATES for char in letters):
+        raise ValueError("Alphabet letters cannot be surrogate code points")
+    alphabet = CustomAlphabet(name, letters)
+    _registry[name] = alphabet
+    return alphabet
+
+
+def register_range(name: str, first: str, last: str) -> CustomAlphabet:
+    """
+    Register an alphabet of every code point from first to last.
+
+    Args:
+        name (str): The name to register the alphabet under.
+        first (str): The first letter of the range.
+        last (str): The last letter of the range, inclusive.
+
+    Returns:
+        CustomAlphabet: The registered alphabet.
+
+    Raises:
+        ValueError: If the name is taken or the range is not usable.
+    """
+    letters = "".join(map(chr, range(ord(first), ord(last) + 1)))
+    return register_alphabet(name, letters)
+
+
+def combine_alphabets(name: str, *alphabets: AnyAlphabet) -> CustomAlphabet:
+    """
+    Register an alphabet made of the letters of other alphabets, in order.
+
+    Args:
+        name (str): The name to register the alphabet under.
+        *alphabets (AnyAlphabet): The alphabets to combine.
+
+    Returns:
+        CustomAlphabet: The registered alphabet.
+
+    Raises:
+        ValueError: If the name is taken or the alphabets share letters.
+    """
+    return register_alphabet(name, "".join(alphabet.value for alphabet in alphabets))
+
+
+def get_alphabet(name: str) -> AnyAlphabet:
+    """
+    Look up a built-in or registered alphabet by name.
+
+    Args:
+        name (str): The name of the alphabet.
+
+    Returns:
+        AnyAlphabet: The alphabet.
+
+    Raises:
+        KeyError: If no alphabet is registered under the name.
+    """
+    return _registry[name]
+
+
+def alphabet_names() -> list[str]:
+    """
+    List the names of every built-in and registered alphabet.
+
+    Returns:
+        list[str]: The names, in registration order.
+    """
+    return list(_registry)
+
+
+DIGITS = register_range("DIGITS", "0", "9")
+ASCII = register_range("ASCII", "!", "~")
+EN_DIGITS = combine_alphabets("EN_DIGITS", Alphabet.EN, DIGITS)
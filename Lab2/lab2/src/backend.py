@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class Backend(Enum):
+    """Enumeration for available cipher computation backends."""
+
+    PYTHON = "PYTHON"
+    NUMPY = "NUMPY"
@@ -0,0 +1,252 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, TextIO
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+# Shifts a chunk of text; the second argument is the position of the chunk in
+# the whole text.
+Transform = Callable[[str, int], str]
+# Runs on the worker before the first chunk; returns None to go on, or a
+# finding the GUI must confirm before the job continues.
+Check = Callable[[], Any]
+
+
+class Event(Enum):
+    """Kinds of messages sent by a background job."""
+
+    CHECK = "CHECK"
+    CHUNK = "CHUNK"
+    PROGRESS = "PROGRESS"
+    DONE = "DONE"
+    CANCELLED = "CANCELLED"
+    ERROR = "ERROR"
+
+
+class Message(NamedTuple):
+    """
+    A message from the worker thread.
+
+    Attributes:
+        event (Event): What happened.
+        value (Any): The finding to confirm for CHECK, the processed text for
+            CHUNK, a (done, total) pair for PROGRESS, the exception for ERROR
+            and None otherwise.
+    """
+
+    event: Event
+    value: Any = None
+
+
+class BackgroundJob:
+    """
+    Runs a chunked cipher operation on a worker thread.
+
+    The worker never touches Tk. It reports through the messages queue, which
+    the GUI drains from a `root.after` callback, and it checks for
+    cancellation between chunks. Every job ends with exactly one DONE,
+    CANCELLED or ERROR message.
+
+    A job may start with a check, such as an input validation pass, that runs
+    on the worker too. If the check finds something, the worker sends it as a
+    CHECK message and waits until the GUI calls `answer`.
+
+    Attributes:
+        chunk_size (int): The number of characters processed per chunk.
+        messages (queue.Queue[Message]): Messages for the GUI, in order.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Initialize the job.
+
+        Args:
+            chunk_size (int): The number of characters processed per chunk.
+        """
+        self.chunk_size = chunk_size
+        self.messages: queue.Queue[Message] = queue.Queue()
+        self._cancelled = threading.Event()
+        self._answered = threading.Event()
+        self._proceed = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker thread is still running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self) -> None:
+        """Ask the worker to stop before its next chunk."""
+        self._cancelled.set()
+        self._answered.set()
+
+    def answer(self, proceed: bool) -> None:
+        """
+        Let a job waiting after a CHECK message go on or stop.
+
+        Args:
+            proceed (bool): Go on with the job; False cancels it.
+        """
+        self._proceed = proceed
+        self._answered.set()
+
+    def join(self, timeout: float | None = None) -> None:
+        """
+        Wait for the worker thread to finish.
+
+        Args:
+            timeout (float | None): Seconds to wait at most.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def start_text(
+        self, text: str, transform: Transform, check: Check | None = None
+    ) -> None:
+        """
+        Process text in memory, sending every processed chunk as a CHUNK message.
+
+        Args:
+            text (str): The text to process.
+            transform (Transform): Processes one chunk.
+            check (Check | None): Runs before the first chunk. Defaults to None.
+        """
+        self._start(check, self._process_text, text, transform)
+
+    def start_file(
+        self,
+        source: Path,
+        target: Path,
+        transform: Transform,
+        check: Check | None = None,
+    ) -> None:
+        """
+        Process a UTF-8 file into another file without loading it whole.
+
+        The target is replaced atomically once the whole file is processed and
+        left untouched if the job is cancelled or fails.
+
+        Args:
+            source (Path): The file to read.
+            target (Path): The file to write.
+            transform (Transform): Processes one chunk.
+            check (Check | None): Runs before the file is read. Defaults to None.
+        """
+        self._start(check, self._process_file, source, target, transform)
+
+    def _start(
+        self, check: Check | None, work: Callable[..., bool], *args: object
+    ) -> None:
+        """Run the check and work on a new daemon thread."""
+        self._thread = threading.Thread(
+            target=self._run, args=(check, work, *args), daemon=True
+        )
+        self._thread.start()
+
+    def _run(
+        self, check: Check | None, work: Callable[..., bool], *args: object
+    ) -> None:
+        """Run the check and work and report how it ended."""
+        try:
+            finished = self._confirm(check) and work(*args)
+        except Exception as error:
+            self.messages.put(Message(Event.ERROR, error))
+        else:
+            self.messages.put(Message(Event.DONE if finished else Event.CANCELLED))
+
+    def _confirm(self, check: Check | None) -> bool:
+        """
+        Run the check and wait for the GUI to answer what it found.
+
+        Args:
+            check (Check | None): The check to run, if any.
+
+        Returns:
+            bool: False if the job was cancelled or the GUI declined to go on.
+        """
+        finding = None if check is None else check()
+        if finding is not None:
+            self.messages.put(Message(Event.CHECK, finding))
+            self._answered.wait()
+            if not self._proceed:
+                return False
+        return not self._cancelled.is_set()
+
+    def _process_text(self, text: str, transform: Transform) -> bool:
+        """
+        Process text chunk by chunk.
+
+        Args:
+            text (str): The text to process.
+            transform (Transform): Processes one chunk.
+
+        Returns:
+            bool: False if the job was cancelled.
+        """
+        total = len(text)
+        for start in range(0, total, self.chunk_size):
+            if self._cancelled.is_set():
+                return False
+            end = start + self.chunk_size
+            self.messages.put(Message(Event.CHUNK, transform(text[start:end], start)))
+            self.messages.put(Message(Event.PROGRESS, (min(end, total), total)))
+        return True
+
+    def _process_file(self, source: Path, target: Path, transform: Transform) -> bool:
+        """
+        Process a file into a temporary file and move it into place.
+
+        Args:
+            source (Path): The file to read.
+            target (Path): The file to write.
+            transform (Transform): Processes one chunk.
+
+        Returns:
+            bool: False if the job was cancelled.
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with open(source, "r", encoding="utf-8", newline="") as reader, open(
+                fd, "w", encoding="utf-8", newline=""
+            ) as writer:
+                finished = self._copy(reader, writer, transform, source.stat().st_size)
+            if finished:
+                shutil.copymode(source, temp_path)
+                os.replace(temp_path, target)
+                return True
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        os.unlink(temp_path)
+        return False
+
+    def _copy(
+        self, reader: TextIO, writer: TextIO, transform: Transform, total: int
+    ) -> bool:
+        """
+        Copy processed chunks from reader to writer, reporting bytes read.
+
+        Args:
+            reader (TextIO): The stream to read text from.
+            writer (TextIO): The stream to write processed text to.
+            transform (Transform): Processes one chunk.
+            total (int): The size of the input in bytes.
+
+        Returns:
+            bool: False if the job was cancelled.
+        """
+        offset = done = 0
+        while chunk := reader.read(self.chunk_size):
+            if self._cancelled.is_set():
+                return False
+            writer.write(transform(chunk, offset))
+            offset += len(chunk)
+            done += len(chunk.encode("utf-8"))
+            self.messages.put(Message(Event.PROGRESS, (done, total)))
+        return True
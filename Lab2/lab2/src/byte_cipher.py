@@ -0,0 +1,133 @@
+import codecs
+import contextlib
+import mmap
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Iterator, Sequence
+
+from lab2.src import instrumentation
+from lab2.src.alphabet import AnyAlphabet
+
+DEFAULT_BLOCK_SIZE = 16 * 1024**2
+
+
+def is_single_byte(encoding: str) -> bool:
+    """
+    Check whether every byte of an encoding stands for one character on its own.
+
+    Multi-byte encodings such as UTF-8 hold some bytes back until the rest of
+    the character arrives, which an incremental decoder reveals.
+
+    Args:
+        encoding (str): The name of the encoding.
+
+    Returns:
+        bool: True for encodings such as latin-1, cp1251 or koi8-u.
+
+    Raises:
+        LookupError: If the encoding is unknown.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)("replace")
+    return all(decoder.decode(bytes([byte])) for byte in range(256))
+
+
+def encode_alphabet(alphabet: AnyAlphabet, encoding: str) -> bytes:
+    """
+    Encode the letters of an alphabet in a single-byte encoding.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet to encode.
+        encoding (str): The name of a single-byte encoding.
+
+    Returns:
+        bytes: One byte per letter, in alphabet order.
+
+    Raises:
+        ValueError: If the encoding is not single-byte or lacks some letters.
+    """
+    if not is_single_byte(encoding):
+        raise ValueError(f"{encoding} is not a single-byte encoding")
+    try:
+        return alphabet.value.encode(encoding)
+    except UnicodeEncodeError:
+        raise ValueError(
+            f"{encoding} cannot encode the {alphabet.name} alphabet"
+        ) from None
+
+
+def shift_file(
+    source: str | os.PathLike,
+    target: str | os.PathLike,
+    tables: Sequence[bytes],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> int:
+    """
+    Substitute the bytes of a file through a cycle of tables, mmap to mmap.
+
+    Byte p of the file goes through tables[p % len(tables)]. Blocks hold whole
+    periods, so each phase of a block is one strided `bytes.translate` call
+    written straight into the pre-sized output mapping without decoding.
+    The output goes to a temporary file that then replaces the target, so the
+    target may be the source itself.
+
+    Args:
+        source (str | os.PathLike): The file to read.
+        target (str | os.PathLike): The file to write.
+        tables (Sequence[bytes]): One 256-byte `bytes.translate` table per
+            position of the period.
+        block_size (int): The approximate number of bytes processed at once.
+
+    Returns:
+        int: The number of bytes processed.
+    """
+    period = len(tables)
+    block_size = max(block_size - block_size % period, period)
+    with _replace(source, target) as (reader, writer):
+        size = os.fstat(reader.fileno()).st_size
+        writer.truncate(size)
+        if not size:
+            return 0
+        with mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as src, mmap.mmap(
+            writer.fileno(), size
+        ) as dst:
+            with instrumentation.stage("shift"):
+                for start in range(0, size, block_size):
+                    end = min(start + block_size, size)
+                    for phase, table in enumerate(tables):
+                        first = start + phase
+                        dst[first:end:period] = src[first:end:period].translate(table)
+            with instrumentation.stage("io"):
+                dst.flush()
+    instrumentation.count("bytes", size)
+    return size
+
+
+@contextlib.contextmanager
+def _replace(
+    source: str | os.PathLike, target: str | os.PathLike
+) -> Iterator[tuple[BinaryIO, BinaryIO]]:
+    """
+    Open a source for reading and a temporary file that replaces the target.
+
+    The target is replaced only once the block completes, so the source is
+    read in full even when it is the target itself.
+
+    Args:
+        source (str | os.PathLike): The file to read.
+        target (str | os.PathLike): The file to replace.
+
+    Yields:
+        tuple[BinaryIO, BinaryIO]: The reader and the writer.
+    """
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(target)), prefix=".tmp-"
+    )
+    try:
+        with open(source, "rb") as reader, open(fd, "wb+") as writer:
+            yield reader, writer
+        shutil.copymode(source, temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
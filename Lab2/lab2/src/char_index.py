@@ -0,0 +1,140 @@
+import io
+import os
+from array import array
+from bisect import bisect_right
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+# The longest UTF-8 sequence, so every block holds at least one character.
+MIN_BLOCK_SIZE = 4
+
+# Deleting every byte except UTF-8 continuation bytes (0b10xxxxxx) lets
+# bytes.translate count them at C speed.
+_NON_CONTINUATION = bytes(range(0x80)) + bytes(range(0xC0, 0x100))
+
+
+def _sequence_length(lead: int) -> int:
+    """
+    Return the length of the UTF-8 sequence started by the given lead byte.
+
+    Args:
+        lead (int): The first byte of the sequence.
+
+    Returns:
+        int: The number of bytes in the sequence.
+    """
+    if lead < 0x80:
+        return 1
+    if lead < 0xE0:
+        return 2
+    if lead < 0xF0:
+        return 3
+    return 4
+
+
+def _complete_prefix(block: bytes) -> int:
+    """
+    Return the length of the block without a trailing incomplete UTF-8 sequence.
+
+    Args:
+        block (bytes): Raw bytes read from a UTF-8 file.
+
+    Returns:
+        int: The number of bytes that form complete characters.
+    """
+    for back in range(1, min(4, len(block)) + 1):
+        lead = block[-back]
+        if lead & 0xC0 != 0x80:
+            return len(block) - back if _sequence_length(lead) > back else len(block)
+    return len(block)
+
+
+class CharOffsetIndex:
+    """
+    Sparse index mapping character offsets to byte offsets in a UTF-8 file.
+
+    A checkpoint is stored at the start of every block, so seeking to any
+    character costs at most one block of decoding.
+
+    Attributes:
+        path (str): The indexed file.
+        char_offsets (array): Character offset of every checkpoint.
+        byte_offsets (array): Byte offset of every checkpoint.
+        length (int): The total number of characters in the file.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike, block_size: int = DEFAULT_BLOCK_SIZE
+    ) -> None:
+        """
+        Builds the index in one pass over the file.
+
+        Args:
+            path (str | os.PathLike): The UTF-8 file to index.
+            block_size (int): Approximate number of bytes between checkpoints,
+                at least MIN_BLOCK_SIZE.
+
+        Raises:
+            ValueError: If block_size is smaller than MIN_BLOCK_SIZE.
+        """
+        if block_size < MIN_BLOCK_SIZE:
+            raise ValueError(
+                f"Block size must be at least {MIN_BLOCK_SIZE} bytes, not {block_size}"
+            )
+        self.path = os.fspath(path)
+        self.char_offsets = array("Q")
+        self.byte_offsets = array("Q")
+        self.length = 0
+
+        byte_offset = 0
+        with open(self.path, "rb") as file:
+            while True:
+                self.char_offsets.append(self.length)
+                self.byte_offsets.append(byte_offset)
+                block = file.read(block_size)
+                if not block:
+                    break
+                complete = _complete_prefix(block)
+                if complete < len(block):
+                    file.seek(complete - len(block), io.SEEK_CUR)
+                    block = block[:complete]
+                continuation = len(block.translate(None, _NON_CONTINUATION))
+                self.length += len(block) - continuation
+                byte_offset += len(block)
+
+    def locate(self, char_offset: int) -> tuple[int, int]:
+        """
+        Finds the nearest checkpoint at or before a character offset.
+
+        Args:
+            char_offset (int): The wanted character offset.
+
+        Returns:
+            tuple[int, int]: The checkpoint's character and byte offsets.
+        """
+        slot = bisect_right(self.char_offsets, char_offset) - 1
+        return self.char_offsets[slot], self.byte_offsets[slot]
+
+    def read(self, start: int, length: int) -> str:
+        """
+        Reads a window of characters without decoding the text before it.
+
+        Args:
+            start (int): Character offset of the window.
+            length (int): The number of characters to read.
+
+        Returns:
+            str: The characters in the window.
+
+        Raises:
+            ValueError: If start or length is negative.
+        """
+        if start < 0 or length < 0:
+            raise ValueError(
+                f"Window start and length must not be negative, not {start} and {length}"
+            )
+        char_offset, byte_offset = self.locate(start)
+        with open(self.path, "rb") as raw:
+            raw.seek(byte_offset)
+            with io.TextIOWrapper(raw, encoding="utf-8", newline="") as file:
+                file.read(start - char_offset)
+                return file.read(length)
@@ -0,0 +1,371 @@
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from lab2.src.alphabet import AnyAlphabet, alphabet_names, get_alphabet
+from lab2.src.byte_cipher import encode_alphabet
+from lab2.src.cache import DEFAULT_MAX_BYTES, ResultCache, file_digest
+from lab2.src.container import Header, read_container, write_container
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import TrithemiusCipher
+from lab2.src.validation import validate_stream
+
+CONTAINER_SUFFIX = ".sslc"
+
+
+class FileJob(NamedTuple):
+    """A single file to be processed by a worker."""
+
+    source: Path
+    target: Path
+    alphabet: AnyAlphabet
+    mode: Mode
+    key: dict
+    decrypt: bool
+    encoding: str | None = None
+    container: bool = False
+    cache: Path | None = None
+    cache_size: int = DEFAULT_MAX_BYTES
+    cache_key: Path | None = None
+
+
+class FileResult(NamedTuple):
+    """Outcome of a processed file."""
+
+    source: Path
+    size: int
+    seconds: float
+    cached: bool | None = None
+
+
+def collect_files(pattern: str) -> list[Path]:
+    """
+    Expand a directory or glob pattern into a sorted list of files.
+
+    Args:
+        pattern (str): A directory path or a glob pattern.
+
+    Returns:
+        list[Path]: The matching files.
+    """
+    if os.path.isdir(pattern):
+        return sorted(path for path in Path(pattern).rglob("*") if path.is_file())
+    return sorted(
+        Path(path)
+        for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path)
+    )
+
+
+def process_file(job: FileJob) -> FileResult:
+    """
+    Encrypt or decrypt one file, replacing the target atomically.
+
+    The output is written to a temporary file next to the target and moved
+    into place only once it is complete. Jobs with a single-byte encoding are
+    processed as raw bytes through mmap instead of being decoded as UTF-8,
+    unless the job reads or writes a container. With a cache, an encrypted
+    output is copied from it when the same file was encrypted with the same
+    settings; decrypted outputs are never cached.
+
+    Args:
+        job (FileJob): The file to process.
+
+    Returns:
+        FileResult: The processed size, elapsed time and whether the output
+            came from the cache.
+    """
+    start = time.perf_counter()
+    job.target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=job.target.parent, prefix=".tmp-")
+    cached = None
+    try:
+        if job.cache is None or job.decrypt:
+            _process(job, fd, temp_path)
+        else:
+            with ResultCache(job.cache, job.cache_size, job.cache_key) as cache:
+                cached = _process_cached(job, fd, temp_path, cache)
+        shutil.copymode(job.source, temp_path)
+        os.replace(temp_path, job.target)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return FileResult(
+        job.source, job.source.stat().st_size, time.perf_counter() - start, cached
+    )
+
+
+def _process(job: FileJob, fd: int, temp_path: str) -> None:
+    """
+    Encrypt or decrypt one file into a temporary file.
+
+    Args:
+        job (FileJob): The file to process.
+        fd (int): The open descriptor of the temporary file, which is closed.
+        temp_path (str): The temporary file.
+    """
+    cipher = TrithemiusCipher(job.alphabet)
+    if job.container:
+        os.close(fd)
+        _process_container(job, temp_path)
+    elif job.encoding is not None:
+        os.close(fd)
+        if job.decrypt:
+            cipher.decrypt_file(
+                job.source, temp_path, job.mode, job.encoding, **job.key
+            )
+        else:
+            cipher.encrypt_file(
+                job.source, temp_path, job.mode, job.encoding, **job.key
+            )
+    else:
+        with open(job.source, "r", encoding="utf-8", newline="") as reader, open(
+            fd, "w", encoding="utf-8", newline=""
+        ) as writer:
+            if job.decrypt:
+                cipher.decrypt_stream(reader, writer, job.mode, **job.key)
+            else:
+                cipher.encrypt_stream(reader, writer, job.mode, **job.key)
+
+
+def _process_cached(job: FileJob, fd: int, temp_path: str, cache: ResultCache) -> bool:
+    """
+    Copy the encrypted output of one file from the cache, or encrypt and store it.
+
+    Args:
+        job (FileJob): The file to process.
+        fd (int): The open descriptor of the temporary file, which is closed.
+        temp_path (str): The temporary file.
+        cache (ResultCache): The cache of earlier outputs.
+
+    Returns:
+        bool: True if the output came from the cache.
+    """
+    key = cache.key(
+        file_digest(job.source),
+        cipher="trithemius",
+        alphabet=job.alphabet.value,
+        mode=job.mode.value,
+        key=job.key,
+        decrypt=job.decrypt,
+        encoding=job.encoding,
+        container=job.container,
+    )
+    with open(fd, "wb", closefd=False) as writer:
+        cached = cache.get_file(key, writer)
+    if cached:
+        os.close(fd)
+        return True
+    _process(job, fd, temp_path)
+    cache.put_file(key, temp_path)
+    return False
+
+
+def _process_container(job: FileJob, temp_path: str) -> None:
+    """
+    Encrypt a text file into a container or decrypt a container.
+
+    Args:
+        job (FileJob): The file to process.
+        temp_path (str): The file to write.
+    """
+    if job.decrypt:
+        with open(job.source, "rb") as reader:
+            encoding = Header.read(reader).encoding
+        with open(temp_path, "w", encoding=encoding, newline="") as writer:
+            read_container(job.source, writer, **job.key)
+    else:
+        encoding = job.encoding or "utf-8"
+        with open(job.source, "r", encoding=encoding, newline="") as reader:
+            write_container(
+                reader, temp_path, job.alphabet, job.mode, encoding, **job.key
+            )
+
+
+def _target(output_dir: Path, relative: Path, container: bool, decrypt: bool) -> Path:
+    """
+    Map an input file to its output file, adding or removing the container suffix.
+
+    Args:
+        output_dir (Path): The output directory.
+        relative (Path): The input path relative to the common input directory.
+        container (bool): Whether containers are written or read.
+        decrypt (bool): Whether the files are decrypted.
+
+    Returns:
+        Path: The output file.
+    """
+    target = output_dir / relative
+    if not container:
+        return target
+    if decrypt:
+        return target.with_suffix("") if target.suffix == CONTAINER_SUFFIX else target
+    return target.with_name(target.name + CONTAINER_SUFFIX)
+
+
+def _check_inputs(files: list[Path], alphabet: AnyAlphabet, encoding: str) -> bool:
+    """
+    Print the validation report of every input file.
+
+    Args:
+        files (list[Path]): The input files.
+        alphabet (AnyAlphabet): The alphabet of the cipher.
+        encoding (str): The text encoding of the files.
+
+    Returns:
+        bool: True if every letter of every file is in the alphabet.
+    """
+    ok = True
+    for path in files:
+        with open(path, "r", encoding=encoding, newline="") as reader:
+            report = validate_stream(alphabet, reader)
+        print(f"{path}: {report.summary()}".replace("\n", "\n  "))
+        ok = ok and report.ok
+    return ok
+
+
+def _throughput(size: int, seconds: float) -> float:
+    """Return throughput in MB/s."""
+    return size / 1024**2 / seconds if seconds else float("inf")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m lab2.src.cli",
+        description="Encrypt or decrypt many files with the Trithemius cipher.",
+    )
+    parser.add_argument("action", choices=["encrypt", "decrypt"])
+    parser.add_argument("input", help="directory or glob pattern of input files")
+    parser.add_argument("-o", "--output-dir", required=True, type=Path)
+    parser.add_argument(
+        "-m", "--mode", choices=[mode.value for mode in Mode], default="LINEAR"
+    )
+    parser.add_argument("-A", type=int, help="A coefficient (LINEAR, NON_LINEAR)")
+    parser.add_argument("-B", type=int, help="B coefficient (LINEAR, NON_LINEAR)")
+    parser.add_argument("-C", type=int, help="C coefficient (NON_LINEAR)")
+    parser.add_argument("-p", "--passphrase", help="passphrase (PASSPHRASE)")
+    parser.add_argument("-a", "--alphabet", choices=alphabet_names(), default="EN")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes"
+    )
+    parser.add_argument(
+        "-e",
+        "--encoding",
+        help="process files in this single-byte encoding (latin-1, cp1251, "
+        "koi8-u, ...) as raw bytes instead of UTF-8 text; with --container, "
+        "the text encoding of the files to encrypt",
+    )
+    parser.add_argument(
+        "-c",
+        "--container",
+        action="store_true",
+        help=f"encrypt into binary containers ({CONTAINER_SUFFIX}) with the "
+        "alphabet, mode and encoding in their header, or decrypt such containers",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="report letters outside the alphabet and mixed scripts in every "
+        "input before starting, and stop if there are any",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        help="reuse the encrypted outputs stored in this SQLite file by earlier "
+        "runs for unchanged files and settings; decrypted outputs are never "
+        "cached and keys are stored only as salted hashes",
+    )
+    parser.add_argument(
+        "--cache-key",
+        type=Path,
+        help="file holding the salt of the cache, created readable by its owner "
+        "only; defaults to the cache path with .key appended",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES // 1024**2,
+        help="largest total size of the cached outputs in MiB",
+    )
+    args = parser.parse_args(argv)
+
+    alphabet = get_alphabet(args.alphabet)
+    mode = Mode(args.mode)
+    key = {
+        name: value
+        for name, value in (
+            ("A", args.A),
+            ("B", args.B),
+            ("C", args.C),
+            ("passphrase", args.passphrase),
+        )
+        if value is not None
+    }
+    errors = TrithemiusCipher(alphabet).key_errors(mode, **key)
+    if errors:
+        parser.error(f"Invalid key for {mode.value} mode: {'; '.join(errors)}")
+    if args.check and args.container and args.action == "decrypt":
+        parser.error("--check reads text inputs, not containers")
+    if args.encoding is not None:
+        try:
+            if args.container:
+                alphabet.value.encode(args.encoding)
+            else:
+                encode_alphabet(alphabet, args.encoding)
+        except (LookupError, ValueError) as error:
+            parser.error(str(error))
+    files = collect_files(args.input)
+    if not files:
+        parser.error(f"No files match {args.input!r}")
+
+    if args.check and not _check_inputs(files, alphabet, args.encoding or "utf-8"):
+        raise SystemExit("Inputs have letters the cipher leaves unencrypted")
+
+    base = Path(os.path.commonpath([path.parent for path in files]))
+    decrypt = args.action == "decrypt"
+    jobs = [
+        FileJob(
+            path,
+            _target(args.output_dir, path.relative_to(base), args.container, decrypt),
+            alphabet,
+            mode,
+            key,
+            decrypt,
+            args.encoding,
+            args.container,
+            args.cache,
+            args.cache_size * 1024**2,
+            args.cache_key,
+        )
+        for path in files
+    ]
+
+    start = time.perf_counter()
+    total = hits = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        for result in executor.map(process_file, jobs):
+            total += result.size
+            hits += bool(result.cached)
+            print(
+                f"{result.source}: {result.size} bytes in {result.seconds:.3f}s "
+                f"({_throughput(result.size, result.seconds):.2f} MB/s)"
+            )
+    elapsed = time.perf_counter() - start
+    print(
+        f"Total: {len(jobs)} files, {total} bytes in {elapsed:.3f}s "
+        f"({_throughput(total, elapsed):.2f} MB/s)"
+    )
+    if args.cache is not None and decrypt:
+        print("Cache: not used, decrypted outputs are never cached")
+    elif args.cache is not None:
+        print(f"Cache: {hits} hits, {len(jobs) - hits} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+import json
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, NamedTuple, TextIO
+
+from lab2.src.alphabet import AnyAlphabet, CustomAlphabet, get_alphabet
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+MAGIC = b"SSLC"
+VERSION = 1
+DEFAULT_BLOCK_CHARS = 1024 * 1024
+CIPHER_NAME = "trithemius"
+
+# magic, format version, length of the JSON header that follows
+_PREAMBLE = struct.Struct("<4sBI")
+# absolute offset of the first character, characters, payload bytes, CRC-32
+_FRAME = struct.Struct("<QIII")
+
+
+class ContainerError(ValueError):
+    """Raised when a file is not a valid or complete container."""
+
+
+@dataclass(frozen=True)
+class Header:
+    """
+    The non-secret settings a container was written with.
+
+    Attributes:
+        cipher (str): The name of the cipher.
+        alphabet (str): The name of the alphabet.
+        letters (str): The letters of the alphabet, so that alphabets
+            registered at runtime can be rebuilt by the reader.
+        encoding (str): The encoding of the original text and of the block
+            payloads.
+        mode (str | None): The cipher mode, for ciphers that have modes.
+        params (dict[str, Any]): Other non-secret parameters.
+    """
+
+    cipher: str
+    alphabet: str
+    letters: str
+    encoding: str = "utf-8"
+    mode: str | None = None
+    params: dict[str, Any] = field(default_factory=dict)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the header with its preamble.
+
+        Returns:
+            bytes: The magic, version, header length and JSON header.
+        """
+        body = json.dumps(asdict(self), ensure_ascii=False, sort_keys=True).encode(
+            "utf-8"
+        )
+        return _PREAMBLE.pack(MAGIC, VERSION, len(body)) + body
+
+    @classmethod
+    def read(cls, reader: BinaryIO) -> "Header":
+        """
+        Read the header at the start of a container.
+
+        Args:
+            reader (BinaryIO): The container, positioned at its start.
+
+        Returns:
+            Header: The header.
+
+        Raises:
+            ContainerError: If the stream is not a container of this version.
+        """
+        preamble = reader.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ContainerError("Not a container: file is too short")
+        magic, version, size = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ContainerError("Not a container: bad magic number")
+        if version != VERSION:
+            raise ContainerError(f"Unsupported container version {version}")
+        body = reader.read(size)
+        try:
+            return cls(**json.loads(body))
+        except (TypeError, ValueError):
+            raise ContainerError("Not a container: malformed header") from None
+
+    def get_alphabet(self) -> AnyAlphabet:
+        """
+        Find the alphabet the container was written with.
+
+        Returns:
+            AnyAlphabet: The registered alphabet of that name if its letters
+                match, or an unregistered alphabet with the stored letters.
+        """
+        try:
+            alphabet = get_alphabet(self.alphabet)
+        except KeyError:
+            return CustomAlphabet(self.alphabet, self.letters)
+        if alphabet.value != self.letters:
+            return CustomAlphabet(self.alphabet, self.letters)
+        return alphabet
+
+
+class Block(NamedTuple):
+    """
+    One independently decodable block of a container.
+
+    Attributes:
+        offset (int): Position of the first character in the whole text.
+        chars (int): The number of characters in the block.
+        payload (bytes): The encoded cipher text of the block.
+    """
+
+    offset: int
+    chars: int
+    payload: bytes
+
+
+class ScanResult(NamedTuple):
+    """
+    The valid part of a container.
+
+    Attributes:
+        header (Header): The container header.
+        end (int): The byte position after the last intact block.
+        chars (int): The number of characters in the intact blocks.
+        complete (bool): Whether the container has its end marker.
+    """
+
+    header: Header
+    end: int
+    chars: int
+    complete: bool
+
+
+def write_block(writer: BinaryIO, offset: int, text: str, encoding: str) -> None:
+    """
+    Append a block to a container.
+
+    Args:
+        writer (BinaryIO): The container, positioned at its end.
+        offset (int): Position of the first character in the whole text.
+        text (str): The cipher text of the block.
+        encoding (str): The payload encoding from the header.
+    """
+    payload = text.encode(encoding)
+    frame = _FRAME.pack(offset, len(text), len(payload), zlib.crc32(payload))
+    writer.write(frame + payload)
+
+
+def write_end(writer: BinaryIO, chars: int) -> None:
+    """
+    Append the end marker, an empty block after the last character.
+
+    Args:
+        writer (BinaryIO): The container, positioned at its end.
+        chars (int): The number of characters in the container.
+    """
+    writer.write(_FRAME.pack(chars, 0, 0, 0))
+
+
+def iter_blocks(reader: BinaryIO) -> Iterator[Block]:
+    """
+    Read the blocks following the header, up to the end marker.
+
+    A block cut short by an interrupted write ends the iteration quietly,
+    so the blocks before it stay usable.
+
+    Args:
+        reader (BinaryIO): The container, positioned after the header.
+
+    Yields:
+        Block: Every intact block, in order. The end marker is yielded as a
+            block of zero characters.
+
+    Raises:
+        ContainerError: If a block is corrupted or out of order.
+    """
+    expected = 0
+    while len(frame := reader.read(_FRAME.size)) == _FRAME.size:
+        offset, chars, size, checksum = _FRAME.unpack(frame)
+        if offset != expected:
+            raise ContainerError(f"Block at character {offset} is out of order")
+        payload = reader.read(size)
+        if len(payload) < size:
+            return
+        if zlib.crc32(payload) != checksum:
+            if not reader.read(1):
+                return
+            raise ContainerError(f"Block at character {offset} is corrupted")
+        yield Block(offset, chars, payload)
+        if not chars:
+            return
+        expected += chars
+
+
+def scan(path: str | os.PathLike) -> ScanResult:
+    """
+    Find the intact part of a possibly interrupted container.
+
+    Args:
+        path (str | os.PathLike): The container file.
+
+    Returns:
+        ScanResult: The header and the extent of the intact blocks.
+
+    Raises:
+        ContainerError: If the file is not a container or is corrupted.
+    """
+    with open(path, "rb") as reader:
+        header = Header.read(reader)
+        end, chars, complete = reader.tell(), 0, False
+        for block in iter_blocks(reader):
+            end = reader.tell()
+            chars += block.chars
+            complete = not block.chars
+    return ScanResult(header, end, chars, complete)
+
+
+def parallel_map(
+    function: Callable[[Any], Any], items: Iterable[Any], jobs: int | None = 1
+) -> Iterator[Any]:
+    """
+    Apply a function to items on worker processes, yielding results in order.
+
+    Only a few items per worker are in flight at once, so large containers
+    are decoded in constant memory.
+
+    Args:
+        function (Callable[[Any], Any]): A picklable module-level function.
+        items (Iterable[Any]): Picklable arguments.
+        jobs (int | None): Worker processes; 1 runs in this process and None
+            uses every CPU. Defaults to 1.
+
+    Yields:
+        Any: The result for every item, in order.
+    """
+    if jobs == 1:
+        yield from map(function, items)
+        return
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future] = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _skip(reader: TextIO, chars: int, chunk_size: int = DEFAULT_BLOCK_CHARS) -> None:
+    """Read and discard characters that are already in the container."""
+    while chars > 0:
+        chunk = reader.read(min(chars, chunk_size))
+        if not chunk:
+            raise ContainerError("Input is shorter than the partial container")
+        chars -= len(chunk)
+
+
+def write_container(
+    reader: TextIO,
+    target: str | os.PathLike,
+    alphabet: AnyAlphabet,
+    mode: Mode,
+    encoding: str = "utf-8",
+    block_chars: int = DEFAULT_BLOCK_CHARS,
+    resume: bool = False,
+    **kwargs,
+) -> int:
+    """
+    Encrypt a text stream into a container.
+
+    Args:
+        reader (TextIO): The stream to read plain text from.
+        target (str | os.PathLike): The container file to write.
+        alphabet (AnyAlphabet): The alphabet of the cipher.
+        mode (Mode): The mode of the cipher, which is stored in the header.
+        encoding (str): The encoding of the original text, also used for the
+            block payloads. Defaults to UTF-8.
+        block_chars (int): The number of characters per block.
+        resume (bool): Continue an interrupted container at target instead of
+            starting over. The reader must deliver the same text again.
+        **kwargs: Key arguments for the mode, which are not stored.
+
+    Returns:
+        int: The number of characters in the container.
+
+    Raises:
+        ValueError: If the key is invalid.
+        ContainerError: If the container to resume was written with other
+            settings or is already complete.
+    """
+    if not TrithemiusCipher.validate_key(mode, **kwargs):
+        raise ValueError("Invalid key")
+    cipher = TrithemiusCipher(alphabet)
+    header = Header(CIPHER_NAME, alphabet.name, alphabet.value, encoding, mode.value)
+    offset = 0
+    writer: BinaryIO
+    if resume and os.path.exists(target):
+        found = scan(target)
+        if found.header != header:
+            raise ContainerError("Container was written with other settings")
+        if found.complete:
+            raise ContainerError("Container is already complete")
+        _skip(reader, found.chars)
+        writer = open(target, "r+b")
+        writer.truncate(found.end)
+        writer.seek(found.end)
+        offset = found.chars
+    else:
+        writer = open(target, "wb")
+        writer.write(header.to_bytes())
+    with writer:
+        while chunk := reader.read(block_chars):
+            encrypted = cipher.cipher(chunk, mode, offset, **kwargs)
+            write_block(writer, offset, encrypted, encoding)
+            offset += len(chunk)
+        write_end(writer, offset)
+    return offset
+
+
+def _decrypt_block(task: tuple[AnyAlphabet, Mode, dict, str, Block]) -> str:
+    """Decrypt one block at its absolute offset on a worker process."""
+    alphabet, mode, key, encoding, block = task
+    text = block.payload.decode(encoding)
+    return TrithemiusCipher(alphabet).decipher(text, mode, block.offset, **key)
+
+
+def read_container(
+    source: str | os.PathLike,
+    writer: TextIO,
+    jobs: int | None = 1,
+    partial: bool = False,
+    **kwargs,
+) -> int:
+    """
+    Decrypt a container into a text stream, decoding blocks in parallel.
+
+    Every block carries its absolute offset, so blocks are decrypted
+    independently of each other.
+
+    Args:
+        source (str | os.PathLike): The container file.
+        writer (TextIO): The stream to write plain text to.
+        jobs (int | None): Worker processes; None uses every CPU. Defaults to 1.
+        partial (bool): Decrypt the intact blocks of an interrupted container
+            instead of failing.
+        **kwargs: Key arguments for the mode stored in the header.
+
+    Returns:
+        int: The number of characters decrypted.
+
+    Raises:
+        ContainerError: If the file is not a Trithemius container, is
+            corrupted, or is incomplete and partial is False. The text of the
+            blocks before the problem has been written by then.
+    """
+    with open(source, "rb") as reader:
+        header = Header.read(reader)
+        if header.cipher != CIPHER_NAME or header.mode is None:
+            raise ContainerError(f"Not a {CIPHER_NAME} container: {header.cipher}")
+        alphabet = header.get_alphabet()
+        mode = Mode(header.mode)
+        complete = False
+
+        def tasks() -> Iterator[tuple[AnyAlphabet, Mode, dict, str, Block]]:
+            nonlocal complete
+            for block in iter_blocks(reader):
+                if not block.chars:
+                    complete = True
+                    return
+                yield alphabet, mode, kwargs, header.encoding, block
+
+        chars = 0
+        for text in parallel_map(_decrypt_block, tasks(), jobs):
+            writer.write(text)
+            chars += len(text)
+    if not complete and not partial:
+        raise ContainerError(f"Container is incomplete after {chars} characters")
+    return chars
@@ -0,0 +1,263 @@
+import json
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any, Iterator, Protocol
+
+DEFAULT_NAMESPACE = "lab2"
+
+# Returned by stage() while instrumentation is disabled, so a disabled stage
+# costs one global lookup and an empty with block.
+_DISABLED: AbstractContextManager[None] = nullcontext()
+
+
+class CachedFunction(Protocol):
+    """A function wrapped by `functools.lru_cache` or `functools.cache`."""
+
+    def cache_info(self) -> Any:
+        ...
+
+
+class Metrics:
+    """
+    Counters and per-stage timings collected inside an `instrument()` block.
+
+    Stages are named spans of work such as "lookup", "shift", "assemble" and
+    "io"; each records how often it ran and how long it took in total.
+    Counters count events such as processed characters. Cache statistics are
+    the hits and misses of every registered cache during the block and are
+    filled in when the block exits.
+
+    Attributes:
+        namespace (str): The prefix of the Prometheus metric names.
+        counters (dict[str, int]): Event counts by name.
+        stage_calls (dict[str, int]): Number of times each stage ran.
+        stage_seconds (dict[str, float]): Total seconds spent in each stage.
+        caches (dict[str, tuple[int, int]]): Hits and misses of each cache.
+        elapsed (float): Seconds spent inside the block.
+    """
+
+    def __init__(self, namespace: str = DEFAULT_NAMESPACE) -> None:
+        """
+        Initialize empty metrics.
+
+        Args:
+            namespace (str): The prefix of the Prometheus metric names.
+        """
+        self.namespace = namespace
+        self.counters: dict[str, int] = {}
+        self.stage_calls: dict[str, int] = {}
+        self.stage_seconds: dict[str, float] = {}
+        self.caches: dict[str, tuple[int, int]] = {}
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name (str): The name of the counter.
+            value (int): The amount to add. Defaults to 1.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block as one run of a stage.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self.stage_calls[name] = self.stage_calls.get(name, 0) + 1
+                self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Summarize the metrics with derived rates.
+
+        Returns:
+            dict[str, Any]: The counters, stages and caches, the characters
+                processed per second and the hit rate of every cache.
+        """
+        with self._lock:
+            chars = self.counters.get("chars", 0)
+            return {
+                "elapsed_seconds": self.elapsed,
+                "chars_per_second": chars / self.elapsed if self.elapsed else 0.0,
+                "counters": dict(self.counters),
+                "stages": {
+                    name: {"calls": calls, "seconds": self.stage_seconds[name]}
+                    for name, calls in self.stage_calls.items()
+                },
+                "caches": {
+                    name: {
+                        "hits": hits,
+                        "misses": misses,
+                        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                    }
+                    for name, (hits, misses) in self.caches.items()
+                },
+            }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """
+        Dump the metrics as JSON.
+
+        Args:
+            indent (int | None): The JSON indentation. Defaults to 2.
+
+        Returns:
+            str: The snapshot as a JSON document.
+        """
+        return json.dumps(self.snapshot(), indent=indent, sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        """
+        Dump the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: One sample per line, with TYPE comments, ending in a newline.
+        """
+        snapshot = self.snapshot()
+        prefix = self.namespace
+        lines = []
+
+        def family(name: str, kind: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{labels} {value!r}")
+
+        stages = snapshot["stages"]
+        caches = snapshot["caches"]
+        family(
+            "stage_calls_total",
+            "counter",
+            [(_labels(stage=name), stats["calls"]) for name, stats in stages.items()],
+        )
+        family(
+            "stage_seconds_total",
+            "counter",
+            [(_labels(stage=name), stats["seconds"]) for name, stats in stages.items()],
+        )
+        family(
+            "events_total",
+            "counter",
+            [
+                (_labels(event=name), value)
+                for name, value in snapshot["counters"].items()
+            ],
+        )
+        for field in ("hits", "misses"):
+            family(
+                f"cache_{field}_total",
+                "counter",
+                [(_labels(cache=name), stats[field]) for name, stats in caches.items()],
+            )
+        family(
+            "cache_hit_ratio",
+            "gauge",
+            [
+                (_labels(cache=name), stats["hit_rate"])
+                for name, stats in caches.items()
+            ],
+        )
+        family("chars_per_second", "gauge", [("", snapshot["chars_per_second"])])
+        family("elapsed_seconds", "gauge", [("", snapshot["elapsed_seconds"])])
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    """Format Prometheus labels, escaping backslashes and quotes."""
+    pairs = []
+    for name, value in labels.items():
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+_active: Metrics | None = None
+_caches: dict[str, CachedFunction] = {}
+
+
+def register_cache(name: str, function: CachedFunction) -> None:
+    """
+    Report the hits and misses of an `lru_cache` function in every Metrics.
+
+    Args:
+        name (str): The name the cache is reported under.
+        function (CachedFunction): The cached function.
+    """
+    _caches[name] = function
+
+
+def stage(name: str) -> AbstractContextManager[None]:
+    """
+    Time the enclosed block as a stage of the active metrics, if any.
+
+    Args:
+        name (str): The name of the stage.
+
+    Returns:
+        AbstractContextManager[None]: A timing context, or a shared no-op
+            context while instrumentation is disabled.
+    """
+    metrics = _active
+    if metrics is None:
+        return _DISABLED
+    return metrics.stage(name)
+
+
+def count(name: str, value: int = 1) -> None:
+    """
+    Add to a counter of the active metrics, if any.
+
+    Args:
+        name (str): The name of the counter.
+        value (int): The amount to add. Defaults to 1.
+    """
+    metrics = _active
+    if metrics is not None:
+        metrics.count(name, value)
+
+
+@contextmanager
+def instrument(namespace: str = DEFAULT_NAMESPACE) -> Iterator[Metrics]:
+    """
+    Collect metrics from every cipher operation inside the block.
+
+    Instrumentation is process-wide, so operations on other threads are
+    recorded too, and blocks can be nested; the inner block collects alone.
+    Work done in other processes is not recorded.
+
+    Args:
+        namespace (str): The prefix of the Prometheus metric names.
+
+    Yields:
+        Metrics: The metrics of the block.
+    """
+    global _active
+    metrics = Metrics(namespace)
+    baseline = {name: function.cache_info() for name, function in _caches.items()}
+    previous, _active = _active, metrics
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.elapsed = time.perf_counter() - start
+        _active = previous
+        for name, function in _caches.items():
+            info = function.cache_info()
+            before = baseline.get(name)
+            hits, misses = info.hits, info.misses
+            if before is not None:
+                hits, misses = hits - before.hits, misses - before.misses
+            metrics.caches[name] = (hits, misses)
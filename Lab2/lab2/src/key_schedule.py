@@ -0,0 +1,171 @@
+import sys
+from array import array
+from dataclasses import dataclass
+from functools import cache, lru_cache
+
+from lab2.src import instrumentation
+from lab2.src.alphabet import AnyAlphabet
+from lab2.src.byte_cipher import encode_alphabet
+
+# Native-order UTF-32 matches the layout of a memoryview cast to "I", so the
+# shifted phases can be written into the output buffer as code points.
+_UTF32 = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+# Registered alphabets can hold thousands of letters, so the number of cached
+# shift tables is bounded.
+TABLE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _shift_table(alphabet: AnyAlphabet, shift: int) -> dict[int, int]:
+    """
+    Build the `str.translate` table that shifts every alphabet character.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet to build the table for.
+        shift (int): The shift, already reduced modulo the alphabet length.
+
+    Returns:
+        dict[int, int]: Mapping of source code points to shifted code points.
+    """
+    letters = alphabet.value
+    return str.maketrans(letters, letters[shift:] + letters[:shift])
+
+
+@cache
+def _byte_shift_table(alphabet: AnyAlphabet, encoding: str, shift: int) -> bytes:
+    """
+    Build the `bytes.translate` table that shifts every encoded alphabet letter.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet to build the table for.
+        encoding (str): The single-byte encoding of the text.
+        shift (int): The shift, already reduced modulo the alphabet length.
+
+    Returns:
+        bytes: A 256-byte translation table.
+
+    Raises:
+        ValueError: If the encoding is not a single-byte encoding of the alphabet.
+    """
+    letters = encode_alphabet(alphabet, encoding)
+    return bytes.maketrans(letters, letters[shift:] + letters[:shift])
+
+
+@dataclass(frozen=True, slots=True)
+class KeySchedule:
+    """
+    A Trithemius key compiled into the shifts of one period.
+
+    The shift k(p) mod n is periodic in the position p in every mode, so the
+    shifts of the first period describe the key completely. A schedule is
+    immutable and can be shared between calls and threads.
+
+    Attributes:
+        alphabet (AnyAlphabet): The alphabet the shifts apply to.
+        shifts (array): The shift mod n of each position of one period, stored
+            as array("H"), or array("I") for alphabets of more than 65,536
+            letters.
+    """
+
+    alphabet: AnyAlphabet
+    shifts: array
+
+    @property
+    def period(self) -> int:
+        """The number of positions after which the shifts repeat."""
+        return len(self.shifts)
+
+    def encrypt(self, text: str, offset: int = 0) -> str:
+        """
+        Encrypts text with the schedule.
+
+        Args:
+            text (str): The text to be encrypted.
+            offset (int): Position of the first character of text in the whole
+                message. Defaults to 0.
+
+        Returns:
+            str: The encrypted text.
+        """
+        return self._apply(text, offset, 1)
+
+    def decrypt(self, text: str, offset: int = 0) -> str:
+        """
+        Decrypts text with the schedule.
+
+        Args:
+            text (str): The text to be decrypted.
+            offset (int): Position of the first character of text in the whole
+                message. Defaults to 0.
+
+        Returns:
+            str: The decrypted text.
+        """
+        return self._apply(text, offset, -1)
+
+    def byte_tables(self, encoding: str, sign: int = 1) -> list[bytes]:
+        """
+        Returns the byte substitution table of every position of the period.
+
+        Args:
+            encoding (str): The single-byte encoding of the text.
+            sign (int): 1 to encrypt, -1 to decrypt. Defaults to 1.
+
+        Returns:
+            list[bytes]: One 256-byte `bytes.translate` table per position.
+
+        Raises:
+            ValueError: If the encoding is not a single-byte encoding of the
+                alphabet.
+        """
+        size = len(self.alphabet.value)
+        return [
+            _byte_shift_table(self.alphabet, encoding, sign * shift % size)
+            for shift in self.shifts
+        ]
+
+    def _apply(self, text: str, offset: int, sign: int) -> str:
+        """
+        Shifts text by the schedule in the given direction.
+
+        All characters in the same phase of the period share one shift, so each
+        phase is shifted with a single `str.translate` call and the phases are
+        interleaved back through a UTF-32 buffer.
+
+        Args:
+            text (str): The text to be shifted.
+            offset (int): Position of the first character in the whole message.
+            sign (int): 1 to encrypt, -1 to decrypt.
+
+        Returns:
+            str: The shifted text.
+        """
+        size = len(self.alphabet.value)
+        period = len(self.shifts)
+        with instrumentation.stage("lookup"):
+            tables = [
+                _shift_table(
+                    self.alphabet, sign * self.shifts[(offset + phase) % period] % size
+                )
+                for phase in range(min(period, len(text)))
+            ]
+        # A single phase covers the whole text.
+        if len(tables) < 2:
+            with instrumentation.stage("shift"):
+                return text.translate(tables[0]) if tables else text
+
+        buffer = bytearray(4 * len(text))
+        code_points = memoryview(buffer).cast("I")
+        with instrumentation.stage("shift"):
+            for phase, table in enumerate(tables):
+                shifted = text[phase::period].translate(table)
+                code_points[phase::period] = memoryview(
+                    shifted.encode(_UTF32, "surrogatepass")
+                ).cast("I")
+        with instrumentation.stage("assemble"):
+            return buffer.decode(_UTF32, "surrogatepass")
+
+
+instrumentation.register_cache("shift_table", _shift_table)
+instrumentation.register_cache("byte_shift_table", _byte_shift_table)
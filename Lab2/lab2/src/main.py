@@ -1,8 +1,17 @@
-import tkinter as tk
+def main() -> None:
+    """
+    Open the Trithemius cipher window.
+
+    Tkinter and the app are imported here so that importing this module, or
+    the cipher modules next to it, does not load the GUI toolkit.
+    """
+    import tkinter as tk
+
+    from lab2.src.trithemius_app import TrithemiusApp
+
+    app = TrithemiusApp(tk.Tk())
+    app.root.mainloop()
 
-from lab2.src.trithemius_app import TrithemiusApp
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = TrithemiusApp(root)
-    root.mainloop()
+    main()
@@ -0,0 +1,136 @@
+from functools import lru_cache
+from typing import Any
+
+from lab2.src.mode import Mode
+
+# NumPy takes longer to import than the rest of the package together, so it is
+# imported on the first call to is_available() rather than with this module.
+_NOT_LOADED = object()
+np: Any = _NOT_LOADED
+
+
+def is_available() -> bool:
+    """
+    Check whether NumPy can be used, importing it on the first call.
+
+    Returns:
+        bool: True if NumPy was imported successfully, False otherwise.
+    """
+    global np
+    if np is _NOT_LOADED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - exercised only without NumPy
+            np = None
+        else:
+            np = numpy
+    return np is not None
+
+
+@lru_cache(maxsize=None)
+def _alphabet_arrays(alphabet: str) -> tuple:
+    """
+    Build the lookup arrays for an alphabet.
+
+    Args:
+        alphabet (str): The alphabet set used for encryption and decryption.
+
+    Returns:
+        tuple: A code point -> alphabet index table (-1 for foreign characters)
+        and an alphabet index -> code point array.
+    """
+    code_points = np.frombuffer(alphabet.encode("utf-32-le"), dtype="<u4")
+    lookup = np.full(int(code_points.max()) + 1, -1, dtype=np.int64)
+    lookup[code_points] = np.arange(len(alphabet), dtype=np.int64)
+    return lookup, code_points
+
+
+def _calculate_k(
+    alphabet: str, mode: Mode, positions: "np.ndarray", **kwargs
+) -> "np.ndarray":
+    """
+    Calculate 'k' modulo the alphabet length for every position at once.
+
+    Args:
+        alphabet (str): The alphabet set used for encryption and decryption.
+        mode (Mode): The mode of the cipher.
+        positions (np.ndarray): Positions of the characters in the message.
+        **kwargs: Key arguments for the corresponding mode.
+
+    Returns:
+        np.ndarray: The calculated values of 'k', reduced modulo the alphabet length.
+
+    Raises:
+        ValueError: If a passphrase character is not part of the alphabet.
+    """
+    n = len(alphabet)
+    if mode == Mode.LINEAR:
+        return (kwargs["A"] % n * (positions % n) + kwargs["B"] % n) % n
+    elif mode == Mode.NON_LINEAR:
+        constant = (kwargs["A"] ** 2 + kwargs["C"]) % n
+        return (kwargs["B"] % n * (positions % n) + constant) % n
+    elif mode == Mode.PASSPHRASE:
+        passphrase = kwargs["passphrase"]
+        if not positions.size:
+            return positions
+        indices = np.array([alphabet.find(char) for char in passphrase])
+        k = indices[positions % len(passphrase)]
+        if (k < 0).any():
+            raise ValueError("Passphrase contains characters outside the alphabet")
+        return k
+    return np.zeros_like(positions)
+
+
+def transform(
+    alphabet: str,
+    text: str,
+    mode: Mode,
+    sign: int,
+    offset: int = 0,
+    mask: bytes | None = None,
+    **kwargs,
+) -> str:
+    """
+    Shift every alphabet character of the text by its position-dependent 'k'.
+
+    Characters outside the alphabet are masked out and passed through unchanged.
+    A letter mask from the validation pre-pass replaces the lookup of every
+    character, so only the letters are looked up.
+
+    Args:
+        alphabet (str): The alphabet set used for encryption and decryption.
+        text (str): The text to be transformed.
+        mode (Mode): The mode of the cipher.
+        sign (int): 1 to encrypt, -1 to decrypt.
+        offset (int): Position of the first character of text in the whole message.
+        mask (bytes | None): One byte per character of text, 1 for alphabet
+            letters and 0 otherwise, as built by `validation.validate_text`.
+        **kwargs: Key arguments for the corresponding mode.
+
+    Returns:
+        str: The transformed text.
+
+    Raises:
+        RuntimeError: If NumPy is not installed.
+        ValueError: If the mask does not match the length of the text.
+    """
+    if not is_available():
+        raise RuntimeError("NumPy is not installed")
+    lookup, code_points = _alphabet_arrays(alphabet)
+    chars = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+    if mask is not None:
+        if len(mask) != len(chars):
+            raise ValueError("Mask length does not match the text")
+        positions = np.flatnonzero(np.frombuffer(mask, dtype=np.uint8))
+        letters = lookup[chars[positions]]
+    else:
+        indices = np.full(chars.shape, -1, dtype=np.int64)
+        in_range = chars < len(lookup)
+        indices[in_range] = lookup[chars[in_range]]
+        positions = np.flatnonzero(indices >= 0)
+        letters = indices[positions]
+
+    k = _calculate_k(alphabet, mode, positions + offset, **kwargs)
+    result = chars.copy()
+    result[positions] = code_points[(letters + sign * k) % len(alphabet)]
+    return result.tobytes().decode("utf-32-le")
@@ -0,0 +1,183 @@
+import os
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from lab2.src import instrumentation
+from lab2.src.key_schedule import KeySchedule
+
+# Every character takes four bytes in UTF-32, so a character offset maps to a
+# byte offset of the shared buffer without an index.
+_UTF32 = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+_CHAR_BYTES = 4
+
+DEFAULT_SEGMENT_CHARS = 8 * 1024**2
+
+
+def _shift_segment(
+    name: str, schedule: KeySchedule, start: int, end: int, offset: int, sign: int
+) -> None:
+    """
+    Shift characters start to end of a shared buffer in place on a worker.
+
+    Args:
+        name (str): The name of the shared memory block.
+        schedule (KeySchedule): The compiled key.
+        start (int): The first character of the segment in the buffer.
+        end (int): The character after the segment.
+        offset (int): Position of the first character of the buffer in the
+            whole message.
+        sign (int): 1 to encrypt, -1 to decrypt.
+    """
+    first, last = start * _CHAR_BYTES, end * _CHAR_BYTES
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        with memory.buf[first:last] as view:
+            segment = str(view, _UTF32, "surrogatepass")
+            if sign > 0:
+                shifted = schedule.encrypt(segment, offset + start)
+            else:
+                shifted = schedule.decrypt(segment, offset + start)
+            view[:] = shifted.encode(_UTF32, "surrogatepass")
+    finally:
+        memory.close()
+
+
+class ParallelEngine:
+    """
+    Shifts large texts with a compiled schedule on a pool of processes.
+
+    The shift of a character depends only on its absolute position and the
+    key, so the text is cut into segments that are shifted independently.
+    Segments are copied into one shared memory block as UTF-32 and every
+    worker receives only the block name, the schedule and its segment bounds,
+    shifts the segment in place and returns nothing. The result is decoded
+    from the block once all segments are done, so no large strings are
+    pickled in either direction.
+
+    The pool is started on first use and kept until `close`, so an engine can
+    be reused across calls; use it as a context manager.
+
+    Attributes:
+        jobs (int): The number of worker processes.
+        segment_chars (int): The largest number of characters per segment.
+    """
+
+    def __init__(
+        self, jobs: int | None = None, segment_chars: int = DEFAULT_SEGMENT_CHARS
+    ):
+        """
+        Initializes the engine without starting the pool.
+
+        Args:
+            jobs (int | None): Worker processes; None uses every CPU.
+            segment_chars (int): The largest number of characters per segment.
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.segment_chars = segment_chars
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "ParallelEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts the worker pool down.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def encrypt(self, schedule: KeySchedule, text: str, offset: int = 0) -> str:
+        """
+        Encrypts text with the schedule across the worker pool.
+
+        Args:
+            schedule (KeySchedule): The compiled key.
+            text (str): The text to be encrypted.
+            offset (int): Position of the first character of text in the whole
+                message. Defaults to 0.
+
+        Returns:
+            str: The encrypted text, identical to `schedule.encrypt`.
+        """
+        return self._run(schedule, text, offset, 1)
+
+    def decrypt(self, schedule: KeySchedule, text: str, offset: int = 0) -> str:
+        """
+        Decrypts text with the schedule across the worker pool.
+
+        Args:
+            schedule (KeySchedule): The compiled key.
+            text (str): The text to be decrypted.
+            offset (int): Position of the first character of text in the whole
+                message. Defaults to 0.
+
+        Returns:
+            str: The decrypted text, identical to `schedule.decrypt`.
+        """
+        return self._run(schedule, text, offset, -1)
+
+    def _segments(self, length: int) -> list[tuple[int, int]]:
+        """
+        Split a text into segments, at least one per worker when it is large.
+
+        Args:
+            length (int): The number of characters in the text.
+
+        Returns:
+            list[tuple[int, int]]: The start and end of every segment.
+        """
+        size = max(1, min(self.segment_chars, -(-length // self.jobs)))
+        return [(start, min(start + size, length)) for start in range(0, length, size)]
+
+    def _run(self, schedule: KeySchedule, text: str, offset: int, sign: int) -> str:
+        """
+        Shifts text in segments on the pool and stitches the result in order.
+
+        Args:
+            schedule (KeySchedule): The compiled key.
+            text (str): The text to be shifted.
+            offset (int): Position of the first character in the whole message.
+            sign (int): 1 to encrypt, -1 to decrypt.
+
+        Returns:
+            str: The shifted text.
+        """
+        segments = self._segments(len(text))
+        if self.jobs == 1 or len(segments) < 2:
+            if sign > 0:
+                return schedule.encrypt(text, offset)
+            return schedule.decrypt(text, offset)
+
+        instrumentation.count("chars", len(text))
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.jobs)
+        size = len(text) * _CHAR_BYTES
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        futures: list[Future] = []
+        try:
+            # Workers start on the first segments while later ones are copied.
+            for start, end in segments:
+                first, last = start * _CHAR_BYTES, end * _CHAR_BYTES
+                with instrumentation.stage("io"):
+                    encoded = text[start:end].encode(_UTF32, "surrogatepass")
+                    memory.buf[first:last] = encoded
+                futures.append(
+                    self._executor.submit(
+                        _shift_segment, memory.name, schedule, start, end, offset, sign
+                    )
+                )
+            with instrumentation.stage("shift"):
+                for future in futures:
+                    future.result()
+            with instrumentation.stage("assemble"), memory.buf[:size] as view:
+                return str(view, _UTF32, "surrogatepass")
+        finally:
+            for future in futures:
+                future.cancel()
+            memory.close()
+            memory.unlink()
@@ -1,5 +1,28 @@
-from lab2.src.alphabet import Alphabet
+import math
+import os
+from array import array
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Iterator, TextIO
+
+from lab2.src import batch, byte_cipher, instrumentation, numpy_backend
+from lab2.src.alphabet import AnyAlphabet
+from lab2.src.backend import Backend
+from lab2.src.char_index import CharOffsetIndex
+from lab2.src.key_schedule import KeySchedule
 from lab2.src.mode import Mode
+from lab2.src.validation import InputReport
+
+if TYPE_CHECKING:
+    # The engine pulls in multiprocessing, so it is imported when first used.
+    from lab2.src.parallel import ParallelEngine
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+SCHEDULE_CACHE_SIZE = 256
+KEY_NAMES = {
+    Mode.LINEAR: ("A", "B"),
+    Mode.NON_LINEAR: ("A", "B", "C"),
+    Mode.PASSPHRASE: ("passphrase",),
+}
 
 
 class TrithemiusCipher:
@@ -8,21 +31,52 @@ class TrithemiusCipher:
 
     Attributes:
         alphabet (str): The alphabet set used for encryption and decryption.
+        backend (Backend): The backend used for computations. NUMPY falls back
+            to PYTHON when NumPy is not installed.
 
     Methods:
         validate_key: Validates the given keys based on the mode.
+        key_errors: Explains what is wrong with the given keys.
+        compile_key: Compiles the keys into a reusable shift schedule.
         cipher: Encrypts the given text using the Trithemius Cipher.
         decipher: Decrypts the given text using the Trithemius Cipher.
+        cipher_many: Encrypts one text under many keys.
+        decipher_many: Decrypts one text under many keys.
+        encrypt_stream: Encrypts a text stream chunk by chunk.
+        decrypt_stream: Decrypts a text stream chunk by chunk.
+        decipher_range: Decrypts a window of a text or UTF-8 file.
+        parallel_cipher: Encrypts a large text on a pool of processes.
+        parallel_decipher: Decrypts a large text on a pool of processes.
+        encrypt_file: Encrypts a single-byte encoded file as raw bytes.
+        decrypt_file: Decrypts a single-byte encoded file as raw bytes.
     """
 
-    def __init__(self, alphabet: Alphabet):
+    def __init__(self, alphabet: AnyAlphabet, backend: Backend = Backend.PYTHON):
         """
         Initializes the TrithemiusCipher with a given alphabet.
 
         Args:
-            alphabet (Alphabet): The alphabet set used for encryption and decryption.
+            alphabet (AnyAlphabet): The alphabet set used for encryption and decryption.
+            backend (Backend): The backend used for computations. Defaults to PYTHON.
         """
         self.alphabet = alphabet.value
+        self.backend = backend
+        self._language = alphabet
+        self._lookup = alphabet.lookup
+
+    @property
+    def language(self) -> AnyAlphabet:
+        """The alphabet of the cipher, as given to the constructor."""
+        return self._language
+
+    def _uses_numpy(self) -> bool:
+        """
+        Check whether the NumPy backend is selected and available.
+
+        Returns:
+            bool: True if computations should go through NumPy.
+        """
+        return self.backend == Backend.NUMPY and numpy_backend.is_available()
 
     @staticmethod
     def validate_key(mode: Mode, **kwargs) -> bool:
@@ -36,13 +90,31 @@ class TrithemiusCipher:
         Returns:
             bool: True if the key(s) are valid, False otherwise.
         """
-        if mode == Mode.LINEAR:
-            return "A" in kwargs and "B" in kwargs
-        elif mode == Mode.NON_LINEAR:
-            return "A" in kwargs and "B" in kwargs and "C" in kwargs
-        elif mode == Mode.PASSPHRASE:
-            return "passphrase" in kwargs and len(kwargs["passphrase"]) > 0
-        return False
+        return mode in KEY_NAMES and not _type_errors(mode, kwargs)
+
+    def key_errors(self, mode: Mode, **kwargs) -> list[str]:
+        """
+        Explains what is wrong with the keys, for reporting to the user.
+
+        Unlike `validate_key`, the passphrase is also checked against the
+        alphabet. Messages never quote the passphrase.
+
+        Args:
+            mode (Mode): The mode of the cipher.
+            **kwargs: Key arguments for the corresponding mode.
+
+        Returns:
+            list[str]: One message per problem, empty if the keys are valid.
+        """
+        errors = _type_errors(mode, kwargs)
+        if mode == Mode.PASSPHRASE and not errors:
+            members = self._lookup.members
+            foreign = sum(char not in members for char in kwargs["passphrase"])
+            if foreign:
+                errors.append(
+                    f"passphrase has {foreign} characters outside the alphabet"
+                )
+        return errors
 
     def _calculate_k(self, mode: Mode, p: int, **kwargs) -> int:
         """
@@ -61,60 +133,505 @@ class TrithemiusCipher:
         elif mode == Mode.NON_LINEAR:
             return kwargs["A"] ** 2 + kwargs["B"] * p + kwargs["C"]
         elif mode == Mode.PASSPHRASE:
-            char_position = self.alphabet.index(
+            char_position = self._lookup.position(
                 kwargs["passphrase"][p % len(kwargs["passphrase"])]
             )
+            if char_position is None:
+                raise ValueError("Passphrase contains characters outside the alphabet")
             return char_position
         return 0
 
-    def cipher(self, text: str, mode: Mode, **kwargs) -> str:
+    def compile_key(self, mode: Mode, **kwargs) -> KeySchedule:
+        """
+        Compiles the keys into the shifts of one period.
+
+        Schedules are cached per alphabet and key, so repeated calls with the
+        same settings return the same object.
+
+        Args:
+            mode (Mode): The mode of the cipher.
+            **kwargs: Key arguments for the corresponding mode.
+
+        Returns:
+            KeySchedule: The compiled schedule.
+
+        Raises:
+            ValueError: If the passphrase is empty or contains characters
+                outside the alphabet.
+        """
+        key = tuple(kwargs[name] for name in KEY_NAMES[mode])
+        return _compile_key(self._language, mode, key)
+
+    def cipher(
+        self,
+        text: str,
+        mode: Mode,
+        offset: int = 0,
+        report: InputReport | None = None,
+        **kwargs,
+    ) -> str:
         """
         Encrypts the given text using the Trithemius Cipher.
 
         Args:
             text (str): The text to be encrypted.
             mode (Mode): The mode of the cipher.
+            offset (int): Position of the first character of text in the whole
+                message. Defaults to 0.
+            report (InputReport | None): The validation report of text, whose
+                letter mask spares the NumPy backend looking every character
+                up. The Python backend needs none. Defaults to None.
             **kwargs: Key arguments for the corresponding mode.
 
         Returns:
             str: The encrypted text.
-        """
-        encrypted_text = ""
-        n = len(self.alphabet)
 
-        for idx, char in enumerate(text):
-            if char in self.alphabet:
-                x = self.alphabet.index(char)
-                k = self._calculate_k(mode, idx, **kwargs)
-                y = (x + k) % n
-                encrypted_text += self.alphabet[y]
-            else:
-                encrypted_text += char
+        Raises:
+            ValueError: If the report is not of text in this alphabet.
+        """
+        instrumentation.count("chars", len(text))
+        if self._uses_numpy():
+            mask = self._mask(text, report)
+            with instrumentation.stage("shift"):
+                return numpy_backend.transform(
+                    self.alphabet, text, mode, 1, offset, mask, **kwargs
+                )
 
-        return encrypted_text
+        with instrumentation.stage("schedule"):
+            schedule = self.compile_key(mode, **kwargs)
+        return schedule.encrypt(text, offset)
 
-    def decipher(self, text: str, mode: Mode, **kwargs) -> str:
+    def decipher(
+        self,
+        text: str,
+        mode: Mode,
+        offset: int = 0,
+        report: InputReport | None = None,
+        **kwargs,
+    ) -> str:
         """
         Decrypts the given text using the Trithemius Cipher.
 
         Args:
             text (str): The text to be decrypted.
             mode (Mode): The mode of the cipher.
+            offset (int): Position of the first character of text in the whole
+                message. Defaults to 0.
+            report (InputReport | None): The validation report of text, see
+                `cipher`. Defaults to None.
             **kwargs: Key arguments for the corresponding mode.
 
         Returns:
             str: The decrypted text.
+
+        Raises:
+            ValueError: If the report is not of text in this alphabet.
+        """
+        instrumentation.count("chars", len(text))
+        if self._uses_numpy():
+            mask = self._mask(text, report)
+            with instrumentation.stage("shift"):
+                return numpy_backend.transform(
+                    self.alphabet, text, mode, -1, offset, mask, **kwargs
+                )
+
+        with instrumentation.stage("schedule"):
+            schedule = self.compile_key(mode, **kwargs)
+        return schedule.decrypt(text, offset)
+
+    def _mask(self, text: str, report: InputReport | None) -> bytes | None:
+        """
+        Internal method to take the letter mask of text from its report.
+
+        Args:
+            text (str): The text to be shifted.
+            report (InputReport | None): The validation report, if any.
+
+        Returns:
+            bytes | None: The letter mask, or None without a report.
+
+        Raises:
+            ValueError: If the report is not of text in this alphabet.
+        """
+        if report is None:
+            return None
+        if report.alphabet != self._language or report.length != len(text):
+            raise ValueError("Report was made for another text or alphabet")
+        return report.mask
+
+    def cipher_many(
+        self,
+        text: str,
+        mode: Mode,
+        keys: Iterable[dict],
+        offset: int = 0,
+        jobs: int | None = 1,
+    ) -> Iterator[str]:
+        """
+        Encrypts one text under many keys, looking its characters up only once.
+
+        Ciphertexts are produced lazily in key order, so memory does not grow
+        with the number of keys. The Python schedules are used whatever the
+        backend.
+
+        Args:
+            text (str): The text to be encrypted.
+            mode (Mode): The mode of the cipher.
+            keys (Iterable[dict]): Key arguments for the mode, one dict per key.
+            offset (int): Position of the first character of text in the whole
+                message. Defaults to 0.
+            jobs (int | None): Worker processes; None uses every CPU. Defaults
+                to 1.
+
+        Returns:
+            Iterator[str]: The encrypted text for each key.
+        """
+        schedules = (self.compile_key(mode, **key) for key in keys)
+        return batch.shift_many(self._language, text, schedules, offset, 1, jobs)
+
+    def decipher_many(
+        self,
+        text: str,
+        mode: Mode,
+        keys: Iterable[dict],
+        offset: int = 0,
+        jobs: int | None = 1,
+    ) -> Iterator[str]:
+        """
+        Decrypts one text under many keys, looking its characters up only once.
+
+        Args:
+            text (str): The text to be decrypted.
+            mode (Mode): The mode of the cipher.
+            keys (Iterable[dict]): Key arguments for the mode, one dict per key.
+            offset (int): Position of the first character of text in the whole
+                message. Defaults to 0.
+            jobs (int | None): Worker processes; None uses every CPU. Defaults
+                to 1.
+
+        Returns:
+            Iterator[str]: The decrypted text for each key.
+        """
+        schedules = (self.compile_key(mode, **key) for key in keys)
+        return batch.shift_many(self._language, text, schedules, offset, -1, jobs)
+
+    def encrypt_stream(
+        self,
+        reader: TextIO,
+        writer: TextIO,
+        mode: Mode,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs,
+    ) -> int:
+        """
+        Encrypts a text stream chunk by chunk using constant memory.
+
+        The position offset carries across chunk boundaries, so the output is
+        identical to encrypting the whole text at once.
+
+        Args:
+            reader (TextIO): The stream to read plain text from.
+            writer (TextIO): The stream to write encrypted text to.
+            mode (Mode): The mode of the cipher.
+            chunk_size (int): The number of characters processed per chunk.
+            **kwargs: Key arguments for the corresponding mode.
+
+        Returns:
+            int: The number of characters processed.
+
+        Raises:
+            ValueError: If chunk_size is below 1.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be at least 1, not {chunk_size}")
+        offset = 0
+        while True:
+            with instrumentation.stage("io"):
+                chunk = reader.read(chunk_size)
+            if not chunk:
+                return offset
+            shifted = self.cipher(chunk, mode, offset, **kwargs)
+            with instrumentation.stage("io"):
+                writer.write(shifted)
+            offset += len(chunk)
+
+    def decrypt_stream(
+        self,
+        reader: TextIO,
+        writer: TextIO,
+        mode: Mode,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs,
+    ) -> int:
+        """
+        Decrypts a text stream chunk by chunk using constant memory.
+
+        Args:
+            reader (TextIO): The stream to read encrypted text from.
+            writer (TextIO): The stream to write decrypted text to.
+            mode (Mode): The mode of the cipher.
+            chunk_size (int): The number of characters processed per chunk.
+            **kwargs: Key arguments for the corresponding mode.
+
+        Returns:
+            int: The number of characters processed.
+
+        Raises:
+            ValueError: If chunk_size is below 1.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be at least 1, not {chunk_size}")
+        offset = 0
+        while True:
+            with instrumentation.stage("io"):
+                chunk = reader.read(chunk_size)
+            if not chunk:
+                return offset
+            shifted = self.decipher(chunk, mode, offset, **kwargs)
+            with instrumentation.stage("io"):
+                writer.write(shifted)
+            offset += len(chunk)
+
+    def encrypt_file(
+        self,
+        source: str | os.PathLike,
+        target: str | os.PathLike,
+        mode: Mode,
+        encoding: str,
+        **kwargs,
+    ) -> int:
+        """
+        Encrypts a file in a single-byte encoding as raw bytes through mmap.
+
+        Every letter is one byte in encodings such as latin-1, cp1251 or
+        koi8-u, so positions are byte offsets and the shift of each position of
+        the compiled schedule is a byte substitution. No text is decoded.
+
+        Args:
+            source (str | os.PathLike): The file to read plain text from.
+            target (str | os.PathLike): The file to write encrypted text to.
+            mode (Mode): The mode of the cipher.
+            encoding (str): The single-byte encoding of the file.
+            **kwargs: Key arguments for the corresponding mode.
+
+        Returns:
+            int: The number of bytes processed.
+
+        Raises:
+            ValueError: If the encoding is not a single-byte encoding of the
+                alphabet or the passphrase is invalid.
+        """
+        tables = self.compile_key(mode, **kwargs).byte_tables(encoding, 1)
+        return byte_cipher.shift_file(source, target, tables)
+
+    def decrypt_file(
+        self,
+        source: str | os.PathLike,
+        target: str | os.PathLike,
+        mode: Mode,
+        encoding: str,
+        **kwargs,
+    ) -> int:
+        """
+        Decrypts a file in a single-byte encoding as raw bytes through mmap.
+
+        Args:
+            source (str | os.PathLike): The file to read encrypted text from.
+            target (str | os.PathLike): The file to write decrypted text to.
+            mode (Mode): The mode of the cipher.
+            encoding (str): The single-byte encoding of the file.
+            **kwargs: Key arguments for the corresponding mode.
+
+        Returns:
+            int: The number of bytes processed.
+
+        Raises:
+            ValueError: If the encoding is not a single-byte encoding of the
+                alphabet or the passphrase is invalid.
+        """
+        tables = self.compile_key(mode, **kwargs).byte_tables(encoding, -1)
+        return byte_cipher.shift_file(source, target, tables)
+
+    def decipher_range(
+        self,
+        source: str | os.PathLike | CharOffsetIndex,
+        start: int,
+        length: int,
+        mode: Mode,
+        **kwargs,
+    ) -> str:
+        """
+        Decrypts only a window of the ciphertext.
+
+        The shift depends only on the absolute position, so the characters
+        before the window never need to be decrypted. Files are read through a
+        CharOffsetIndex; pass a prebuilt index to reuse it across calls.
+
+        A str source is always the encrypted text itself, never a file name:
+        files must be passed as a `pathlib.Path` or another `os.PathLike`.
+
+        Args:
+            source (str | os.PathLike | CharOffsetIndex): The encrypted text, a
+                path object of a UTF-8 file holding it, or an index over such a
+                file.
+            start (int): Character offset of the window.
+            length (int): The number of characters to decrypt.
+            mode (Mode): The mode of the cipher.
+            **kwargs: Key arguments for the corresponding mode.
+
+        Returns:
+            str: The decrypted window.
+
+        Raises:
+            TypeError: If the source is not a str, a path object or an index.
+            ValueError: If start or length is negative.
+        """
+        if start < 0 or length < 0:
+            raise ValueError(
+                f"Window start and length must not be negative, not {start} and {length}"
+            )
+        if isinstance(source, str):
+            end = start + length
+            window = source[start:end]
+        elif isinstance(source, CharOffsetIndex):
+            window = source.read(start, length)
+        elif isinstance(source, os.PathLike):
+            window = CharOffsetIndex(source).read(start, length)
+        else:
+            raise TypeError(
+                "Source must be the text, a path object or a CharOffsetIndex, "
+                f"not {type(source).__name__}"
+            )
+        return self.decipher(window, mode, start, **kwargs)
+
+    def parallel_cipher(
+        self,
+        text: str,
+        mode: Mode,
+        engine: "ParallelEngine | None" = None,
+        offset: int = 0,
+        **kwargs,
+    ) -> str:
+        """
+        Encrypts a large text in segments on a pool of processes.
+
+        Args:
+            text (str): The text to be encrypted.
+            mode (Mode): The mode of the cipher.
+            engine (ParallelEngine | None): The engine to run on; pass one to
+                reuse its pool across calls. Defaults to a temporary engine
+                using every CPU.
+            offset (int): Position of the first character of text in the whole
+                message. Defaults to 0.
+            **kwargs: Key arguments for the corresponding mode.
+
+        Returns:
+            str: The encrypted text, identical to `cipher`.
+        """
+        from lab2.src.parallel import ParallelEngine
+
+        schedule = self.compile_key(mode, **kwargs)
+        if engine is not None:
+            return engine.encrypt(schedule, text, offset)
+        with ParallelEngine() as temporary:
+            return temporary.encrypt(schedule, text, offset)
+
+    def parallel_decipher(
+        self,
+        text: str,
+        mode: Mode,
+        engine: "ParallelEngine | None" = None,
+        offset: int = 0,
+        **kwargs,
+    ) -> str:
         """
-        decrypted_text = ""
-        n = len(self.alphabet)
+        Decrypts a large text in segments on a pool of processes.
+
+        Args:
+            text (str): The text to be decrypted.
+            mode (Mode): The mode of the cipher.
+            engine (ParallelEngine | None): The engine to run on; pass one to
+                reuse its pool across calls. Defaults to a temporary engine
+                using every CPU.
+            offset (int): Position of the first character of text in the whole
+                message. Defaults to 0.
+            **kwargs: Key arguments for the corresponding mode.
+
+        Returns:
+            str: The decrypted text, identical to `decipher`.
+        """
+        from lab2.src.parallel import ParallelEngine
+
+        schedule = self.compile_key(mode, **kwargs)
+        if engine is not None:
+            return engine.decrypt(schedule, text, offset)
+        with ParallelEngine() as temporary:
+            return temporary.decrypt(schedule, text, offset)
+
+
+def _type_errors(mode: Mode, kwargs: dict) -> list[str]:
+    """
+    Check that every key argument of the mode is present and of the right type.
+
+    Args:
+        mode (Mode): The mode of the cipher.
+        kwargs (dict): Key arguments for the mode.
+
+    Returns:
+        list[str]: One message per problem, empty if the keys are valid.
+    """
+    errors = []
+    for name in KEY_NAMES.get(mode, ()):
+        value = kwargs.get(name)
+        if value is None:
+            errors.append(f"{name} is missing")
+        elif name == "passphrase":
+            if not isinstance(value, str) or not value:
+                errors.append("passphrase must be a non-empty string")
+        elif not isinstance(value, int) or isinstance(value, bool):
+            errors.append(f"{name} must be an integer, not {value!r}")
+    return errors
+
+
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def _compile_key(alphabet: AnyAlphabet, mode: Mode, key: tuple) -> KeySchedule:
+    """
+    Compile a key into the shifts of one period.
+
+    The shift repeats every n / gcd(A, n) positions in LINEAR mode, every
+    n / gcd(B, n) positions in NON_LINEAR mode (A ** 2 is a constant there) and
+    every len(passphrase) positions in PASSPHRASE mode.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet of the cipher.
+        mode (Mode): The mode of the cipher.
+        key (tuple): Values of the key arguments, in KEY_NAMES order.
+
+    Returns:
+        KeySchedule: The compiled schedule.
+
+    Raises:
+        ValueError: If the passphrase is empty or contains characters outside
+            the alphabet.
+    """
+    kwargs = dict(zip(KEY_NAMES[mode], key))
+    size = len(alphabet.value)
+    if mode == Mode.LINEAR:
+        period = size // math.gcd(kwargs["A"], size)
+    elif mode == Mode.NON_LINEAR:
+        period = size // math.gcd(kwargs["B"], size)
+    else:
+        period = len(kwargs["passphrase"])
+        if not period:
+            raise ValueError("Passphrase must not be empty")
+    calculate_k = TrithemiusCipher(alphabet)._calculate_k
+    # Shifts are below the alphabet size, so most alphabets fit two bytes each.
+    typecode = "H" if size <= 1 << 16 else "I"
+    shifts = array(
+        typecode, (calculate_k(mode, p, **kwargs) % size for p in range(period))
+    )
+    instrumentation.count("k_values", period)
+    return KeySchedule(alphabet, shifts)
 
-        for idx, char in enumerate(text):
-            if char in self.alphabet:
-                y = self.alphabet.index(char)
-                k = self._calculate_k(mode, idx, **kwargs)
-                x = (y + n - (k % n)) % n
-                decrypted_text += self.alphabet[x]
-            else:
-                decrypted_text += char
 
-        return decrypted_text
+instrumentation.register_cache("schedule", _compile_key)
@@ -0,0 +1,386 @@
+import math
+from collections import Counter
+from typing import NamedTuple, TextIO
+
+from lab2.src.alphabet import AnyAlphabet
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import DEFAULT_CHUNK_SIZE, TrithemiusCipher
+
+DEFAULT_MAX_PERIOD = 20
+KASISKI_LENGTH = 3
+IOC_THRESHOLD = 0.8
+
+
+class PeriodEstimate(NamedTuple):
+    """
+    The estimated passphrase period with the evidence behind it.
+
+    Attributes:
+        period (int): The most likely passphrase length.
+        ioc (dict[int, float]): Mean index of coincidence of the columns for
+            every candidate period.
+        kasiski (dict[int, int]): Number of repeated trigram distances that are
+            a multiple of every candidate period.
+    """
+
+    period: int
+    ioc: dict[int, float]
+    kasiski: dict[int, int]
+
+
+class PeriodEstimator:
+    """
+    Estimate the passphrase length of a PASSPHRASE mode ciphertext in one pass.
+
+    Chunks are fed in order. For every candidate period the characters are
+    counted per column (absolute position modulo the period), and the
+    distances between repeated trigrams are recorded for the Kasiski test.
+    """
+
+    def __init__(self, alphabet: AnyAlphabet, max_period: int = DEFAULT_MAX_PERIOD):
+        """
+        Initializes the estimator.
+
+        Args:
+            alphabet (AnyAlphabet): The alphabet of the ciphertext.
+            max_period (int): The longest passphrase length to consider.
+        """
+        self._letters = alphabet.value
+        self._members = alphabet.lookup.members
+        self._columns = {
+            period: [Counter[str]() for _ in range(period)]
+            for period in range(1, max_period + 1)
+        }
+        self._distances: Counter[int] = Counter()
+        self._last_seen: dict[str, int] = {}
+        self._recent = ""
+        self._position = 0
+
+    def update(self, chunk: str) -> None:
+        """
+        Feeds the next chunk of ciphertext.
+
+        Args:
+            chunk (str): The ciphertext following the previous chunk.
+        """
+        for period, columns in self._columns.items():
+            for column, counter in enumerate(columns):
+                start = (column - self._position) % period
+                counter.update(chunk[start::period])
+
+        text = self._recent + chunk
+        base = self._position - len(self._recent)
+        members, last_seen = self._members, self._last_seen
+        for start in range(len(text) - KASISKI_LENGTH + 1):
+            end = start + KASISKI_LENGTH
+            gram = text[start:end]
+            if not members.issuperset(gram):
+                continue
+            previous = last_seen.get(gram)
+            if previous is not None:
+                self._distances[base + start - previous] += 1
+            last_seen[gram] = base + start
+
+        keep = KASISKI_LENGTH - 1
+        self._recent = text[-keep:]
+        self._position += len(chunk)
+
+    def estimate(self) -> PeriodEstimate:
+        """
+        Picks the period from the data fed so far.
+
+        Columns of the true period and of its multiples hold single Caesar
+        shifts, so their index of coincidence is close to that of the language,
+        while other periods stay near the uniform 1 / n. Periods that score
+        above the midpoint between the two are candidates, and the candidate
+        with the most Kasiski support wins, then the shortest.
+
+        Returns:
+            PeriodEstimate: The estimated period and the scores behind it.
+
+        Raises:
+            ValueError: If there is not enough ciphertext to estimate from.
+        """
+        ioc = {}
+        for period, columns in self._columns.items():
+            total, used = 0.0, 0
+            for counter in columns:
+                counts = [counter[char] for char in self._letters]
+                size = sum(counts)
+                if size > 1:
+                    coincidences = sum(count * (count - 1) for count in counts)
+                    total += coincidences / (size * (size - 1))
+                    used += 1
+            ioc[period] = total / used if used else 0.0
+        kasiski = {
+            period: sum(
+                count
+                for distance, count in self._distances.items()
+                if distance % period == 0
+            )
+            for period in self._columns
+        }
+        best = max(ioc.values())
+        if not best:
+            raise ValueError("Not enough cipher text to estimate the period")
+        uniform = 1 / len(self._letters)
+        threshold = uniform + IOC_THRESHOLD * (best - uniform)
+        candidates = [period for period, value in ioc.items() if value >= threshold]
+        period = max(candidates, key=lambda period: (kasiski[period], -period))
+        return PeriodEstimate(period, ioc, kasiski)
+
+
+class TrithemiusSolver:
+    """
+    Recovers Trithemius keys from known or guessed plaintext.
+
+    In LINEAR mode the shift is k(p) = A * p + B and in NON_LINEAR mode it is
+    k(p) = A ** 2 + B * p + C. Both are affine in the position p, so every
+    known character gives a linear congruence modulo the alphabet length n,
+    and a few characters pin down the slope and intercept analytically. Only
+    these effective keys mod n can be recovered; they encrypt exactly like the
+    original keys.
+
+    Attributes:
+        cipher (TrithemiusCipher): The cipher used to verify recovered keys.
+    """
+
+    def __init__(self, alphabet: AnyAlphabet):
+        """
+        Initializes the solver with a given alphabet.
+
+        Args:
+            alphabet (AnyAlphabet): The alphabet set used for encryption.
+        """
+        self.cipher = TrithemiusCipher(alphabet)
+        self._alphabet = alphabet
+        self._position = alphabet.lookup.position
+        self._size = len(alphabet.value)
+
+    def _shifts(
+        self, plaintext: str, ciphertext: str, offset: int
+    ) -> list[tuple[int, int]] | None:
+        """
+        Collects the (position, shift mod n) pairs of known characters.
+
+        Args:
+            plaintext (str): The known plaintext.
+            ciphertext (str): The matching ciphertext.
+            offset (int): Position of the first character in the whole message.
+
+        Returns:
+            list[tuple[int, int]] | None: The pairs, or None if a character
+                outside the alphabet was changed by the encryption.
+        """
+        position_of, size = self._position, self._size
+        shifts = []
+        for position, (plain, encrypted) in enumerate(
+            zip(plaintext, ciphertext), offset
+        ):
+            x, y = position_of(plain), position_of(encrypted)
+            if x is None or y is None:
+                if plain != encrypted:
+                    return None
+                continue
+            shifts.append((position, (y - x) % size))
+        return shifts
+
+    def _solve_affine(self, shifts: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """
+        Solves a * p + b = d (mod n) for every (p, d) pair.
+
+        Subtracting the first equation from another gives a * dp = dd (mod n),
+        which has gcd(dp, n) solutions for a when gcd(dp, n) divides dd. The
+        solutions of all equations are intersected.
+
+        Args:
+            shifts (list[tuple[int, int]]): The (position, shift) pairs.
+
+        Returns:
+            list[tuple[int, int]]: Every (slope, intercept) pair mod n.
+        """
+        size = self._size
+        if not shifts:
+            return [(a, b) for a in range(size) for b in range(size)]
+        first_position, first_shift = shifts[0]
+        slopes = set(range(size))
+        for position, shift in shifts[1:]:
+            step = (position - first_position) % size
+            difference = (shift - first_shift) % size
+            divisor = math.gcd(step, size)
+            if difference % divisor:
+                return []
+            modulus = size // divisor
+            base = difference // divisor * pow(step // divisor, -1, modulus) % modulus
+            slopes &= set(range(base, size, modulus))
+            if not slopes:
+                return []
+        return sorted((a, (first_shift - a * first_position) % size) for a in slopes)
+
+    @staticmethod
+    def _to_key(mode: Mode, slope: int, intercept: int) -> dict[str, int]:
+        """
+        Converts an effective slope and intercept into cipher keys.
+
+        Args:
+            mode (Mode): The mode of the cipher.
+            slope (int): The coefficient of the position mod n.
+            intercept (int): The constant shift mod n.
+
+        Returns:
+            dict[str, int]: Key arguments for the mode.
+
+        Raises:
+            ValueError: If the mode has no affine keys.
+        """
+        if mode == Mode.LINEAR:
+            return {"A": slope, "B": intercept}
+        elif mode == Mode.NON_LINEAR:
+            return {"A": 0, "B": slope, "C": intercept}
+        raise ValueError("Only LINEAR and NON_LINEAR keys can be solved for")
+
+    def _verify(
+        self, plaintext: str, ciphertext: str, mode: Mode, offset: int, key: dict
+    ) -> bool:
+        """
+        Checks a key by encrypting the known plaintext with it.
+
+        Args:
+            plaintext (str): The known plaintext.
+            ciphertext (str): The matching ciphertext.
+            mode (Mode): The mode of the cipher.
+            offset (int): Position of the first character in the whole message.
+            key (dict): Key arguments for the mode.
+
+        Returns:
+            bool: True if the key produces the ciphertext.
+        """
+        return self.cipher.cipher(plaintext, mode, offset, **key) == ciphertext
+
+    def recover_keys(
+        self, plaintext: str, ciphertext: str, mode: Mode, offset: int = 0
+    ) -> list[dict[str, int]]:
+        """
+        Recovers every effective key consistent with a known-plaintext fragment.
+
+        Two alphabet characters whose positions differ by a number coprime to
+        n are usually enough for a unique key. Every solution is verified by
+        encrypting the fragment with it.
+
+        Args:
+            plaintext (str): The known plaintext.
+            ciphertext (str): The ciphertext of the same fragment.
+            mode (Mode): LINEAR or NON_LINEAR.
+            offset (int): Position of the fragment in the whole message.
+                Defaults to 0.
+
+        Returns:
+            list[dict[str, int]]: Key arguments of every consistent key.
+
+        Raises:
+            ValueError: If the mode is PASSPHRASE or the lengths differ.
+        """
+        if len(plaintext) != len(ciphertext):
+            raise ValueError("Plaintext and ciphertext must have the same length")
+        if mode not in (Mode.LINEAR, Mode.NON_LINEAR):
+            raise ValueError("Only LINEAR and NON_LINEAR keys can be solved for")
+        shifts = self._shifts(plaintext, ciphertext, offset)
+        if shifts is None:
+            return []
+        keys = [self._to_key(mode, a, b) for a, b in self._solve_affine(shifts)]
+        return [
+            key
+            for key in keys
+            if self._verify(plaintext, ciphertext, mode, offset, key)
+        ]
+
+    def brute_force_keys(
+        self, plaintext: str, ciphertext: str, mode: Mode, offset: int = 0
+    ) -> list[dict[str, int]]:
+        """
+        Finds every effective key by trying the whole n * n key space.
+
+        This is the slow reference for recover_keys.
+
+        Args:
+            plaintext (str): The known plaintext.
+            ciphertext (str): The ciphertext of the same fragment.
+            mode (Mode): LINEAR or NON_LINEAR.
+            offset (int): Position of the fragment in the whole message.
+                Defaults to 0.
+
+        Returns:
+            list[dict[str, int]]: Key arguments of every consistent key.
+
+        Raises:
+            ValueError: If the mode is PASSPHRASE.
+        """
+        keys = []
+        for slope in range(self._size):
+            for intercept in range(self._size):
+                key = self._to_key(mode, slope, intercept)
+                if self._verify(plaintext, ciphertext, mode, offset, key):
+                    keys.append(key)
+        return keys
+
+    def find_crib(
+        self,
+        ciphertext: str,
+        crib: str,
+        mode: Mode,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> list[tuple[int, dict[str, int]]]:
+        """
+        Tries a guessed plaintext word at every position of the ciphertext.
+
+        Args:
+            ciphertext (str): The whole ciphertext.
+            crib (str): A word expected somewhere in the plaintext. Three or
+                more alphabet characters are needed to rule out positions.
+            mode (Mode): LINEAR or NON_LINEAR.
+            start (int): First position to try. Defaults to 0.
+            stop (int | None): Try positions before this one. Defaults to the
+                end of the ciphertext.
+
+        Returns:
+            list[tuple[int, dict[str, int]]]: The positions where the crib
+                yields exactly one key, with that key.
+
+        Raises:
+            ValueError: If the mode is PASSPHRASE.
+        """
+        if stop is None:
+            stop = len(ciphertext)
+        matches = []
+        for offset in range(start, min(stop, len(ciphertext) - len(crib) + 1)):
+            end = offset + len(crib)
+            keys = self.recover_keys(crib, ciphertext[offset:end], mode, offset)
+            if len(keys) == 1:
+                matches.append((offset, keys[0]))
+        return matches
+
+    def estimate_period(
+        self,
+        reader: TextIO,
+        max_period: int = DEFAULT_MAX_PERIOD,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> PeriodEstimate:
+        """
+        Estimates the passphrase length of a PASSPHRASE mode ciphertext stream.
+
+        Args:
+            reader (TextIO): The stream to read ciphertext from.
+            max_period (int): The longest passphrase length to consider.
+            chunk_size (int): The number of characters read per chunk.
+
+        Returns:
+            PeriodEstimate: The estimated period and the scores behind it.
+
+        Raises:
+            ValueError: If there is not enough ciphertext to estimate from.
+        """
+        estimator = PeriodEstimator(self._alphabet, max_period)
+        while chunk := reader.read(chunk_size):
+            estimator.update(chunk)
+        return estimator.estimate()
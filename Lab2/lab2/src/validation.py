@@ -0,0 +1,270 @@
+import codecs
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import TextIO
+
+from lab2.src import instrumentation
+from lab2.src.alphabet import AnyAlphabet
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# The most frequent foreign letters listed by InputReport.summary.
+SUMMARY_LETTERS = 10
+_LATIN_1 = bytes(range(256)).decode("latin-1")
+_ALL_CODES = bytes(range(256))
+_ASCII = bytes(range(128)).decode("ascii")
+# Marks unused codes in charmap tables, so it cannot be a symbol.
+_UNDEFINED = "\ufffe"
+# Texts are coded in slices of this many characters, so a slice with new
+# characters is the only part encoded twice.
+_SLICE_CHARS = 64 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class InputReport:
+    """
+    What the validation pre-pass found in a text.
+
+    Attributes:
+        alphabet (AnyAlphabet): The alphabet the text was checked against.
+        length (int): The number of characters in the text.
+        letters (int): The characters in the alphabet, which the cipher shifts.
+        foreign (dict[str, int]): Letters outside the alphabet and how often
+            they occur. The cipher leaves them unencrypted.
+        scripts (tuple[str, ...]): The Unicode scripts of the letters of the
+            text, such as LATIN or CYRILLIC, sorted.
+        mask (bytes | None): One byte per character of the text, 1 for the
+            letters of the alphabet and 0 otherwise, or None when the text
+            was streamed.
+    """
+
+    alphabet: AnyAlphabet
+    length: int
+    letters: int
+    foreign: dict[str, int]
+    scripts: tuple[str, ...]
+    mask: bytes | None = None
+
+    @property
+    def coverage(self) -> float:
+        """The share of the characters that the cipher shifts."""
+        return self.letters / self.length if self.length else 1.0
+
+    @property
+    def mixed_scripts(self) -> bool:
+        """Whether the letters come from more than one script."""
+        return len(self.scripts) > 1
+
+    @property
+    def ok(self) -> bool:
+        """Whether every letter of the text belongs to the alphabet."""
+        return not self.foreign and not self.mixed_scripts
+
+    def summary(self) -> str:
+        """
+        Describes the findings for the user.
+
+        Returns:
+            str: One line on coverage, then one line per problem found.
+        """
+        lines = [
+            f"{self.length} characters, {self.letters} in the "
+            f"{self.alphabet.name} alphabet ({self.coverage:.1%})"
+        ]
+        if self.foreign:
+            common = Counter(self.foreign).most_common(SUMMARY_LETTERS)
+            listed = ", ".join(f"{char!r} x{count}" for char, count in common)
+            lines.append(
+                f"{sum(self.foreign.values())} letters outside the alphabet "
+                f"stay unencrypted: {listed}"
+            )
+        if self.mixed_scripts:
+            lines.append(f"Letters mix scripts: {', '.join(self.scripts)}")
+        return "\n".join(lines)
+
+
+def _script(char: str) -> str:
+    """
+    Name the Unicode script of a letter by the first word of its name.
+
+    Args:
+        char (str): A letter.
+
+    Returns:
+        str: The script, such as LATIN or CYRILLIC.
+    """
+    return unicodedata.name(char, "UNKNOWN").partition(" ")[0]
+
+
+def _symbol_codes(alphabet: AnyAlphabet, text: str) -> tuple[bytes, str] | None:
+    """
+    Code every character of a text as one byte.
+
+    Latin-1 texts are their own codes. Other texts are coded through a charmap
+    that starts with the alphabet and ASCII and grows by the new characters
+    of every slice it fails on, so only those slices are searched for their
+    distinct characters. The charmap encodes at C speed because it holds 256
+    BMP characters starting with NUL, unused codes marked U+FFFE.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet the text is checked against.
+        text (str): The text to code.
+
+    Returns:
+        tuple[bytes, str] | None: The codes and the character of every code,
+            or None if the text has too many distinct characters.
+    """
+    try:
+        return text.encode("latin-1"), _LATIN_1
+    except UnicodeEncodeError:
+        pass
+    symbols = _seed_symbols(alphabet)
+    known = set(symbols)
+    encoding_map = codecs.charmap_build(symbols.ljust(256, _UNDEFINED))
+    parts = []
+    for start in range(0, len(text), _SLICE_CHARS):
+        end = start + _SLICE_CHARS
+        part = text[start:end]
+        try:
+            parts.append(codecs.charmap_encode(part, "strict", encoding_map)[0])
+            continue
+        except UnicodeEncodeError:
+            pass
+        new = set(part).difference(known)
+        if _UNDEFINED in new or max(new) > "\uffff":
+            return None
+        symbols += "".join(sorted(new))
+        if len(symbols) > 256:
+            return None
+        known.update(new)
+        encoding_map = codecs.charmap_build(symbols.ljust(256, _UNDEFINED))
+        parts.append(codecs.charmap_encode(part, "strict", encoding_map)[0])
+    return b"".join(parts), symbols
+
+
+def _seed_symbols(alphabet: AnyAlphabet) -> str:
+    """
+    Choose the first characters of a charmap: NUL, ASCII and the alphabet.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet the text is checked against.
+
+    Returns:
+        str: The seed, fewer than 256 BMP characters starting with NUL.
+    """
+    letters = "".join(
+        char
+        for char in alphabet.value
+        if "\x7f" < char <= "\uffff" and char != _UNDEFINED
+    )
+    return (_ASCII + letters)[:256]
+
+
+def _scan(alphabet: AnyAlphabet, text: str) -> tuple[int, Counter, set[str], bytes]:
+    """
+    Classify the characters of a text against an alphabet.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet to check against.
+        text (str): The text to check.
+
+    Returns:
+        tuple[int, Counter, set[str], bytes]: The number of alphabet letters,
+            the counts of the foreign letters, the scripts of all letters and
+            the letter mask.
+    """
+    members = alphabet.lookup.members
+    coded = _symbol_codes(alphabet, text)
+    if coded is None:
+        counts = Counter(text)
+        mask = text.translate(
+            {ord(char): int(char in members) for char in counts}
+        ).encode("latin-1")
+        foreign = Counter(
+            {
+                char: count
+                for char, count in counts.items()
+                if char.isalpha() and char not in members
+            }
+        )
+        scripts = {_script(char) for char in counts if char.isalpha()}
+        return mask.count(1), foreign, scripts, mask
+
+    codes, symbols = coded
+    table = bytearray(256)
+    foreign_codes = bytearray()
+    member_scripts: dict[str, bytearray] = {}
+    for code, char in enumerate(symbols):
+        if char in members:
+            table[code] = 1
+            if char.isalpha():
+                member_scripts.setdefault(_script(char), bytearray()).append(code)
+        elif char.isalpha():
+            foreign_codes.append(code)
+    mask = codes.translate(table)
+    # Deleting every other code leaves only the foreign letters, usually few.
+    residual = codes.translate(None, _ALL_CODES.translate(None, foreign_codes))
+    foreign = Counter()
+    for code in foreign_codes:
+        if count := residual.count(code):
+            foreign[symbols[code]] = count
+    scripts = {_script(char) for char in foreign}
+    scripts.update(
+        script
+        for script, group in member_scripts.items()
+        if any(code in codes for code in group)
+    )
+    return mask.count(1), foreign, scripts, mask
+
+
+def validate_text(alphabet: AnyAlphabet, text: str) -> InputReport:
+    """
+    Check a text against an alphabet before ciphering it.
+
+    The text is coded as one byte per character once; the mask, the letter
+    count and the foreign letters are then found with `bytes` methods, and
+    only distinct characters are looked at in Python.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet to check against.
+        text (str): The text to check.
+
+    Returns:
+        InputReport: The findings, with the letter mask of the text.
+    """
+    with instrumentation.stage("validate"):
+        letters, foreign, scripts, mask = _scan(alphabet, text)
+    return InputReport(
+        alphabet, len(text), letters, dict(foreign), tuple(sorted(scripts)), mask
+    )
+
+
+def validate_stream(
+    alphabet: AnyAlphabet, reader: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> InputReport:
+    """
+    Check a text stream against an alphabet chunk by chunk in constant memory.
+
+    Args:
+        alphabet (AnyAlphabet): The alphabet to check against.
+        reader (TextIO): The stream to read the text from.
+        chunk_size (int): The number of characters read per chunk.
+
+    Returns:
+        InputReport: The findings, without a letter mask.
+    """
+    length = letters = 0
+    foreign: Counter = Counter()
+    scripts: set[str] = set()
+    while True:
+        with instrumentation.stage("io"):
+            chunk = reader.read(chunk_size)
+        if not chunk:
+            break
+        with instrumentation.stage("validate"):
+            chunk_letters, chunk_foreign, chunk_scripts, _ = _scan(alphabet, chunk)
+        length += len(chunk)
+        letters += chunk_letters
+        foreign.update(chunk_foreign)
+        scripts.update(chunk_scripts)
+    return InputReport(alphabet, length, letters, dict(foreign), tuple(sorted(scripts)))
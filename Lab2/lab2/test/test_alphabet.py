@@ -0,0 +1,100 @@
+import dataclasses
+import unittest
+
+from lab2.src.alphabet import (
+    DIGITS,
+    EN_DIGITS,
+    Alphabet,
+    CustomAlphabet,
+    combine_alphabets,
+    get_alphabet,
+    register_alphabet,
+    register_range,
+)
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+
+class TestAlphabet(unittest.TestCase):
+    def test_lookup(self):
+        """Test that the lookup structures agree with the alphabet string."""
+        for alphabet in Alphabet:
+            lookup = alphabet.lookup
+            self.assertEqual("".join(lookup.chars), alphabet.value)
+            self.assertEqual(lookup.members, set(alphabet.value))
+            for position, char in enumerate(alphabet.value):
+                self.assertEqual(lookup.index[char], position)
+
+    def test_lookup_is_shared_and_immutable(self):
+        """Test that the lookup is built once and cannot be reassigned."""
+        self.assertIs(Alphabet.UK.lookup, Alphabet.UK.lookup)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            Alphabet.EN.lookup.chars = ()  # type: ignore
+
+    def test_range_lookup_is_dense(self):
+        """Test that contiguous alphabets find positions by code point offset."""
+        greek = register_range("TEST_GREEK", "α", "ω")
+        self.assertEqual(len(greek.value), 25)
+        self.assertIsNotNone(greek.lookup.offsets)
+        self.assertIsNone(Alphabet.EN.lookup.offsets)
+        for alphabet in (greek, DIGITS, Alphabet.EN, Alphabet.UK):
+            for position, char in enumerate(alphabet.value):
+                self.assertEqual(alphabet.lookup.position(char), position)
+            for char in " ~\x00€":
+                self.assertIsNone(alphabet.lookup.position(char))
+
+    def test_registry(self):
+        """Test registering, combining and looking up alphabets by name."""
+        custom = register_alphabet("TEST_BASES", "TGCA")
+        self.assertIs(get_alphabet("TEST_BASES"), custom)
+        self.assertIs(get_alphabet("UK"), Alphabet.UK)
+        self.assertEqual(custom, CustomAlphabet("TEST_BASES", "TGCA"))
+        # Reversed letters still cover one code point range.
+        self.assertEqual(
+            register_alphabet("TEST_REVERSED", "3210").lookup.position("0"), 3
+        )
+        combined = combine_alphabets("TEST_COMBINED", custom, DIGITS)
+        self.assertEqual(combined.value, "TGCA0123456789")
+        with self.assertRaises(KeyError):
+            get_alphabet("TEST_MISSING")
+
+    def test_registry_rejects_invalid_alphabets(self):
+        """Test that taken names and unusable letters are rejected."""
+        for name, letters in (
+            ("EN", "01"),
+            ("", "01"),
+            ("TEST_SHORT", "0"),
+            ("TEST_DUPLICATE", "0100"),
+            ("TEST_SURROGATE", "0\ud800"),
+        ):
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                register_alphabet(name, letters)
+        with self.assertRaises(ValueError):
+            combine_alphabets("TEST_OVERLAP", Alphabet.EN, EN_DIGITS)
+
+    def test_cipher_accepts_registered_alphabets(self):
+        """Test that the cipher shifts within a registered alphabet."""
+        cipher = TrithemiusCipher(EN_DIGITS)
+        self.assertEqual(cipher.cipher("z9 z9", Mode.LINEAR, A=1, B=1), "0B 3E")
+        text = "Order 66, room 101!"
+        for mode, key in (
+            (Mode.LINEAR, {"A": 5, "B": 7}),
+            (Mode.NON_LINEAR, {"A": 2, "B": 3, "C": 4}),
+            (Mode.PASSPHRASE, {"passphrase": "K3y"}),
+        ):
+            encrypted = cipher.cipher(text, mode, **key)
+            self.assertEqual(cipher.decipher(encrypted, mode, **key), text)
+
+    def test_cipher_accepts_large_range_alphabets(self):
+        """Test shifts beyond two bytes in an alphabet of over 65,536 letters."""
+        big = register_range("TEST_BIG", "\U00010000", "\U0002FFFF")
+        self.assertEqual(len(big.value), 0x20000)
+        cipher = TrithemiusCipher(big)
+        encrypted = cipher.cipher("\U00010005", Mode.LINEAR, A=1, B=70000)
+        self.assertEqual(encrypted, chr(0x10000 + 70005))
+        self.assertEqual(
+            cipher.decipher(encrypted, Mode.LINEAR, A=1, B=70000), "\U00010005"
+        )
+        text = "\U00010005 \U0002FFFF!"
+        encrypted = cipher.cipher(text, Mode.LINEAR, A=3, B=100000)
+        self.assertEqual(cipher.decipher(encrypted, Mode.LINEAR, A=3, B=100000), text)
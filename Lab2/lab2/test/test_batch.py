@@ -0,0 +1,67 @@
+import unittest
+
+from lab2.src.alphabet import Alphabet
+from lab2.src.batch import IndexedText, shift_many
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+KEYS = {
+    Mode.LINEAR: [{"A": 3, "B": 5}, {"A": 2, "B": 0}, {"A": 0, "B": 1}],
+    Mode.NON_LINEAR: [{"A": 2, "B": 3, "C": 4}, {"A": 1, "B": 13, "C": 0}],
+    Mode.PASSPHRASE: [{"passphrase": "Ключ"}, {"passphrase": "аб"}],
+}
+
+
+class TestBatch(unittest.TestCase):
+    def test_indexed_text(self):
+        """Test latin-1 and charmap codes against single-key encryption."""
+        for alphabet, text in (
+            (Alphabet.EN, "Hello, World! Ünïcödé"),
+            (Alphabet.UK, "Привіт, Світе! Hello 😀"),
+            (Alphabet.EN, "Hello 😀"),
+            (Alphabet.EN, ""),
+        ):
+            indexed = IndexedText(alphabet, text)
+            cipher = TrithemiusCipher(alphabet)
+            schedule = cipher.compile_key(Mode.LINEAR, A=3, B=5)
+            for offset in (0, 7):
+                encrypted = schedule.encrypt(text, offset)
+                self.assertEqual(indexed.apply(schedule, offset), encrypted)
+                self.assertEqual(
+                    IndexedText(alphabet, encrypted).apply(schedule, offset, -1), text
+                )
+        schedule = TrithemiusCipher(Alphabet.UK).compile_key(Mode.LINEAR, A=1, B=1)
+        with self.assertRaises(ValueError):
+            IndexedText(Alphabet.EN, "abc").apply(schedule)
+
+    def test_too_many_symbols(self):
+        """Test that varied texts fall back to shifting key by key."""
+        text = "".join(map(chr, range(0x4E00, 0x4F00))) + "abc"
+        with self.assertRaises(ValueError):
+            IndexedText(Alphabet.EN, text)
+        schedule = TrithemiusCipher(Alphabet.EN).compile_key(Mode.LINEAR, A=1, B=2)
+        self.assertEqual(
+            list(shift_many(Alphabet.EN, text, [schedule], 3)),
+            [schedule.encrypt(text, 3)],
+        )
+
+    def test_cipher_many(self):
+        """Test lazy, ordered results for every mode, in and out of process."""
+        text = "Київ — столиця України. Kyiv!\n" * 50
+        cipher = TrithemiusCipher(Alphabet.UK)
+        for mode, keys in KEYS.items():
+            expected = [cipher.cipher(text, mode, 11, **key) for key in keys]
+            self.assertEqual(list(cipher.cipher_many(text, mode, keys, 11)), expected)
+            self.assertEqual(
+                list(cipher.cipher_many(text, mode, keys, 11, jobs=2)), expected
+            )
+            self.assertEqual(
+                list(cipher.decipher_many(expected[0], mode, keys[:1], 11)), [text]
+            )
+        results = cipher.cipher_many(text, Mode.PASSPHRASE, [{"passphrase": "x"}])
+        with self.assertRaises(ValueError):
+            next(results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import io
+import os
+import pathlib
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from lab2.src import cache as cache_module
+from lab2.src.alphabet import Alphabet
+from lab2.src.cache import ResultCache, file_digest, text_digest
+from lab2.src.cli import FileJob, process_file
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        """Setup a temporary directory for the cache database."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name) / "cache.db"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_or_compute(self):
+        """Test that results are computed once and counted as hits after."""
+        cipher = TrithemiusCipher(Alphabet.UK)
+        calls = []
+
+        def compute(text: str) -> str:
+            calls.append(text)
+            return cipher.cipher(text, Mode.PASSPHRASE, passphrase=passphrase)
+
+        text = "Привіт, Світе!"
+        passphrase = "Ключ"
+        with ResultCache(self.path) as cache:
+            first = cache.get_or_compute(
+                text, compute, cipher="trithemius", key=passphrase
+            )
+            second = cache.get_or_compute(
+                text, compute, cipher="trithemius", key=passphrase
+            )
+            cache.get_or_compute(
+                text.upper(), compute, cipher="trithemius", key=passphrase
+            )
+            self.assertEqual(
+                first, cipher.cipher(text, Mode.PASSPHRASE, passphrase=passphrase)
+            )
+            self.assertEqual(second, first)
+            self.assertEqual(len(calls), 2)
+            info = cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.entries), (1, 2, 2))
+        with ResultCache(self.path) as cache:
+            self.assertEqual(
+                cache.get_or_compute(
+                    text, compute, key=passphrase, cipher="trithemius"
+                ),
+                first,
+            )
+        self.assertEqual(len(calls), 2)
+
+    def test_keys_hide_parameters(self):
+        """Test that keys are salted by a private key file outside the database."""
+        digest = text_digest("text")
+        with ResultCache(self.path) as cache:
+            key = cache.key(digest, cipher="trithemius", key={"passphrase": "hunter2"})
+            cache.put(key, b"result")
+        key_path = pathlib.Path(cache.key_path)
+        self.assertEqual(key_path, self.path.with_name("cache.db.key"))
+        salt = key_path.read_bytes()
+        self.assertEqual(len(salt), cache_module.SALT_BYTES)
+        if os.name == "posix":
+            self.assertEqual(stat.S_IMODE(key_path.stat().st_mode), 0o600)
+        database = self.path.read_bytes()
+        self.assertNotIn(b"hunter2", database)
+        self.assertNotIn(salt, database)
+
+        with ResultCache(self.path) as cache:
+            self.assertEqual(cache.get(key), b"result")
+        other_key = pathlib.Path(self.directory.name) / "other.key"
+        with ResultCache(self.path, key_path=other_key) as other:
+            self.assertNotEqual(
+                other.key(digest, cipher="trithemius", key={"passphrase": "hunter2"}),
+                key,
+            )
+        other_key.write_bytes(b"short")
+        with self.assertRaises(ValueError):
+            ResultCache(self.path, key_path=other_key)
+
+    def test_streaming(self):
+        """Test that files are stored and copied out in chunks."""
+        source = pathlib.Path(self.directory.name) / "result.bin"
+        source.write_bytes(bytes(range(256)) * 40)
+        with mock.patch.object(cache_module, "COPY_CHUNK_SIZE", 1000):
+            with ResultCache(self.path) as cache:
+                key = cache.key(file_digest(source))
+                self.assertTrue(cache.put_file(key, source))
+                writer = io.BytesIO()
+                self.assertTrue(cache.get_file(key, writer))
+                self.assertEqual(writer.getvalue(), source.read_bytes())
+                self.assertFalse(cache.get_file(cache.key(b"other"), writer))
+                self.assertTrue(cache.put(key, b""))
+                self.assertEqual(cache.get(key), b"")
+
+    def test_eviction(self):
+        """Test that the least recently used results are evicted first."""
+        with ResultCache(self.path, max_bytes=30) as cache:
+            keys = [cache.key(text_digest(str(i))) for i in range(4)]
+            for key in keys[:3]:
+                self.assertTrue(cache.put(key, b"x" * 10))
+            cache.get(keys[0])
+            cache.put(keys[3], b"x" * 10)
+            self.assertIsNotNone(cache.get(keys[0]))
+            self.assertIsNone(cache.get(keys[1]))
+            self.assertFalse(cache.put(keys[1], b"x" * 31))
+            info = cache.cache_info()
+        self.assertEqual((info.evictions, info.entries, info.size), (1, 3, 30))
+
+    def test_process_file(self):
+        """Test that a repeated file job copies its output from the cache."""
+        directory = pathlib.Path(self.directory.name)
+        source = directory / "text.txt"
+        source.write_text("Привіт, Світе!\n" * 100, encoding="utf-8")
+        job = FileJob(
+            source,
+            directory / "out.txt",
+            Alphabet.UK,
+            Mode.LINEAR,
+            {"A": 3, "B": 5},
+            False,
+            cache=self.path,
+        )
+        self.assertFalse(process_file(job).cached)
+        expected = job.target.read_bytes()
+        job.target.unlink()
+        self.assertTrue(process_file(job).cached)
+        self.assertEqual(job.target.read_bytes(), expected)
+        self.assertFalse(process_file(job._replace(key={"A": 3, "B": 6})).cached)
+
+        decrypt = job._replace(
+            source=job.target, target=directory / "back.txt", decrypt=True
+        )
+        for _ in range(2):
+            self.assertIsNone(process_file(decrypt).cached)
+        with ResultCache(self.path) as cache:
+            self.assertEqual(cache.cache_info().entries, 2)
+        self.assertEqual(
+            file_digest(source), text_digest(source.read_text(encoding="utf-8"))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
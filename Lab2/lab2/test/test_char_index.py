@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+from lab2.src.char_index import CharOffsetIndex
+
+
+class TestCharOffsetIndex(unittest.TestCase):
+    def setUp(self):
+        """Write a mixed-script UTF-8 file for testing."""
+        self.text = "Привіт, world! Ґава 😀\r\n" * 20
+        fd, self.path = tempfile.mkstemp()
+        with open(fd, "w", encoding="utf-8", newline="") as file:
+            file.write(self.text)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_length(self):
+        """Test that the index counts characters, not bytes."""
+        self.assertEqual(
+            CharOffsetIndex(self.path, block_size=7).length, len(self.text)
+        )
+
+    def test_read_windows(self):
+        """Test reading windows across checkpoints split inside characters."""
+        index = CharOffsetIndex(self.path, block_size=7)
+        self.assertGreater(len(index.char_offsets), 2)
+        for start in range(0, len(self.text), 13):
+            with self.subTest(start=start):
+                self.assertEqual(index.read(start, 11), self.text[start:][:11])
+
+    def test_small_blocks(self):
+        """Test the smallest block size, and that smaller ones are rejected."""
+        index = CharOffsetIndex(self.path, block_size=4)
+        self.assertEqual(index.length, len(self.text))
+        self.assertEqual(index.read(20, 9), self.text[20:29])
+        for block_size in (0, 1, 3):
+            with self.subTest(block_size=block_size):
+                with self.assertRaises(ValueError):
+                    CharOffsetIndex(self.path, block_size=block_size)
@@ -0,0 +1,147 @@
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+
+from lab2.src.alphabet import Alphabet, CustomAlphabet
+from lab2.src.container import (
+    ContainerError,
+    Header,
+    read_container,
+    scan,
+    write_container,
+)
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+KEY = {"A": 3, "B": 7}
+
+
+class TestContainer(unittest.TestCase):
+    def setUp(self):
+        """Setup a temporary directory and a sample text."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name) / "text.sslc"
+        self.text = "Привіт, Світе! Hello, World!\n" * 300
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def decrypt(self, **kwargs) -> str:
+        """Decrypt the container into a string."""
+        writer = io.StringIO()
+        read_container(self.path, writer, **kwargs)
+        return writer.getvalue()
+
+    def test_round_trip(self):
+        """Test that blocks decrypt at their offsets, in and out of process."""
+        chars = write_container(
+            io.StringIO(self.text),
+            self.path,
+            Alphabet.UK,
+            Mode.LINEAR,
+            "cp1251",
+            1000,
+            **KEY,
+        )
+        self.assertEqual(chars, len(self.text))
+        found = scan(self.path)
+        self.assertTrue(found.complete)
+        self.assertEqual(
+            found.header,
+            Header("trithemius", "UK", Alphabet.UK.value, "cp1251", "LINEAR"),
+        )
+        self.assertEqual(self.decrypt(**KEY), self.text)
+        self.assertEqual(self.decrypt(jobs=2, **KEY), self.text)
+        # Nine cp1251 blocks of one byte per character and the end marker.
+        overhead = len(found.header.to_bytes()) + 10 * 20
+        self.assertEqual(os.path.getsize(self.path), len(self.text) + overhead)
+
+    def test_blocks_match_whole_text_encryption(self):
+        """Test that blocks hold the cipher text of the whole message."""
+        key = {"passphrase": "Key"}
+        write_container(
+            io.StringIO(self.text),
+            self.path,
+            Alphabet.EN,
+            Mode.PASSPHRASE,
+            block_chars=777,
+            **key,
+        )
+        cipher = TrithemiusCipher(Alphabet.EN)
+        expected = cipher.cipher(self.text, Mode.PASSPHRASE, **key)
+        with open(self.path, "rb") as reader:
+            Header.read(reader)
+            self.assertIn(expected[777:1554].encode("utf-8"), reader.read())
+        self.assertEqual(self.decrypt(jobs=2, **key), self.text)
+
+    def test_unregistered_alphabet(self):
+        """Test that the header carries the letters of custom alphabets."""
+        alphabet = CustomAlphabet("TEST_ABC", "abc")
+        write_container(
+            io.StringIO("abcabc xyz"), self.path, alphabet, Mode.LINEAR, **KEY
+        )
+        self.assertEqual(scan(self.path).header.get_alphabet(), alphabet)
+        self.assertEqual(self.decrypt(**KEY), "abcabc xyz")
+
+    def test_interrupted_write(self):
+        """Test that an interrupted container is detected and resumed."""
+        write_container(
+            io.StringIO(self.text),
+            self.path,
+            Alphabet.UK,
+            Mode.LINEAR,
+            block_chars=700,
+            **KEY,
+        )
+        expected = self.path.read_bytes()
+        self.path.write_bytes(expected[: len(expected) // 2])
+
+        found = scan(self.path)
+        self.assertFalse(found.complete)
+        self.assertEqual(found.chars % 700, 0)
+        with self.assertRaises(ContainerError):
+            self.decrypt(**KEY)
+        self.assertEqual(self.decrypt(partial=True, **KEY), self.text[: found.chars])
+
+        with self.assertRaises(ContainerError):
+            write_container(
+                io.StringIO(self.text),
+                self.path,
+                Alphabet.UK,
+                Mode.NON_LINEAR,
+                resume=True,
+                A=1,
+                B=2,
+                C=3,
+            )
+        write_container(
+            io.StringIO(self.text),
+            self.path,
+            Alphabet.UK,
+            Mode.LINEAR,
+            block_chars=700,
+            resume=True,
+            **KEY,
+        )
+        self.assertEqual(self.path.read_bytes(), expected)
+
+    def test_corruption(self):
+        """Test that damaged containers are rejected."""
+        write_container(
+            io.StringIO(self.text),
+            self.path,
+            Alphabet.EN,
+            Mode.LINEAR,
+            block_chars=500,
+            **KEY,
+        )
+        data = bytearray(self.path.read_bytes())
+        data[len(data) // 2] ^= 0xFF
+        self.path.write_bytes(bytes(data))
+        with self.assertRaises(ContainerError):
+            self.decrypt(**KEY)
+        self.path.write_bytes(b"not a container")
+        with self.assertRaises(ContainerError):
+            scan(self.path)
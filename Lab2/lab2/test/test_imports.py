@@ -0,0 +1,37 @@
+import subprocess
+import sys
+import unittest
+
+from lab2.benchmark.import_benchmark import (
+    CORE_FORBIDDEN,
+    CORE_MODULES,
+    ENTRY_FORBIDDEN,
+    ENTRY_MODULES,
+)
+
+
+def loaded_packages(modules: tuple[str, ...], packages: tuple[str, ...]) -> str:
+    """Import modules in a fresh interpreter and list the packages it loaded."""
+    code = (
+        "import sys\n"
+        + "".join(f"import {module}\n" for module in modules)
+        + f"print(','.join(p for p in {packages!r} if p in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return completed.stdout.strip()
+
+
+class TestImports(unittest.TestCase):
+    def test_core_imports(self):
+        """Test that the cipher core loads no GUI, NumPy or process pools."""
+        self.assertEqual(loaded_packages(CORE_MODULES, CORE_FORBIDDEN), "")
+
+    def test_entry_point_imports(self):
+        """Test that the CLI, container and service load no GUI or NumPy."""
+        self.assertEqual(loaded_packages(ENTRY_MODULES, ENTRY_FORBIDDEN), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import unittest
+
+from lab2.src.alphabet import Alphabet
+from lab2.src.incremental import IncrementalSession
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+KEYS = (
+    (Mode.LINEAR, {"A": 2, "B": 5}),
+    (Mode.NON_LINEAR, {"A": 1, "B": 13, "C": 3}),
+    (Mode.PASSPHRASE, {"passphrase": "secret"}),
+)
+
+
+def random_edit(rng: random.Random, text: str) -> str:
+    """Replace, insert or delete a random span of text."""
+    start = rng.randrange(len(text) + 1)
+    end = min(len(text), start + rng.randrange(20))
+    insert = "".join(rng.choices("abcXYZ ,.", k=rng.randrange(20)))
+    if rng.random() < 0.3:
+        size = end - start
+        insert = insert[:size].ljust(size, "q")
+    return text[:start] + insert + text[end:]
+
+
+class TestIncrementalSession(unittest.TestCase):
+    def setUp(self):
+        """Setup a cipher and a sample document."""
+        self.cipher = TrithemiusCipher(Alphabet.EN)
+        self.text = "The quick brown fox jumps over the lazy dog. " * 500
+
+    def session(self, mode: Mode, key: dict) -> IncrementalSession:
+        """Create a session for a key."""
+        return IncrementalSession(
+            lambda chunk, offset: self.cipher.cipher(chunk, mode, offset, **key),
+            lambda chunk, offset: self.cipher.decipher(chunk, mode, offset, **key),
+            self.cipher.compile_key(mode, **key).period,
+        )
+
+    def test_edits_match_full_encryption(self):
+        """Test random edits against a full re-encryption in every mode."""
+        for mode, key in KEYS:
+            with self.subTest(mode=mode):
+                rng = random.Random(0)
+                session = self.session(mode, key)
+                text = self.text
+                for _ in range(100):
+                    text = random_edit(rng, text)
+                    expected = self.cipher.cipher(text, mode, **key)
+                    self.assertEqual(session.encrypt(text), expected)
+                self.assertTrue(session.verify())
+
+    def test_tail_reuse(self):
+        """Test that the tail is only reused when it moves by whole periods."""
+        mode, key = Mode.PASSPHRASE, {"passphrase": "secret"}
+        session = self.session(mode, key)
+        session.encrypt(self.text)
+        # Inserting one period keeps the tail aligned with the key.
+        session.encrypt(self.text[:100] + "abcdef" + self.text[100:])
+        self.assertEqual(session.reprocessed, 6)
+        # Deleting one character shifts the tail, which is shifted again.
+        edited = self.text[:100] + self.text[101:]
+        session.encrypt(edited)
+        self.assertEqual(session.reprocessed, len(edited) - 100)
+        self.assertTrue(session.verify())
+
+    def test_decrypt_and_max_span(self):
+        """Test ciphertext edits and the reprocessing limit."""
+        mode, key = Mode.LINEAR, {"A": 2, "B": 5}
+        session = self.session(mode, key)
+        ciphertext = self.cipher.cipher(self.text, mode, **key)
+        session.reset(self.text, ciphertext)
+        self.assertIsNone(session.decrypt("x" + ciphertext, 100))
+        self.assertEqual(session.ciphertext, ciphertext)
+        edited = ciphertext[:-5] + "QQQQQ"
+        self.assertEqual(
+            session.decrypt(edited, 100), self.cipher.decipher(edited, mode, **key)
+        )
+        self.assertEqual(session.reprocessed, 5)
+        self.assertTrue(session.verify())
@@ -0,0 +1,62 @@
+import io
+import json
+import unittest
+
+from lab2.src import instrumentation
+from lab2.src.alphabet import Alphabet
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.cipher = TrithemiusCipher(Alphabet.EN)
+
+    def test_disabled_by_default(self):
+        """Test that nothing is recorded outside an instrument block."""
+        self.assertIs(instrumentation.stage("shift"), instrumentation.stage("io"))
+        with instrumentation.instrument() as metrics:
+            pass
+        self.cipher.cipher("Hello", Mode.LINEAR, A=1, B=2)
+        self.assertEqual(metrics.counters, {})
+        self.assertEqual(metrics.stage_calls, {})
+
+    def test_records_stages_counters_and_caches(self):
+        """Test that cipher calls report their stages, characters and cache use."""
+        # An unusual key, so the first call is a schedule cache miss.
+        key = {"A": 3, "B": 1907}
+        with instrumentation.instrument() as metrics:
+            encrypted = self.cipher.cipher("Hello, World!", Mode.LINEAR, **key)
+            self.cipher.decipher(encrypted, Mode.LINEAR, **key)
+        self.assertEqual(metrics.counters["chars"], 26)
+        self.assertEqual(metrics.counters["k_values"], 52)
+        for stage in ("schedule", "lookup", "shift", "assemble"):
+            self.assertEqual(metrics.stage_calls[stage], 2)
+        self.assertEqual(metrics.caches["schedule"], (1, 1))
+        self.assertIn("shift_table", metrics.caches)
+
+    def test_stream_records_io(self):
+        """Test that streams report reads and writes as the io stage."""
+        writer = io.StringIO()
+        with instrumentation.instrument() as metrics:
+            self.cipher.encrypt_stream(
+                io.StringIO("abc" * 10), writer, Mode.LINEAR, 8, A=1, B=1
+            )
+        # Four reads with data, one empty read and four writes.
+        self.assertEqual(metrics.stage_calls["io"], 9)
+        self.assertEqual(metrics.counters["chars"], 30)
+
+    def test_exports(self):
+        """Test the JSON and Prometheus dumps."""
+        with instrumentation.instrument("trithemius") as metrics:
+            self.cipher.cipher("abc", Mode.PASSPHRASE, passphrase="key")
+        snapshot = json.loads(metrics.to_json())
+        self.assertEqual(snapshot["counters"]["chars"], 3)
+        self.assertEqual(snapshot["stages"]["shift"]["calls"], 1)
+        text = metrics.to_prometheus()
+        self.assertIn("# TYPE trithemius_cache_hit_ratio gauge\n", text)
+        self.assertIn('trithemius_stage_calls_total{stage="schedule"} 1\n', text)
+        self.assertIn('trithemius_events_total{event="chars"} 3\n', text)
+        for line in text.splitlines():
+            if not line.startswith("#"):
+                float(line.rsplit(" ", 1)[1])
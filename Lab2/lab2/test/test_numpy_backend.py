@@ -0,0 +1,63 @@
+import random
+import unittest
+from unittest import mock
+
+from lab2.src import numpy_backend
+from lab2.src.alphabet import Alphabet
+from lab2.src.backend import Backend
+from lab2.src.trithemius_cipher import Mode, TrithemiusCipher
+
+
+def random_key(rng: random.Random, mode: Mode, alphabet: Alphabet) -> dict:
+    """Generate random key arguments for the given mode."""
+    if mode == Mode.LINEAR:
+        return {"A": rng.randint(-500, 500), "B": rng.randint(-500, 500)}
+    if mode == Mode.NON_LINEAR:
+        return {
+            "A": rng.randint(-500, 500),
+            "B": rng.randint(-500, 500),
+            "C": rng.randint(-500, 500),
+        }
+    length = rng.randint(1, 12)
+    return {"passphrase": "".join(rng.choices(alphabet.value, k=length))}
+
+
+@unittest.skipUnless(numpy_backend.is_available(), "NumPy is not installed")
+class TestNumpyBackend(unittest.TestCase):
+    def test_parity_with_python_backend(self):
+        """Test that both backends agree on random texts, keys and modes."""
+        rng = random.Random(2023)
+        for _ in range(200):
+            alphabet = rng.choice(list(Alphabet))
+            mode = rng.choice(list(Mode))
+            kwargs = random_key(rng, mode, alphabet)
+            pool = Alphabet.EN.value + Alphabet.UK.value + " ,.!\n1ї€😀"
+            text = "".join(rng.choices(pool, k=rng.randint(0, 300)))
+            offset = rng.randint(0, 10_000)
+
+            python_cipher = TrithemiusCipher(alphabet, Backend.PYTHON)
+            numpy_cipher = TrithemiusCipher(alphabet, Backend.NUMPY)
+            encrypted = python_cipher.cipher(text, mode, offset, **kwargs)
+            self.assertEqual(
+                numpy_cipher.cipher(text, mode, offset, **kwargs), encrypted
+            )
+            decrypted = numpy_cipher.decipher(encrypted, mode, offset, **kwargs)
+            self.assertEqual(
+                decrypted, python_cipher.decipher(encrypted, mode, offset, **kwargs)
+            )
+            self.assertEqual(decrypted, text)
+
+    def test_foreign_passphrase_character(self):
+        """Test that a passphrase outside the alphabet is rejected."""
+        cipher = TrithemiusCipher(Alphabet.EN, Backend.NUMPY)
+        with self.assertRaises(ValueError):
+            cipher.cipher("HELLO", Mode.PASSPHRASE, passphrase="тест")
+
+
+class TestBackendFallback(unittest.TestCase):
+    def test_fallback_without_numpy(self):
+        """Test that the NUMPY backend falls back to Python without NumPy."""
+        cipher = TrithemiusCipher(Alphabet.EN, Backend.NUMPY)
+        expected = TrithemiusCipher(Alphabet.EN).cipher("HELLO", Mode.LINEAR, A=2, B=3)
+        with mock.patch.object(numpy_backend, "np", None):
+            self.assertEqual(cipher.cipher("HELLO", Mode.LINEAR, A=2, B=3), expected)
@@ -0,0 +1,58 @@
+import unittest
+
+from lab2.src.alphabet import Alphabet
+from lab2.src.mode import Mode
+from lab2.src.parallel import ParallelEngine
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+
+class TestParallelEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Setup an engine shared by the tests, with tiny segments."""
+        cls.engine = ParallelEngine(jobs=2, segment_chars=257)
+        cls.cipher = TrithemiusCipher(Alphabet.UK)
+        cls.text = "Привіт, Світе! Hello 😀 world.\n" * 100
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.close()
+
+    def test_segments(self):
+        """Test that segments cover the text in order."""
+        self.assertEqual(self.engine._segments(0), [])
+        segments = self.engine._segments(600)
+        self.assertEqual(segments, [(0, 257), (257, 514), (514, 600)])
+        self.assertEqual(ParallelEngine(jobs=4)._segments(10)[1], (3, 6))
+
+    def test_matches_serial(self):
+        """Test that every mode gives the serial result at any offset."""
+        keys = {
+            Mode.LINEAR: {"A": 3, "B": 5},
+            Mode.NON_LINEAR: {"A": 2, "B": 3, "C": 4},
+            Mode.PASSPHRASE: {"passphrase": "Ключ"},
+        }
+        for mode, key in keys.items():
+            for offset in (0, 11):
+                expected = self.cipher.cipher(self.text, mode, offset, **key)
+                encrypted = self.cipher.parallel_cipher(
+                    self.text, mode, self.engine, offset, **key
+                )
+                self.assertEqual(encrypted, expected, mode)
+                decrypted = self.cipher.parallel_decipher(
+                    encrypted, mode, self.engine, offset, **key
+                )
+                self.assertEqual(decrypted, self.text, mode)
+
+    def test_short_text(self):
+        """Test that texts of a single segment skip the pool."""
+        key = {"A": 1, "B": 1}
+        self.assertEqual(self.cipher.parallel_cipher("", Mode.LINEAR, **key), "")
+        self.assertEqual(
+            self.cipher.parallel_cipher("абв", Mode.LINEAR, ParallelEngine(1), **key),
+            self.cipher.cipher("абв", Mode.LINEAR, **key),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import asyncio
+import unittest
+
+from lab2.src.alphabet import Alphabet
+from lab2.src.mode import Mode
+from lab2.src.service import CipherService, HttpError, Job, parse_job
+from lab2.src.trithemius_cipher import TrithemiusCipher
+
+
+class TestService(unittest.TestCase):
+    def test_parse_job(self):
+        """Test parsing of valid and invalid requests."""
+        self.assertEqual(
+            parse_job("POST", "/encrypt?mode=LINEAR&A=2&B=3", b"HELLO"),
+            Job("encrypt", Alphabet.EN, Mode.LINEAR, {"A": 2, "B": 3}, "HELLO"),
+        )
+        self.assertEqual(
+            parse_job(
+                "POST", "/decrypt?mode=PASSPHRASE&passphrase=%D0%BA&alphabet=UK", b""
+            ),
+            Job("decrypt", Alphabet.UK, Mode.PASSPHRASE, {"passphrase": "к"}, ""),
+        )
+        for method, target, status in (
+            ("POST", "/encrypt?mode=NON_LINEAR&A=2&B=3", 400),
+            ("POST", "/encrypt?mode=LINEAR&A=x&B=3", 400),
+            ("POST", "/encrypt?mode=PASSPHRASE&passphrase=%D0%BA", 400),
+            ("GET", "/decrypt?mode=LINEAR&A=2&B=3", 405),
+            ("POST", "/other", 404),
+        ):
+            with self.subTest(target=target):
+                with self.assertRaises(HttpError) as context:
+                    parse_job(method, target, b"HELLO")
+                self.assertEqual(context.exception.status, status)
+
+    def test_chunked_request(self):
+        """Test a chunked request end to end over TCP."""
+
+        async def scenario() -> bytes:
+            service = CipherService(workers=1)
+            server_task = asyncio.create_task(service.serve(port=0))
+            while not service.servers:
+                await asyncio.sleep(0.01)
+            port = service.servers[0].sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(
+                b"POST /encrypt?mode=NON_LINEAR&A=2&B=3&C=4 HTTP/1.1\r\n"
+                b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+                b"7\r\nHELLO, \r\n6\r\nWORLD!\r\n0\r\n\r\n"
+            )
+            response = await reader.read()
+            writer.close()
+            server_task.cancel()
+            return response
+
+        response = asyncio.run(scenario())
+        expected = TrithemiusCipher(Alphabet.EN).cipher(
+            "HELLO, WORLD!", Mode.NON_LINEAR, A=2, B=3, C=4
+        )
+        self.assertTrue(response.startswith(b"HTTP/1.1 200 OK"))
+        self.assertTrue(response.endswith(b"\r\n\r\n" + expected.encode()))
@@ -1,6 +1,10 @@
+import io
+import pathlib
+import tempfile
 import unittest
 
 from lab2.src.alphabet import Alphabet
+from lab2.src.char_index import CharOffsetIndex
 from lab2.src.trithemius_cipher import Mode, TrithemiusCipher
 
 
@@ -16,6 +20,24 @@ class TestTrithemiusCipher(unittest.TestCase):
         self.assertTrue(self.cipher.validate_key(Mode.NON_LINEAR, A=2, B=3, C=4))
         self.assertFalse(self.cipher.validate_key(Mode.PASSPHRASE))
         self.assertTrue(self.cipher.validate_key(Mode.PASSPHRASE, passphrase="test"))
+        self.assertFalse(self.cipher.validate_key(Mode.LINEAR, A="2", B=3))
+        self.assertFalse(self.cipher.validate_key(Mode.PASSPHRASE, passphrase=""))
+
+    def test_key_errors(self):
+        """Test that every problem with the keys is explained."""
+        self.assertEqual(self.cipher.key_errors(Mode.LINEAR, A=2, B=3), [])
+        self.assertEqual(
+            self.cipher.key_errors(Mode.NON_LINEAR, A="x", C=True),
+            [
+                "A must be an integer, not 'x'",
+                "B is missing",
+                "C must be an integer, not True",
+            ],
+        )
+        self.assertEqual(
+            self.cipher.key_errors(Mode.PASSPHRASE, passphrase="ключ"),
+            ["passphrase has 4 characters outside the alphabet"],
+        )
 
     def test_cipher_decipher_linear(self):
         """Test encryption and decryption in LINEAR mode."""
@@ -37,3 +59,165 @@ class TestTrithemiusCipher(unittest.TestCase):
         encrypted = self.cipher.cipher(text, Mode.PASSPHRASE, passphrase="test")
         decrypted = self.cipher.decipher(encrypted, Mode.PASSPHRASE, passphrase="test")
         self.assertEqual(text, decrypted)
+
+    def test_encrypt_decrypt_stream(self):
+        """Test that the position offset carries across chunk boundaries."""
+        text = "HELLO, WORLD! " * 50
+        for mode, kwargs in (
+            (Mode.LINEAR, {"A": 2, "B": 3}),
+            (Mode.NON_LINEAR, {"A": 2, "B": 3, "C": 4}),
+            (Mode.PASSPHRASE, {"passphrase": "test"}),
+        ):
+            with self.subTest(mode=mode):
+                encrypted = io.StringIO()
+                self.cipher.encrypt_stream(
+                    io.StringIO(text), encrypted, mode, chunk_size=7, **kwargs
+                )
+                self.assertEqual(
+                    encrypted.getvalue(), self.cipher.cipher(text, mode, **kwargs)
+                )
+                decrypted = io.StringIO()
+                self.cipher.decrypt_stream(
+                    io.StringIO(encrypted.getvalue()),
+                    decrypted,
+                    mode,
+                    chunk_size=7,
+                    **kwargs,
+                )
+                self.assertEqual(decrypted.getvalue(), text)
+
+    def test_stream_rejects_empty_chunks(self):
+        """Test that chunk sizes below one are rejected instead of reading nothing."""
+        for chunk_size in (0, -1):
+            for stream in (self.cipher.encrypt_stream, self.cipher.decrypt_stream):
+                with self.subTest(stream=stream.__name__, chunk_size=chunk_size):
+                    with self.assertRaises(ValueError):
+                        stream(
+                            io.StringIO("Hello"),
+                            io.StringIO(),
+                            Mode.LINEAR,
+                            chunk_size=chunk_size,
+                            A=2,
+                            B=3,
+                        )
+
+    def test_decipher_range(self):
+        """Test decrypting a window of a text and of a UTF-8 file."""
+        text = "HELLO, WORLD! " * 50
+        kwargs = {"A": 2, "B": 3}
+        encrypted = self.cipher.cipher(text, Mode.LINEAR, **kwargs)
+        self.assertEqual(
+            self.cipher.decipher_range(encrypted, 100, 30, Mode.LINEAR, **kwargs),
+            text[100:130],
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "encrypted.txt")
+            path.write_text(encrypted, encoding="utf-8")
+            self.assertEqual(
+                self.cipher.decipher_range(path, 500, 30, Mode.LINEAR, **kwargs),
+                text[500:530],
+            )
+            # A str is the ciphertext even when it names an existing file.
+            name = str(path)
+            self.assertEqual(
+                self.cipher.decipher_range(name, 2, 5, Mode.LINEAR, **kwargs),
+                self.cipher.decipher(name, Mode.LINEAR, **kwargs)[2:7],
+            )
+        with self.assertRaises(TypeError):
+            self.cipher.decipher_range(b"HELLO", 0, 2, Mode.LINEAR, **kwargs)
+
+    def test_decipher_range_rejects_negative_windows(self):
+        """Test that negative starts and lengths are rejected for every source."""
+        kwargs = {"A": 2, "B": 3}
+        encrypted = self.cipher.cipher("HELLO, WORLD! " * 50, Mode.LINEAR, **kwargs)
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "encrypted.txt")
+            path.write_text(encrypted, encoding="utf-8")
+            for source in (encrypted, path, CharOffsetIndex(path, block_size=64)):
+                for start, length in ((-4, 4), (-1, 0), (10, -1)):
+                    with self.subTest(
+                        source=type(source).__name__, start=start, length=length
+                    ):
+                        with self.assertRaises(ValueError):
+                            self.cipher.decipher_range(
+                                source, start, length, Mode.LINEAR, **kwargs
+                            )
+
+    def test_compile_key(self):
+        """Test that schedules have one period of shifts and are cached."""
+        schedule = self.cipher.compile_key(Mode.LINEAR, A=4, B=3)
+        self.assertEqual(schedule.period, 13)
+        self.assertEqual(list(schedule.shifts[:3]), [3, 7, 11])
+        self.assertIs(schedule, self.cipher.compile_key(Mode.LINEAR, A=4, B=3))
+        self.assertEqual(
+            self.cipher.compile_key(Mode.NON_LINEAR, A=9, B=0, C=1).period, 1
+        )
+        self.assertEqual(
+            self.cipher.compile_key(Mode.PASSPHRASE, passphrase="key").period, 3
+        )
+        with self.assertRaises(ValueError):
+            self.cipher.compile_key(Mode.PASSPHRASE, passphrase="")
+
+    def test_schedule_matches_calculate_k(self):
+        """Test that compiled schedules shift exactly like k(p) at any offset."""
+        text = "Hello, Wörld! 😀 \ud800 " * 20
+        index, chars = Alphabet.EN.lookup.index, Alphabet.EN.lookup.chars
+        for mode, kwargs in (
+            (Mode.LINEAR, {"A": -7, "B": 100}),
+            (Mode.NON_LINEAR, {"A": 3, "B": 26, "C": -1}),
+            (Mode.PASSPHRASE, {"passphrase": "Secret"}),
+        ):
+            for offset in (0, 5, 1000):
+                with self.subTest(mode=mode, offset=offset):
+                    expected = []
+                    for position, char in enumerate(text, offset):
+                        if char in index:
+                            k = self.cipher._calculate_k(mode, position, **kwargs)
+                            char = chars[(index[char] + k) % len(chars)]
+                        expected.append(char)
+                    encrypted = self.cipher.cipher(text, mode, offset, **kwargs)
+                    self.assertEqual(encrypted, "".join(expected))
+                    self.assertEqual(
+                        self.cipher.decipher(encrypted, mode, offset, **kwargs), text
+                    )
+
+    def test_encrypt_decrypt_file(self):
+        """Test the mmap byte path against the text cipher in single-byte encodings."""
+        text = "Привіт, Світе! ґҐ яя 123\n" * 100
+        cipher = TrithemiusCipher(Alphabet.UK)
+        with tempfile.TemporaryDirectory() as directory:
+            plain = pathlib.Path(directory, "plain.txt")
+            encrypted = pathlib.Path(directory, "encrypted.txt")
+            decrypted = pathlib.Path(directory, "decrypted.txt")
+            for encoding, mode, kwargs in (
+                ("cp1251", Mode.LINEAR, {"A": 5, "B": 2}),
+                ("koi8-u", Mode.NON_LINEAR, {"A": 2, "B": 3, "C": 4}),
+                ("cp1251", Mode.PASSPHRASE, {"passphrase": "Ключ"}),
+            ):
+                with self.subTest(encoding=encoding, mode=mode):
+                    plain.write_bytes(text.encode(encoding))
+                    cipher.encrypt_file(plain, encrypted, mode, encoding, **kwargs)
+                    self.assertEqual(
+                        encrypted.read_bytes().decode(encoding),
+                        cipher.cipher(text, mode, **kwargs),
+                    )
+                    cipher.decrypt_file(encrypted, decrypted, mode, encoding, **kwargs)
+                    self.assertEqual(decrypted.read_bytes(), plain.read_bytes())
+
+    def test_encrypt_decrypt_file_in_place(self):
+        """Test that a file can be encrypted and decrypted onto itself."""
+        text = "Hello, World! " * 100
+        cipher = TrithemiusCipher(Alphabet.EN)
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "text.txt")
+            path.write_bytes(text.encode("latin-1"))
+            count = cipher.encrypt_file(path, path, Mode.LINEAR, "latin-1", A=2, B=5)
+            self.assertEqual(count, len(text))
+            self.assertEqual(
+                path.read_bytes().decode("latin-1"),
+                cipher.cipher(text, Mode.LINEAR, A=2, B=5),
+            )
+            count = cipher.decrypt_file(path, path, Mode.LINEAR, "latin-1", A=2, B=5)
+            self.assertEqual(count, len(text))
+            self.assertEqual(path.read_bytes().decode("latin-1"), text)
+            self.assertEqual(sorted(pathlib.Path(directory).iterdir()), [path])
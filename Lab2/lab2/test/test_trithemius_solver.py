@@ -0,0 +1,83 @@
+import io
+import random
+import unittest
+
+from lab2.src.alphabet import Alphabet
+from lab2.src.trithemius_cipher import Mode, TrithemiusCipher
+from lab2.src.trithemius_solver import TrithemiusSolver
+
+WORDS = (
+    "it was the best of times worst age wisdom foolishness epoch belief "
+    "incredulity season Light Darkness spring hope winter despair we had "
+    "everything before us nothing"
+).split()
+
+
+class TestTrithemiusSolver(unittest.TestCase):
+    def setUp(self):
+        """Setup a cipher, a solver and a sample text for testing."""
+        self.cipher = TrithemiusCipher(Alphabet.EN)
+        self.solver = TrithemiusSolver(Alphabet.EN)
+        self.text = " ".join(random.Random(0).choices(WORDS, k=600))
+
+    def test_recover_keys(self):
+        """Test that a short fragment recovers keys that decrypt everything."""
+        rng = random.Random(1)
+        for mode, key in (
+            (Mode.LINEAR, {"A": 123, "B": -45}),
+            (Mode.NON_LINEAR, {"A": 7, "B": 31, "C": 5}),
+        ):
+            with self.subTest(mode=mode):
+                encrypted = self.cipher.cipher(self.text, mode, **key)
+                offset = rng.randrange(len(self.text) - 20)
+                end = offset + 20
+                keys = self.solver.recover_keys(
+                    self.text[offset:end], encrypted[offset:end], mode, offset
+                )
+                self.assertEqual(len(keys), 1)
+                self.assertEqual(
+                    self.cipher.decipher(encrypted, mode, **keys[0]), self.text
+                )
+
+    def test_recover_keys_matches_brute_force(self):
+        """Test that the analytic solution agrees with an exhaustive search."""
+        encrypted = self.cipher.cipher(self.text, Mode.LINEAR, A=26, B=3)
+        for end in (1, 2, 4, 12):
+            with self.subTest(end=end):
+                self.assertEqual(
+                    self.solver.recover_keys(
+                        self.text[:end], encrypted[:end], Mode.LINEAR
+                    ),
+                    self.solver.brute_force_keys(
+                        self.text[:end], encrypted[:end], Mode.LINEAR
+                    ),
+                )
+
+    def test_recover_keys_rejects_changed_symbols(self):
+        """Test that a fragment with altered non-alphabet characters has no key."""
+        self.assertEqual(self.solver.recover_keys("a b", "a-b", Mode.LINEAR), [])
+        with self.assertRaises(ValueError):
+            self.solver.recover_keys("a", "b", Mode.PASSPHRASE)
+
+    def test_find_crib(self):
+        """Test that a guessed word locates itself and the key."""
+        encrypted = self.cipher.cipher(self.text, Mode.LINEAR, A=5, B=8)
+        offset = self.text.index("incredulity")
+        matches = self.solver.find_crib(encrypted, "incredulity", Mode.LINEAR)
+        self.assertIn((offset, {"A": 5, "B": 8}), matches)
+
+    def test_estimate_period(self):
+        """Test that the passphrase length is found in one streaming pass."""
+        for passphrase in ("Q", "key", "Secret", "Longpassword"):
+            with self.subTest(passphrase=passphrase):
+                encrypted = self.cipher.cipher(
+                    self.text, Mode.PASSPHRASE, passphrase=passphrase
+                )
+                estimate = self.solver.estimate_period(
+                    io.StringIO(encrypted), chunk_size=100
+                )
+                self.assertEqual(estimate.period, len(passphrase))
+
+
+if __name__ == "__main__":
+    unittest.main()
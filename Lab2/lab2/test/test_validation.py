@@ -0,0 +1,107 @@
+import io
+import random
+import unittest
+from collections import Counter
+
+from lab2.src import numpy_backend, validation
+from lab2.src.alphabet import EN_DIGITS, Alphabet
+from lab2.src.backend import Backend
+from lab2.src.mode import Mode
+from lab2.src.trithemius_cipher import TrithemiusCipher
+from lab2.src.validation import validate_stream, validate_text
+
+
+def expected_report(alphabet, text: str) -> tuple:
+    """Classify a text character by character."""
+    members = alphabet.lookup.members
+    counts = Counter(text)
+    return (
+        sum(count for char, count in counts.items() if char in members),
+        {
+            char: count
+            for char, count in counts.items()
+            if char.isalpha() and char not in members
+        },
+        tuple(sorted({validation._script(char) for char in counts if char.isalpha()})),
+        bytes(char in members for char in text),
+    )
+
+
+class TestValidation(unittest.TestCase):
+    def test_report(self):
+        """Test coverage, foreign letters and mixed scripts."""
+        report = validate_text(Alphabet.UK, "Київ, Kyiv!")
+        self.assertEqual(report.length, 11)
+        self.assertEqual(report.letters, 3)
+        self.assertEqual(report.foreign, {"ї": 1, "K": 1, "y": 1, "i": 1, "v": 1})
+        self.assertEqual(report.scripts, ("CYRILLIC", "LATIN"))
+        self.assertEqual(report.mask, b"\x01\x01\x00\x01\x00\x00\x00\x00\x00\x00\x00")
+        self.assertTrue(report.mixed_scripts)
+        self.assertFalse(report.ok)
+        self.assertIn("Letters mix scripts: CYRILLIC, LATIN", report.summary())
+
+        report = validate_text(Alphabet.EN, "Hello, World! 123")
+        self.assertTrue(report.ok)
+        self.assertAlmostEqual(report.coverage, 10 / 17)
+        self.assertEqual(validate_text(Alphabet.EN, "").coverage, 1.0)
+
+    def test_random_texts(self):
+        """Test every coding path against a character by character check."""
+        rng = random.Random(24)
+        pools = (
+            "Hello, World! é123",
+            "Привіт, світ — «так» Hi",
+            "a\0b😀c",
+            "￾ x" + "".join(map(chr, range(0x4E00, 0x4F2C))),
+        )
+        for _ in range(300):
+            text = "".join(rng.choices(rng.choice(pools), k=rng.randint(0, 80)))
+            for alphabet in (Alphabet.EN, Alphabet.UK, EN_DIGITS):
+                with self.subTest(text=text, alphabet=alphabet.name):
+                    letters, foreign, scripts, mask = expected_report(alphabet, text)
+                    report = validate_text(alphabet, text)
+                    self.assertEqual(report.letters, letters)
+                    self.assertEqual(report.foreign, foreign)
+                    self.assertEqual(report.scripts, scripts)
+                    self.assertEqual(report.mask, mask)
+                    streamed = validate_stream(alphabet, io.StringIO(text), 7)
+                    self.assertEqual(streamed.length, len(text))
+                    self.assertEqual(streamed.letters, letters)
+                    self.assertEqual(streamed.foreign, foreign)
+                    self.assertEqual(streamed.scripts, scripts)
+                    self.assertIsNone(streamed.mask)
+
+    def test_new_symbols_across_slices(self):
+        """Test that the charmap grows when later slices bring new characters."""
+        slice_chars = validation._SLICE_CHARS
+        text = "Привіт " * (slice_chars // 7) + "Ωмега ∑ ≈ 😀"
+        report = validate_text(Alphabet.UK, text)
+        letters, foreign, scripts, mask = expected_report(Alphabet.UK, text)
+        self.assertEqual(
+            (report.letters, report.foreign, report.scripts, report.mask),
+            (letters, foreign, scripts, mask),
+        )
+
+    @unittest.skipUnless(numpy_backend.is_available(), "NumPy is not installed")
+    def test_mask_in_numpy_backend(self):
+        """Test that the NumPy backend gives the same result with the mask."""
+        text = "Київ — столиця України. Kyiv!\n" * 20
+        report = validate_text(Alphabet.UK, text)
+        cipher = TrithemiusCipher(Alphabet.UK, Backend.NUMPY)
+        for mode, key in (
+            (Mode.LINEAR, {"A": 3, "B": 5}),
+            (Mode.PASSPHRASE, {"passphrase": "Ключ"}),
+        ):
+            encrypted = cipher.cipher(text, mode, 4, **key)
+            self.assertEqual(cipher.cipher(text, mode, 4, report, **key), encrypted)
+            self.assertEqual(cipher.decipher(encrypted, mode, 4, report, **key), text)
+        with self.assertRaises(ValueError):
+            cipher.cipher(
+                text, Mode.LINEAR, 0, validate_text(Alphabet.EN, text), A=1, B=2
+            )
+        with self.assertRaises(ValueError):
+            cipher.cipher(text[1:], Mode.LINEAR, 0, report, A=1, B=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import argparse
+import random
+import time
+from typing import Callable
+
+from main import VerseCipher, VerseKey
+
+VERSE = (
+    'Shall I compare thee to a summers day Thou art more lovely and more '
+    'temperate Rough winds do shake the darling buds of May'
+)
+
+
+def legacy_decrypt(verse_key: VerseKey, cipher_text: str) -> str:
+    """Reference copy of the original table-scanning decryption."""
+    decrypted = []
+    for part in cipher_text.split(', '):
+        if '/' in part:
+            row, col = map(int, part.split('/'))
+            for char, positions in verse_key.key_table.items():
+                if (row, col) in positions:
+                    decrypted.append(char)
+                    break
+        else:
+            decrypted.append(part)
+    return ''.join(decrypted)
+
+
+def make_message(verse_key: VerseKey, size: int, seed: int = 0) -> str:
+    """Generate a reproducible message of keyed characters and spaces."""
+    rng = random.Random(seed)
+    pool = ''.join(verse_key.key_table) + ' '
+    return ''.join(rng.choices(pool, k=size))
+
+
+def measure(func: Callable[[], str]) -> float:
+    """Run func once and return the elapsed seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Verse cipher decryption timing')
+    parser.add_argument(
+        '--size', type=int, default=10 * 1024**2, help='message characters'
+    )
+    parser.add_argument(
+        '--skip-legacy', action='store_true', help='time only the reverse index'
+    )
+    args = parser.parse_args()
+
+    cipher = VerseCipher(VerseKey(VERSE))
+    message = make_message(cipher.verse_key, args.size)
+    cipher_text = cipher.encrypt(message)
+
+    indexed = measure(lambda: cipher.decrypt(cipher_text))
+    print(f'reverse index: {indexed:.3f}s ({args.size / indexed / 1e6:.2f} Mchar/s)')
+    if not args.skip_legacy:
+        legacy = measure(lambda: legacy_decrypt(cipher.verse_key, cipher_text))
+        print(f'table scan:    {legacy:.3f}s ({args.size / legacy / 1e6:.2f} Mchar/s)')
+        print(f'speedup:       {legacy / indexed:.1f}x')
+        if legacy_decrypt(cipher.verse_key, cipher_text) != cipher.decrypt(cipher_text):
+            raise SystemExit('Reverse index output differs from the table scan')
+
+
+if __name__ == '__main__':
+    main()
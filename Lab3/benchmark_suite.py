@@ -0,0 +1,162 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from functools import partial
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from benchmark import VERSE
+from main import VerseCipher, VerseKey
+
+VERSES = {
+    'EN': VERSE,
+    'UK': (
+        'Реве та стогне Дніпр широкий сердитий вітер завива додолу верби гне '
+        'високі горами хвилю підійма'
+    ),
+}
+SIZES = {'1KB': 1024, '64KB': 64 * 1024, '1MB': 1024**2}
+MIXES = ('keyed', 'prose')
+DEFAULT_MAX_REGRESSION = 10.0
+
+
+class Case(NamedTuple):
+    """A single benchmark case."""
+
+    name: str
+    func: Callable[[], object]
+    size: int
+
+
+def make_text(verse_key: VerseKey, mix: str, size: int, seed: int = 0) -> str:
+    """Generate reproducible text of keyed characters or mixed prose."""
+    keyed = ''.join(verse_key.key_table)
+    pools = {'keyed': keyed + ' ', 'prose': keyed + ' ' * 10 + '.,;!?\n0123456789'}
+    rng = random.Random(seed)
+    return ''.join(rng.choices(pools[mix], k=size))
+
+
+def build_cases(sizes: List[str]) -> List[Case]:
+    """Build every benchmark case."""
+    cases = []
+    for language, verse in VERSES.items():
+        cipher = VerseCipher(VerseKey(verse), seed=0)
+        for mix in MIXES:
+            for label in sizes:
+                text = make_text(cipher.verse_key, mix, SIZES[label])
+                size = len(text.encode('utf-8'))
+                for fmt, binary in (('text', False), ('binary', True)):
+                    encrypted = cipher.encrypt(text, binary)
+                    prefix = f'verse/{language}/{fmt}/{mix}/{label}'
+                    encrypt = partial(cipher.encrypt, text, binary)
+                    decrypt = partial(cipher.decrypt, encrypted)
+                    cases.append(Case(f'{prefix}/encrypt', encrypt, size))
+                    cases.append(Case(f'{prefix}/decrypt', decrypt, size))
+    return cases
+
+
+def run_case(case: Case, min_time: float, repeat: int) -> Dict[str, float]:
+    """Time a case, keeping the best of repeat runs, and measure peak memory.
+
+    Each timed run loops the case until it takes at least min_time. Peak
+    memory is measured in a separate traced call so tracing does not distort
+    the timings.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            case.func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            case.func()
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    tracemalloc.start()
+    case.func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'ops_per_sec': 1 / best,
+        'mb_per_sec': case.size / best / 1024**2,
+        'peak_memory': peak,
+    }
+
+
+def find_regressions(
+    results: Dict[str, dict], baseline: Dict[str, dict], max_regression: float
+) -> List[str]:
+    """Describe every case that is more than max_regression percent slower."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]['ops_per_sec']
+        slowdown = (1 - result['ops_per_sec'] / expected) * 100
+        if slowdown > max_regression:
+            regressions.append(f'{name}: {slowdown:.1f}% slower than baseline')
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Benchmark the verse cipher and gate on a saved baseline'
+    )
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('-k', '--filter', default='', help='run cases containing this')
+    parser.add_argument('--min-time', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', help='fail on regressions against this baseline')
+    parser.add_argument(
+        '--max-regression',
+        type=float,
+        default=DEFAULT_MAX_REGRESSION,
+        help='allowed slowdown in percent',
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'case':<40} {'ops/s':>12} {'MB/s':>10} {'peak KB':>10}")
+    for case in build_cases(args.sizes):
+        if args.filter not in case.name:
+            continue
+        result = results[case.name] = run_case(case, args.min_time, args.repeat)
+        print(
+            f"{case.name:<40} {result['ops_per_sec']:12.1f} "
+            f"{result['mb_per_sec']:10.2f} {result['peak_memory'] / 1024:10.1f}"
+        )
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'python': sys.version,
+                    'platform': platform.platform(),
+                    'results': results,
+                },
+                file,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+        regressions = find_regressions(results, baseline, args.max_regression)
+        if regressions:
+            print('\n'.join(regressions), file=sys.stderr)
+            raise SystemExit(1)
+        print(f'No case is more than {args.max_regression}% slower than the baseline')
+
+
+if __name__ == '__main__':
+    main()
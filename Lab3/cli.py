@@ -0,0 +1,298 @@
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Union
+
+from cache import DEFAULT_MAX_BYTES, ResultCache, file_digest
+from container import read_container, write_container
+from main import VerseCipher, VerseKey
+
+CONTAINER_SUFFIX = '.sslc'
+
+
+class FileJob(NamedTuple):
+    """A single file to be processed by a worker."""
+
+    source: Path
+    target: Path
+    verse: str
+    size: int
+    decrypt: bool
+    binary: bool
+    container: bool = False
+    cols: Optional[int] = None
+    key_index: Optional[Path] = None
+    cache: Optional[Path] = None
+    cache_size: int = DEFAULT_MAX_BYTES
+    cache_key: Optional[Path] = None
+
+
+class FileResult(NamedTuple):
+    """Outcome of a processed file."""
+
+    source: Path
+    size: int
+    seconds: float
+    cached: Optional[bool] = None
+
+
+def collect_files(pattern: str) -> List[Path]:
+    """Expand a directory or glob pattern into a sorted list of files."""
+    if os.path.isdir(pattern):
+        return sorted(path for path in Path(pattern).rglob('*') if path.is_file())
+    return sorted(
+        Path(path) for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)
+    )
+
+
+def process_file(job: FileJob) -> FileResult:
+    """Encrypt or decrypt one file, replacing the target atomically.
+
+    With a cache, the encrypted output is copied from it when the same file
+    was encrypted with the same settings. Decrypted outputs are never cached.
+    """
+    start = time.perf_counter()
+    job.target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=job.target.parent, prefix='.tmp-')
+    cached = None
+    try:
+        if job.cache is None or job.decrypt:
+            _process(job, fd, temp_path)
+        else:
+            with ResultCache(job.cache, job.cache_size, job.cache_key) as cache:
+                cached = _process_cached(job, fd, temp_path, cache)
+        shutil.copymode(job.source, temp_path)
+        os.replace(temp_path, job.target)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return FileResult(
+        job.source, job.source.stat().st_size, time.perf_counter() - start, cached
+    )
+
+
+def _process(job: FileJob, fd: int, temp_path: str) -> None:
+    """Encrypt or decrypt one file into the open temporary file, closing it."""
+    if job.container:
+        os.close(fd)
+        _process_container(job, temp_path)
+    else:
+        result = _process_whole(job)
+        with open(fd, 'wb') as writer:
+            writer.write(
+                result if isinstance(result, bytes) else result.encode('utf-8')
+            )
+
+
+def _process_cached(
+    job: FileJob, fd: int, temp_path: str, cache: ResultCache
+) -> bool:
+    """Copy the encrypted output of one file from the cache, or encrypt and store it.
+
+    Returns True if the output came from the cache.
+    """
+    key = cache.key(
+        file_digest(job.source),
+        cipher='verse',
+        verse=job.verse,
+        size=job.size,
+        cols=job.cols,
+        decrypt=job.decrypt,
+        binary=job.binary,
+        container=job.container,
+    )
+    with open(fd, 'wb', closefd=False) as writer:
+        cached = cache.get_file(key, writer)
+    if cached:
+        os.close(fd)
+        return True
+    _process(job, fd, temp_path)
+    cache.put_file(key, temp_path)
+    return False
+
+
+@lru_cache(maxsize=1)
+def _job_key(
+    verse: str, size: int, cols: Optional[int], key_index: Optional[Path]
+) -> VerseKey:
+    """Load or build the key once per worker process, not once per file."""
+    if key_index is not None:
+        return VerseKey.load(key_index)
+    return VerseKey(verse, size, cols)
+
+
+def _process_whole(job: FileJob) -> Union[str, bytes]:
+    """Encrypt or decrypt a whole file in memory."""
+    cipher = VerseCipher(_job_key(job.verse, job.size, job.cols, job.key_index))
+    if job.decrypt:
+        data = job.source.read_bytes()
+        return cipher.decrypt(data if job.binary else data.decode('utf-8'))
+    with open(job.source, 'r', encoding='utf-8', newline='') as reader:
+        return cipher.encrypt(reader.read(), job.binary)
+
+
+def _process_container(job: FileJob, temp_path: str) -> None:
+    """Stream a file into or out of a block container."""
+    if job.decrypt:
+        with open(temp_path, 'w', encoding='utf-8', newline='') as writer:
+            read_container(job.source, writer, job.verse)
+    else:
+        with open(job.source, 'r', encoding='utf-8', newline='') as reader:
+            verse_key = _job_key(job.verse, job.size, job.cols, job.key_index)
+            write_container(reader, temp_path, verse_key, job.binary)
+
+
+def _target(output_dir: Path, relative: Path, container: bool, decrypt: bool) -> Path:
+    """Return the output path, adding or removing the container suffix."""
+    if not container:
+        return output_dir / relative
+    if decrypt:
+        if relative.suffix == CONTAINER_SUFFIX:
+            relative = relative.with_suffix('')
+        return output_dir / relative
+    return output_dir / relative.with_name(relative.name + CONTAINER_SUFFIX)
+
+
+def _load_key(args: argparse.Namespace) -> VerseKey:
+    """Build the key from the verse options, or load it from the key index.
+
+    A key built from a verse is saved to the key index when one is given.
+    """
+    index = args.key_index
+    if args.verse is None and args.verse_file is None:
+        return VerseKey.load(index)
+    if args.verse_file is not None:
+        verse_key = VerseKey.from_file(args.verse_file, args.size, args.cols)
+    else:
+        verse_key = VerseKey(args.verse, args.size, args.cols)
+    if index is not None:
+        verse_key.save(index)
+    return verse_key
+
+
+def _throughput(size: int, seconds: float) -> float:
+    """Return throughput in MB/s."""
+    return size / 1024**2 / seconds if seconds else float('inf')
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m cli',
+        description='Encrypt or decrypt many files with the verse cipher.',
+    )
+    parser.add_argument('action', choices=['encrypt', 'decrypt'])
+    parser.add_argument('input', help='directory or glob pattern of input files')
+    parser.add_argument('-o', '--output-dir', required=True, type=Path)
+    verse_group = parser.add_mutually_exclusive_group()
+    verse_group.add_argument('-v', '--verse', help='verse used as the key')
+    verse_group.add_argument(
+        '-f', '--verse-file', type=Path, help='file holding the verse, e.g. a book'
+    )
+    parser.add_argument(
+        '-k',
+        '--key-index',
+        type=Path,
+        help='prebuilt key to load, or to save the key built from the verse to',
+    )
+    parser.add_argument('-s', '--size', type=int, default=10, help='key table rows')
+    parser.add_argument(
+        '--cols', type=int, help='key table columns (default: same as --size)'
+    )
+    parser.add_argument(
+        '-b', '--binary', action='store_true', help='use the compact binary format'
+    )
+    parser.add_argument(
+        '-c',
+        '--container',
+        action='store_true',
+        help='write or read framed block containers that survive interruptions',
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count(), help='worker processes'
+    )
+    parser.add_argument(
+        '--cache',
+        type=Path,
+        help='reuse the encrypted outputs stored in this SQLite file by earlier '
+        'runs for unchanged files and settings; decrypted outputs are never '
+        'cached and the verse is stored only as salted hashes',
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=DEFAULT_MAX_BYTES // 1024**2,
+        help='largest total size of the cached outputs in MiB',
+    )
+    parser.add_argument(
+        '--cache-key',
+        type=Path,
+        help='private file holding the salt of the cache keys, created if missing '
+        '(default: the cache path with .key appended)',
+    )
+    args = parser.parse_args(argv)
+
+    if args.verse is None and args.verse_file is None and args.key_index is None:
+        parser.error('one of --verse, --verse-file or --key-index is required')
+    if args.verse is None and args.verse_file is None and not args.key_index.exists():
+        parser.error(f'Key index {str(args.key_index)!r} does not exist')
+    try:
+        verse_key = _load_key(args)
+    except ValueError as error:
+        parser.error(str(error))
+    files = collect_files(args.input)
+    if not files:
+        parser.error(f'No files match {args.input!r}')
+
+    base = Path(os.path.commonpath([path.parent for path in files]))
+    jobs = [
+        FileJob(
+            path,
+            _target(
+                args.output_dir,
+                path.relative_to(base),
+                args.container,
+                args.action == 'decrypt',
+            ),
+            verse_key.verse,
+            verse_key.size,
+            args.action == 'decrypt',
+            args.binary,
+            args.container,
+            verse_key.cols,
+            args.key_index,
+            args.cache,
+            args.cache_size * 1024**2,
+            args.cache_key,
+        )
+        for path in files
+    ]
+
+    start = time.perf_counter()
+    total = hits = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        for result in executor.map(process_file, jobs):
+            total += result.size
+            hits += bool(result.cached)
+            print(
+                f'{result.source}: {result.size} bytes in {result.seconds:.3f}s '
+                f'({_throughput(result.size, result.seconds):.2f} MB/s)'
+            )
+    elapsed = time.perf_counter() - start
+    print(
+        f'Total: {len(jobs)} files, {total} bytes in {elapsed:.3f}s '
+        f'({_throughput(total, elapsed):.2f} MB/s)'
+    )
+    if args.cache is not None and args.action == 'decrypt':
+        print('Cache: not used, decrypted outputs are never cached')
+    elif args.cache is not None:
+        print(f'Cache: {hits} hits, {len(jobs) - hits} misses')
+
+
+if __name__ == '__main__':
+    main()
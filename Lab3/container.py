@@ -0,0 +1,271 @@
+import json
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import (
+    Any, BinaryIO, Callable, Deque, Iterable, Iterator, NamedTuple, Optional, TextIO,
+    Tuple, Union,
+)
+
+from main import VerseCipher, VerseKey
+
+MAGIC = b'SSLC'
+VERSION = 1
+DEFAULT_BLOCK_CHARS = 1024 * 1024
+CIPHER_NAME = 'verse'
+
+# magic, format version, length of the JSON header that follows
+_PREAMBLE = struct.Struct('<4sBI')
+# absolute offset of the first character, characters, payload bytes, CRC-32
+_FRAME = struct.Struct('<QIII')
+
+PathLike = Union[str, 'os.PathLike[str]']
+
+
+class ContainerError(ValueError):
+    """Raised when a file is not a valid or complete container."""
+
+
+class Header(NamedTuple):
+    """The non-secret settings a container was written with.
+
+    The verse is the key and is never stored; only the grid shape and the
+    token format are needed to read the blocks back. cols is None for
+    square grids, which keeps their headers as they were before it existed.
+    """
+
+    size: int
+    binary: bool
+    cipher: str = CIPHER_NAME
+    cols: Optional[int] = None
+
+    def to_bytes(self) -> bytes:
+        """Serialize the header with its preamble."""
+        body = json.dumps(self._asdict(), sort_keys=True).encode('utf-8')
+        return _PREAMBLE.pack(MAGIC, VERSION, len(body)) + body
+
+    @classmethod
+    def read(cls, reader: BinaryIO) -> 'Header':
+        """Read the header at the start of a container."""
+        preamble = reader.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ContainerError('Not a container: file is too short')
+        magic, version, length = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ContainerError('Not a container: bad magic number')
+        if version != VERSION:
+            raise ContainerError(f'Unsupported container version {version}')
+        try:
+            return cls(**json.loads(reader.read(length)))
+        except (TypeError, ValueError):
+            raise ContainerError('Not a container: malformed header') from None
+
+
+class Block(NamedTuple):
+    """One independently decodable block of a container."""
+
+    offset: int
+    chars: int
+    payload: bytes
+
+
+class ScanResult(NamedTuple):
+    """The header and the extent of the intact blocks of a container."""
+
+    header: Header
+    end: int
+    chars: int
+    complete: bool
+
+
+def write_block(writer: BinaryIO, offset: int, chars: int, payload: bytes) -> None:
+    """Append a block of cipher text for chars characters at offset."""
+    frame = _FRAME.pack(offset, chars, len(payload), zlib.crc32(payload))
+    writer.write(frame + payload)
+
+
+def write_end(writer: BinaryIO, chars: int) -> None:
+    """Append the end marker, an empty block after the last character."""
+    writer.write(_FRAME.pack(chars, 0, 0, 0))
+
+
+def iter_blocks(reader: BinaryIO) -> Iterator[Block]:
+    """Read the blocks following the header, up to the end marker.
+
+    A block cut short by an interrupted write ends the iteration quietly.
+    The end marker is yielded as a block of zero characters.
+
+    Raises:
+        ContainerError: If a block is corrupted or out of order.
+    """
+    expected = 0
+    while len(frame := reader.read(_FRAME.size)) == _FRAME.size:
+        offset, chars, length, checksum = _FRAME.unpack(frame)
+        if offset != expected:
+            raise ContainerError(f'Block at character {offset} is out of order')
+        payload = reader.read(length)
+        if len(payload) < length:
+            return
+        if zlib.crc32(payload) != checksum:
+            if not reader.read(1):
+                return
+            raise ContainerError(f'Block at character {offset} is corrupted')
+        yield Block(offset, chars, payload)
+        if not chars:
+            return
+        expected += chars
+
+
+def scan(path: PathLike) -> ScanResult:
+    """Find the intact part of a possibly interrupted container."""
+    with open(path, 'rb') as reader:
+        header = Header.read(reader)
+        end, chars, complete = reader.tell(), 0, False
+        for block in iter_blocks(reader):
+            end = reader.tell()
+            chars += block.chars
+            complete = not block.chars
+    return ScanResult(header, end, chars, complete)
+
+
+def parallel_map(
+    function: Callable[[Any], Any], items: Iterable[Any], jobs: Optional[int] = 1
+) -> Iterator[Any]:
+    """Apply a function to items on worker processes, yielding results in order.
+
+    Only a few items per worker are in flight at once, so large containers
+    are decoded in constant memory. jobs=None uses every CPU.
+    """
+    if jobs == 1:
+        yield from map(function, items)
+        return
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future] = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _skip(reader: TextIO, chars: int) -> None:
+    """Read and discard characters that are already in the container."""
+    while chars > 0:
+        chunk = reader.read(min(chars, DEFAULT_BLOCK_CHARS))
+        if not chunk:
+            raise ContainerError('Input is shorter than the partial container')
+        chars -= len(chunk)
+
+
+def write_container(
+    reader: TextIO,
+    target: PathLike,
+    verse_key: VerseKey,
+    binary: bool = True,
+    block_chars: int = DEFAULT_BLOCK_CHARS,
+    resume: bool = False,
+    seed: Optional[int] = None,
+) -> int:
+    """Encrypt a text stream into a container and return its character count.
+
+    Every block is a complete cipher text, so blocks decrypt independently.
+    With resume, an interrupted container at target is continued; the reader
+    must deliver the same text again.
+
+    Raises:
+        ContainerError: If the container to resume was written with other
+            settings or is already complete.
+    """
+    cipher = VerseCipher(verse_key, seed)
+    cols = None if verse_key.cols == verse_key.size else verse_key.cols
+    header = Header(verse_key.size, binary, cols=cols)
+    offset = 0
+    writer: BinaryIO
+    if resume and os.path.exists(target):
+        found = scan(target)
+        if found.header != header:
+            raise ContainerError('Container was written with other settings')
+        if found.complete:
+            raise ContainerError('Container is already complete')
+        _skip(reader, found.chars)
+        writer = open(target, 'r+b')
+        writer.truncate(found.end)
+        writer.seek(found.end)
+        offset = found.chars
+    else:
+        writer = open(target, 'wb')
+        writer.write(header.to_bytes())
+    with writer:
+        while chunk := reader.read(block_chars):
+            encrypted = cipher.encrypt(chunk, binary)
+            if isinstance(encrypted, str):
+                encrypted = encrypted.encode('utf-8')
+            write_block(writer, offset, len(chunk), encrypted)
+            offset += len(chunk)
+        write_end(writer, offset)
+    return offset
+
+
+@lru_cache(maxsize=1)
+def _block_key(verse: str, size: int, cols: Optional[int]) -> VerseKey:
+    """Build the key once per worker process rather than once per block."""
+    return VerseKey(verse, size, cols)
+
+
+def _decrypt_block(task: Tuple[str, int, Optional[int], bool, Block]) -> str:
+    """Decrypt one block on a worker process."""
+    verse, size, cols, binary, block = task
+    payload: Union[str, bytes] = (
+        block.payload if binary else block.payload.decode('utf-8')
+    )
+    text = VerseCipher(_block_key(verse, size, cols)).decrypt(payload)
+    if len(text) != block.chars:
+        raise ContainerError(
+            f'Block at character {block.offset} has a wrong length'
+        )
+    return text
+
+
+def read_container(
+    source: PathLike,
+    writer: TextIO,
+    verse: str,
+    jobs: Optional[int] = 1,
+    partial: bool = False,
+) -> int:
+    """Decrypt a container into a text stream, decoding blocks in parallel.
+
+    Returns the number of characters decrypted. With partial, the intact
+    blocks of an interrupted container are decrypted instead of failing.
+
+    Raises:
+        ContainerError: If the file is not a verse container, is corrupted,
+            or is incomplete and partial is False.
+        ValueError: If the verse does not match the cipher text.
+    """
+    with open(source, 'rb') as reader:
+        header = Header.read(reader)
+        if header.cipher != CIPHER_NAME:
+            raise ContainerError(f'Not a {CIPHER_NAME} container: {header.cipher}')
+        complete = False
+
+        def tasks() -> Iterator[Tuple[str, int, Optional[int], bool, Block]]:
+            nonlocal complete
+            for block in iter_blocks(reader):
+                if not block.chars:
+                    complete = True
+                    return
+                yield verse, header.size, header.cols, header.binary, block
+
+        chars = 0
+        for text in parallel_map(_decrypt_block, tasks(), jobs):
+            writer.write(text)
+            chars += len(text)
+    if not complete and not partial:
+        raise ContainerError(f'Container is incomplete after {chars} characters')
+    return chars
@@ -0,0 +1,130 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set
+
+# Importing the cipher must do no work and load neither the GUI, NumPy nor
+# process pools; the demo in main.py only runs as a script.
+CORE_MODULES = ('main',)
+ENTRY_MODULES = ('cli', 'container', 'service')
+CORE_FORBIDDEN = ('tkinter', 'numpy', 'asyncio', 'multiprocessing', 'concurrent')
+ENTRY_FORBIDDEN = ('tkinter', 'numpy')
+DEFAULT_MAX_REGRESSION = 25.0
+
+
+class ImportResult(NamedTuple):
+    '''The import cost of a module.'''
+
+    milliseconds: float
+    modules: FrozenSet[str]
+
+
+def measure_import(module: str, repeat: int) -> ImportResult:
+    '''
+    Import a module in fresh interpreters under `-X importtime`.
+
+    Args:
+        module (str): The module to import.
+        repeat (int): The number of interpreters to start; the fastest counts.
+
+    Returns:
+        ImportResult: The cumulative import time of the module and the names
+            of every module imported with it.
+    '''
+    best = float('inf')
+    modules: Set[str] = set()
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in completed.stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, cumulative, name = line.split('|')
+            name = name.strip()
+            modules.add(name)
+            if name == module and cumulative.strip().isdigit():
+                best = min(best, int(cumulative) / 1000)
+    return ImportResult(best, frozenset(modules))
+
+
+def forbidden_imports(result: ImportResult, forbidden: tuple[str, ...]) -> list[str]:
+    '''
+    Find the forbidden packages among the imported modules.
+
+    Args:
+        result (ImportResult): The measured import.
+        forbidden (tuple[str, ...]): Names of top-level packages.
+
+    Returns:
+        list[str]: The forbidden packages that were imported.
+    '''
+    packages = {name.partition('.')[0] for name in result.modules}
+    return [name for name in forbidden if name in packages]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m import_benchmark',
+        description='Measure import times and gate on forbidden imports.',
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', help='fail on regressions against this baseline')
+    parser.add_argument(
+        '--max-regression',
+        type=float,
+        default=DEFAULT_MAX_REGRESSION,
+        help='allowed slowdown in percent',
+    )
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    failures: List[str] = []
+    print(f'{"module":<32} {"ms":>8}  forbidden imports')
+    for modules, forbidden in (
+        (CORE_MODULES, CORE_FORBIDDEN),
+        (ENTRY_MODULES, ENTRY_FORBIDDEN),
+    ):
+        for module in modules:
+            result = measure_import(module, args.repeat)
+            results[module] = {'milliseconds': result.milliseconds}
+            loaded = forbidden_imports(result, forbidden)
+            names = ', '.join(loaded)
+            if loaded:
+                failures.append(f'{module} imports {names}')
+            print(f'{module:<32} {result.milliseconds:8.1f}  {names}')
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'python': sys.version,
+                    'platform': platform.platform(),
+                    'results': results,
+                },
+                file,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+        for module, timing in results.items():
+            if module not in baseline:
+                continue
+            expected = baseline[module]['milliseconds']
+            slowdown = (timing['milliseconds'] / expected - 1) * 100
+            if slowdown > args.max_regression:
+                failures.append(f'{module}: imports {slowdown:.1f}% slower')
+    if failures:
+        print('\n'.join(failures), file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+import json
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Tuple
+
+DEFAULT_NAMESPACE = 'lab3'
+
+# Returned by stage() while instrumentation is disabled.
+_DISABLED: AbstractContextManager = nullcontext()
+
+
+class CachedFunction(Protocol):
+    """A function wrapped by functools.lru_cache or functools.cache."""
+
+    def cache_info(self) -> Any:
+        ...
+
+
+class Metrics:
+    """Counters and per-stage timings collected inside an instrument() block.
+
+    Cache statistics are the hits and misses of every registered cache during
+    the block and are filled in when the block exits.
+    """
+
+    def __init__(self, namespace: str = DEFAULT_NAMESPACE):
+        self.namespace = namespace
+        self.counters: Dict[str, int] = {}
+        self.stage_calls: Dict[str, int] = {}
+        self.stage_seconds: Dict[str, float] = {}
+        self.caches: Dict[str, Tuple[int, int]] = {}
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one run of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self.stage_calls[name] = self.stage_calls.get(name, 0) + 1
+                self.stage_seconds[name] = (
+                    self.stage_seconds.get(name, 0.0) + seconds
+                )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summarize the metrics with chars/s and cache hit rates."""
+        with self._lock:
+            chars = self.counters.get('chars', 0)
+            caches = {}
+            for name, (hits, misses) in self.caches.items():
+                total = hits + misses
+                caches[name] = {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': hits / total if total else 0.0,
+                }
+            return {
+                'elapsed_seconds': self.elapsed,
+                'chars_per_second': chars / self.elapsed if self.elapsed else 0.0,
+                'counters': dict(self.counters),
+                'stages': {
+                    name: {'calls': calls, 'seconds': self.stage_seconds[name]}
+                    for name, calls in self.stage_calls.items()
+                },
+                'caches': caches,
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Dump the metrics as JSON."""
+        return json.dumps(self.snapshot(), indent=indent, sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        """Dump the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        stages = snapshot['stages']
+        caches = snapshot['caches']
+        families: List[Tuple[str, str, List[Tuple[str, float]]]] = [
+            ('stage_calls_total', 'counter', [
+                (_labels(stage=name), stats['calls'])
+                for name, stats in stages.items()
+            ]),
+            ('stage_seconds_total', 'counter', [
+                (_labels(stage=name), stats['seconds'])
+                for name, stats in stages.items()
+            ]),
+            ('events_total', 'counter', [
+                (_labels(event=name), value)
+                for name, value in snapshot['counters'].items()
+            ]),
+            ('cache_hits_total', 'counter', [
+                (_labels(cache=name), stats['hits'])
+                for name, stats in caches.items()
+            ]),
+            ('cache_misses_total', 'counter', [
+                (_labels(cache=name), stats['misses'])
+                for name, stats in caches.items()
+            ]),
+            ('cache_hit_ratio', 'gauge', [
+                (_labels(cache=name), stats['hit_rate'])
+                for name, stats in caches.items()
+            ]),
+            ('chars_per_second', 'gauge', [('', snapshot['chars_per_second'])]),
+            ('elapsed_seconds', 'gauge', [('', snapshot['elapsed_seconds'])]),
+        ]
+        lines = []
+        for name, kind, samples in families:
+            lines.append(f'# TYPE {self.namespace}_{name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{self.namespace}_{name}{labels} {value!r}')
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(**labels: str) -> str:
+    """Format Prometheus labels, escaping backslashes and quotes."""
+    pairs = []
+    for name, value in labels.items():
+        escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+_active: Optional[Metrics] = None
+_caches: Dict[str, CachedFunction] = {}
+
+
+def register_cache(name: str, function: CachedFunction) -> None:
+    """Report the hits and misses of an lru_cache function in every Metrics."""
+    _caches[name] = function
+
+
+def stage(name: str) -> AbstractContextManager:
+    """Time the enclosed block as a stage of the active metrics, if any."""
+    metrics = _active
+    if metrics is None:
+        return _DISABLED
+    return metrics.stage(name)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Add to a counter of the active metrics, if any."""
+    metrics = _active
+    if metrics is not None:
+        metrics.count(name, value)
+
+
+@contextmanager
+def instrument(namespace: str = DEFAULT_NAMESPACE) -> Iterator[Metrics]:
+    """Collect metrics from every cipher operation inside the block.
+
+    Instrumentation is process-wide and blocks can be nested; the inner block
+    collects alone. Work done in other processes is not recorded.
+    """
+    global _active
+    metrics = Metrics(namespace)
+    baseline = {name: function.cache_info() for name, function in _caches.items()}
+    previous, _active = _active, metrics
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.elapsed = time.perf_counter() - start
+        _active = previous
+        for name, function in _caches.items():
+            info = function.cache_info()
+            before = baseline.get(name)
+            hits, misses = info.hits, info.misses
+            if before is not None:
+                hits, misses = hits - before.hits, misses - before.misses
+            metrics.caches[name] = (hits, misses)
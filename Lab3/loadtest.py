@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Tuple
+
+
+async def open_connection(
+    args: argparse.Namespace,
+) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to the service over TCP or a Unix-domain socket."""
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def client(
+    args: argparse.Namespace, request: bytes, count: int, latencies: List[float]
+) -> None:
+    """Send requests one after another over a keep-alive connection."""
+    reader, writer = await open_connection(args)
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            status = head.split(b' ', 2)[1]
+            length = 0
+            for line in head.split(b'\r\n'):
+                name, _, value = line.partition(b':')
+                if name.strip().lower() == b'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            if status != b'200':
+                raise SystemExit(f'Request failed with status {status.decode()}')
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run(args: argparse.Namespace) -> None:
+    body = ('Shall I compare thee ' * (args.size // 21 + 1))[:args.size].encode('utf-8')
+    request = (
+        f'POST {args.path} HTTP/1.1\r\n'
+        'Host: localhost\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        '\r\n'
+    ).encode('latin-1') + body
+    latencies: List[float] = []
+
+    share, extra = divmod(args.requests, args.concurrency)
+    counts = [share + (index < extra) for index in range(args.concurrency)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, request, count, latencies) for count in counts))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f'requests: {len(latencies)} in {elapsed:.3f}s')
+    print(f'throughput: {len(latencies) / elapsed:.1f} req/s')
+    print(f'p50: {quantiles[49] * 1000:.2f} ms, p99: {quantiles[98] * 1000:.2f} ms')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Load test the cipher service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--unix', help='connect to a Unix-domain socket path')
+    parser.add_argument(
+        '--path', default='/encrypt?verse=Shall+I+compare+thee+to+a+summers+day'
+    )
+    parser.add_argument('-c', '--concurrency', type=int, default=16)
+    parser.add_argument('-n', '--requests', type=int, default=2000)
+    parser.add_argument('-s', '--size', type=int, default=1024, help='body chars')
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,70 +1,544 @@
-from typing import List, Tuple, Dict, Optional
+import os
+import random
+import struct
+import sys
+from array import array
+from collections import Counter
+from functools import cached_property
+from itertools import islice
+from typing import (
+    BinaryIO, Dict, FrozenSet, Iterable, Iterator, List, Literal, Mapping, NamedTuple,
+    Optional, Protocol, Tuple, TypeAlias, Union, cast, overload,
+)
+
+import instrumentation
+
+# In the binary format every (row, col) pair is packed into one byte as
+# (row - 1) << 4 | (col - 1). 0xFF is reserved to escape characters that have
+# no position in the key table, so grids of up to 15x15 fit.
+BINARY_ESCAPE = 0xFF
+MAX_BINARY_SIZE = 15
+
+# Key texts are read and split this many characters at a time, so a book used
+# as the key is only read up to the last word the grid holds.
+KEY_CHUNK_SIZE = 64 * 1024
+
+# A saved key: magic, version, rows, columns, distinct characters, positions
+# and verse length, then the verse, the grid, the characters, their position
+# counts and all positions, as little-endian 32-bit cells.
+INDEX_MAGIC = b'VKIX'
+INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct('<4sBIIIII')
+_CELL = 'I'
+_CELL_BYTES = array(_CELL).itemsize
+# An array of packed cells or code points; array is only generic to mypy.
+Cells: TypeAlias = 'array[int]'
+
+# The largest key table, 64 MiB of cells; larger grids are refused instead of
+# being allocated.
+MAX_GRID_CELLS = 16 * 1024**2
+
+# Grids with more cells than this format and parse 'row/col' tokens on demand
+# instead of building a dict entry for every cell.
+TOKEN_TABLE_CELLS = 4096
+
+
+class Homophones(Protocol):
+    """The cipher tokens or binary codes of one character, by index."""
+
+    def __len__(self) -> int:
+        ...
+
+    def __getitem__(self, index: int) -> Union[str, int]:
+        ...
+
+
+class Coverage(NamedTuple):
+    """How much of a message a key can encrypt instead of copying through.
+
+    ratio is the share of the message's characters, counted with repeats,
+    whose character has at least one position in the grid.
+    """
+
+    covered: FrozenSet[str]
+    missing: FrozenSet[str]
+    ratio: float
 
 
 class VerseKey:
-    """Class to process the verse and create a key table for ciphering."""
+    """Class to process the verse and create a key table for ciphering.
 
-    def __init__(self, verse: str, size: int = 10):
-        self.verse = verse
+    Word r of the verse fills row r of a grid of size rows and cols columns,
+    one character per cell, so the verse can be a whole book. The grid and
+    the positions of each character are stored packed as
+    (row - 1) * cols + (col - 1) in arrays; the dict lookups the cipher uses
+    are built from them on first use.
+
+    Raises:
+        ValueError: If the grid has no cells or more than MAX_GRID_CELLS.
+    """
+
+    # Declared here because from_file() and load() fill them without __init__.
+    size: int
+    cols: int
+    verse: str
+    grid: Cells
+    positions: Dict[str, Cells]
+
+    def __init__(self, verse: str, size: int = 10, cols: Optional[int] = None):
         self.size = size
-        self.key_table = self._create_key_table()
-
-    def _create_key_table(self) -> Dict[str, List[Tuple[int, int]]]:
-        """Create a key table mapping each character to its positions."""
-        table = {}
-        words = self.verse.split()
-        for row, word in enumerate(words[:self.size]):
-            for col, char in enumerate(word[:self.size]):
-                if char not in table:
-                    table[char] = []
-                table[char].append((row + 1, col + 1))
-        return table
+        self.cols = cols or size
+        _check_grid(self.size, self.cols)
+        chunks = (
+            verse[start:start + KEY_CHUNK_SIZE]
+            for start in range(0, len(verse), KEY_CHUNK_SIZE)
+        )
+        with instrumentation.stage('key_table'):
+            self._build(islice(_iter_words(chunks), size))
+
+    @classmethod
+    def from_file(
+        cls,
+        path: Union[str, 'os.PathLike[str]'],
+        size: int = 10,
+        cols: Optional[int] = None,
+        encoding: str = 'utf-8',
+    ) -> 'VerseKey':
+        """Build a key from a text file, reading only as far as the grid needs."""
+        key = cls.__new__(cls)
+        key.size = size
+        key.cols = cols or size
+        _check_grid(key.size, key.cols)
+        with open(path, encoding=encoding) as reader:
+            chunks = iter(lambda: reader.read(KEY_CHUNK_SIZE), '')
+            with instrumentation.stage('key_table'):
+                key._build(islice(_iter_words(chunks), size))
+        return key
+
+    def _build(self, words: Iterable[str]) -> None:
+        """Fill the grid and the position arrays from the words of the rows."""
+        cols = self.cols
+        grid: Cells = array(_CELL, bytes(_CELL_BYTES * self.size * cols))
+        positions: Dict[str, Cells] = {}
+        used = []
+        for row, word in enumerate(words):
+            used.append(word)
+            for col, char in enumerate(word[:cols]):
+                cell = row * cols + col
+                grid[cell] = ord(char)
+                cells = positions.get(char)
+                if cells is None:
+                    cells = positions[char] = array(_CELL)
+                cells.append(cell)
+        # The words actually used rebuild the same grid, without the rest of
+        # a book that was streamed in.
+        self.verse = ' '.join(used)
+        self.grid = grid
+        self.positions = positions
+
+    def save(self, path: Union[str, 'os.PathLike[str]']) -> None:
+        """Save the built key as a binary index that load() reads back."""
+        chars = array(_CELL, (ord(char) for char in self.positions))
+        counts = array(_CELL, (len(cells) for cells in self.positions.values()))
+        cells = array(_CELL)
+        for positions in self.positions.values():
+            cells.extend(positions)
+        verse = self.verse.encode('utf-8')
+        with open(path, 'wb') as writer:
+            writer.write(_INDEX_HEADER.pack(
+                INDEX_MAGIC, INDEX_VERSION, self.size, self.cols, len(chars),
+                len(cells), len(verse),
+            ))
+            writer.write(verse)
+            for table in (self.grid, chars, counts, cells):
+                writer.write(_little_endian(table))
+
+    @classmethod
+    def load(cls, path: Union[str, 'os.PathLike[str]']) -> 'VerseKey':
+        """Load a key saved by save() without rebuilding it from the verse.
+
+        Raises:
+            ValueError: If the file is not a key index of this version.
+        """
+        with open(path, 'rb') as reader:
+            header = reader.read(_INDEX_HEADER.size)
+            if len(header) < _INDEX_HEADER.size:
+                raise ValueError('Not a verse key index: file is too short')
+            magic, version, size, cols, distinct, total, verse_length = (
+                _INDEX_HEADER.unpack(header)
+            )
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise ValueError('Not a verse key index of this version')
+            _check_grid(size, cols)
+            verse = reader.read(verse_length).decode('utf-8')
+            grid = _read_cells(reader, size * cols)
+            chars = _read_cells(reader, distinct)
+            counts = _read_cells(reader, distinct)
+            cells = _read_cells(reader, total)
+        key = cls.__new__(cls)
+        key.size = size
+        key.cols = cols
+        key.verse = verse
+        key.grid = grid
+        key.positions = {}
+        start = 0
+        for char, count in zip(chars, counts):
+            key.positions[chr(char)] = cells[start:start + count]
+            start += count
+        return key
+
+    def coverage(self, message: str) -> Coverage:
+        """Report which characters of a message the key can encrypt.
+
+        Characters without a position, whitespace always among them, are
+        copied into the cipher text unchanged.
+        """
+        counts = Counter(message)
+        covered = frozenset(char for char in counts if char in self.positions)
+        hits = sum(counts[char] for char in covered)
+        return Coverage(
+            covered,
+            frozenset(counts).difference(covered),
+            hits / len(message) if message else 1.0,
+        )
+
+    @property
+    def binary_capable(self) -> bool:
+        """Whether every position fits the one-byte binary format."""
+        return self.size <= MAX_BINARY_SIZE and self.cols <= MAX_BINARY_SIZE
+
+    def _cell(self, row: int, col: int) -> int:
+        """Return the packed cell of a 1-based position, or -1 off the grid."""
+        if 1 <= row <= self.size and 1 <= col <= self.cols:
+            return (row - 1) * self.cols + col - 1
+        return -1
+
+    @cached_property
+    def key_table(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Map each character to its positions."""
+        cols = self.cols
+        return {
+            char: [(cell // cols + 1, cell % cols + 1) for cell in cells]
+            for char, cells in self.positions.items()
+        }
+
+    @cached_property
+    def reverse_table(self) -> Dict[Tuple[int, int], str]:
+        """Map each position to its character."""
+        return {
+            position: char
+            for char, positions in self.key_table.items()
+            for position in positions
+        }
+
+    @cached_property
+    def token_table(self) -> Dict[str, str]:
+        """Map each 'row/col' cipher token to its character."""
+        with instrumentation.stage('key_table'):
+            return {
+                f'{row}/{col}': char for (row, col), char in self.reverse_table.items()
+            }
+
+    @cached_property
+    def char_tokens(self) -> Dict[str, Tuple[str, ...]]:
+        """Map each character to the 'row/col' tokens of its positions."""
+        with instrumentation.stage('key_table'):
+            return {
+                char: tuple(f'{row}/{col}' for row, col in positions)
+                for char, positions in self.key_table.items()
+            }
+
+    @cached_property
+    def char_codes(self) -> Dict[str, bytes]:
+        """Map each character to the packed bytes of its positions.
+
+        In the binary format a position is (row - 1) << 4 | (col - 1), so the
+        table is empty for grids that do not fit it.
+        """
+        if not self.binary_capable:
+            return {}
+        return {
+            char: bytes((row - 1) << 4 | (col - 1) for row, col in positions)
+            for char, positions in self.key_table.items()
+        }
+
+    @cached_property
+    def code_table(self) -> Dict[int, str]:
+        """Map each packed binary position to its character."""
+        return {
+            code: char
+            for char, codes in self.char_codes.items()
+            for code in codes
+        }
+
+    @cached_property
+    def valid_codes(self) -> bytes:
+        """All packed binary positions of the grid, sorted."""
+        return bytes(sorted(self.code_table))
+
+    def homophones(
+        self, message: str, binary: bool = False
+    ) -> Mapping[str, Homophones]:
+        """Return the cipher tokens or codes of every character of a message.
+
+        Small grids share one prebuilt table; large grids get the tokens of the
+        message's characters only, formatted from their cells when used.
+        """
+        if binary:
+            return self.char_codes
+        if self.size * self.cols <= TOKEN_TABLE_CELLS:
+            return self.char_tokens
+        return {
+            char: _CellTokens(self.positions[char], self.cols)
+            for char in set(message).intersection(self.positions)
+        }
 
     def get_char_positions(self, char: str) -> Optional[List[Tuple[int, int]]]:
         """Return positions of a character in the key table."""
         return self.key_table.get(char)
 
+    def get_char(self, row: int, col: int) -> Optional[str]:
+        """Return the character at a position of the key table."""
+        cell = self._cell(row, col)
+        if cell < 0 or not self.grid[cell]:
+            return None
+        return chr(self.grid[cell])
+
+    def get_token_char(self, token: str) -> Optional[str]:
+        """Return the character encoded by a 'row/col' cipher token."""
+        if self.size * self.cols <= TOKEN_TABLE_CELLS:
+            return self.token_table.get(token)
+        try:
+            row, col = map(int, token.split('/'))
+        except ValueError:
+            return None
+        if f'{row}/{col}' != token:
+            return None
+        return self.get_char(row, col)
+
+
+class _CellTokens:
+    """The 'row/col' tokens of packed cells, formatted when indexed."""
+
+    __slots__ = ('cells', 'cols')
+
+    def __init__(self, cells: Cells, cols: int):
+        self.cells = cells
+        self.cols = cols
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, index: int) -> str:
+        row, col = divmod(self.cells[index], self.cols)
+        return f'{row + 1}/{col + 1}'
+
 
 class VerseCipher:
     """Class for encrypting and decrypting messages using a verse as key."""
 
-    def __init__(self, verse_key: VerseKey):
+    def __init__(self, verse_key: VerseKey, seed: Optional[int] = None):
         self.verse_key = verse_key
+        self._rng = random.Random(seed)
+
+    @overload
+    def encrypt(self, message: str, binary: Literal[False] = False) -> str:
+        ...
+
+    @overload
+    def encrypt(self, message: str, binary: Literal[True]) -> bytes:
+        ...
+
+    @overload
+    def encrypt(self, message: str, binary: bool) -> Union[str, bytes]:
+        ...
+
+    def encrypt(self, message: str, binary: bool = False) -> Union[str, bytes]:
+        """Encrypt a message using the verse key.
+
+        Each character starts at a random one of its positions and then cycles
+        through all of them, so repeated characters use every homophone.
+        The text format joins 'row/col' tokens with ', '; the binary format
+        packs each position into one byte and requires a grid of at most 15x15.
+        """
+        if binary and not self.verse_key.binary_capable:
+            raise ValueError(
+                f'Binary format supports grids up to {MAX_BINARY_SIZE} rows and columns'
+            )
+        homophones = self.verse_key.homophones(message, binary)
+        cursors: Dict[str, int] = {}
+        randrange = self._rng.randrange
+        encrypted: List[Union[str, int]] = []
+        instrumentation.count('chars', len(message))
+        with instrumentation.stage('lookup'):
+            for char in message:
+                choices = homophones.get(char)
+                if choices:
+                    cursor = cursors.get(char)
+                    if cursor is None:
+                        cursor = randrange(len(choices))
+                    encrypted.append(choices[cursor % len(choices)])
+                    cursors[char] = cursor + 1
+                elif binary:
+                    encrypted.append(BINARY_ESCAPE)
+                    encrypted.extend(char.encode('utf-8'))
+                else:
+                    encrypted.append(char)
+        with instrumentation.stage('assemble'):
+            if binary:
+                return bytes(cast(List[int], encrypted))
+            return ', '.join(cast(List[str], encrypted))
+
+    def decrypt(self, cipher_text: Union[str, bytes]) -> str:
+        """Decrypt a text or binary cipher text using the verse key.
+
+        Raises:
+            ValueError: If a token is not a valid position of the key table.
+        """
+        return ''.join(self.iter_decrypt([cipher_text]))
+
+    def iter_decrypt(self, chunks: Iterable[Union[str, bytes]]) -> Iterator[str]:
+        """Decrypt a cipher text delivered in chunks of any size.
+
+        The format is detected from the first chunk: str chunks are parsed as
+        text tokens and bytes chunks as the binary format.
+
+        Raises:
+            ValueError: If a token is not a valid position of the key table.
+        """
+        chunks = iter(chunks)
+        first = next(chunks, None)
+        if isinstance(first, bytes):
+            yield from self._iter_decrypt_binary(first, cast(Iterator[bytes], chunks))
+        elif first is not None:
+            yield from self._iter_decrypt_text(first, cast(Iterator[str], chunks))
 
-    def encrypt(self, message: str) -> str:
-        """Encrypt a message using the verse key."""
-        encrypted = []
-        for char in message:
-            positions = self.verse_key.get_char_positions(char)
-            if positions:
-                # Choose a random position for each character
-                encrypted.append(f"{positions[0][0]}/{positions[0][1]}")
-            else:
-                encrypted.append(f"{char}")
-        return ', '.join(encrypted)
-
-    def decrypt(self, cipher_text: str) -> str:
-        """Decrypt a cipher text using the verse key."""
+    def _iter_decrypt_text(self, carry: str, chunks: Iterator[str]) -> Iterator[str]:
+        """Decrypt ', '-separated text tokens, carrying partial tokens over."""
+        for chunk in chunks:
+            parts = (carry + chunk).split(', ')
+            carry = parts.pop()
+            yield self._decrypt_tokens(parts)
+        yield self._decrypt_tokens(carry.split(', '))
+
+    def _decrypt_tokens(self, parts: List[str]) -> str:
+        """Decrypt complete text tokens."""
+        get_token_char = self.verse_key.get_token_char
         decrypted = []
-        for part in cipher_text.split(', '):
-            if '/' in part:
-                row, col = map(int, part.split('/'))
-                for char, positions in self.verse_key.key_table.items():
-                    if (row, col) in positions:
-                        decrypted.append(char)
-                        break
-            else:
-                decrypted.append(part)
-        return ''.join(decrypted)
-
-
-# Example Usage
-verse = "Your chosen verse here"
-key = VerseKey(verse)
-cipher = VerseCipher(key)
-
-encrypted_message = cipher.encrypt("Your message here")
-print("Encrypted:", encrypted_message)
-
-decrypted_message = cipher.decrypt(encrypted_message)
-print("Decrypted:", decrypted_message)
+        with instrumentation.stage('lookup'):
+            for part in parts:
+                if len(part) <= 1:
+                    decrypted.append(part)
+                    continue
+                char = get_token_char(part)
+                if char is None:
+                    raise ValueError(
+                        f'Malformed coordinates in cipher text: {part!r}'
+                    )
+                decrypted.append(char)
+        instrumentation.count('chars', len(decrypted))
+        with instrumentation.stage('assemble'):
+            return ''.join(decrypted)
+
+    def _iter_decrypt_binary(
+        self, carry: bytes, chunks: Iterator[bytes]
+    ) -> Iterator[str]:
+        """Decrypt packed position bytes, carrying partial escapes over."""
+        for chunk in chunks:
+            decrypted, carry = self._decrypt_bytes(carry + chunk)
+            yield decrypted
+        decrypted, carry = self._decrypt_bytes(carry)
+        if carry:
+            raise ValueError('Truncated escape sequence in cipher text')
+        yield decrypted
+
+    def _decrypt_bytes(self, data: bytes) -> Tuple[str, bytes]:
+        """Decrypt packed bytes, returning the text and any incomplete tail."""
+        segments = data.split(bytes([BINARY_ESCAPE]))
+        decrypted = [self._decrypt_codes(segments[0])]
+        for number, segment in enumerate(segments[1:], 2):
+            length = _utf8_length(segment[0]) if segment else 1
+            if len(segment) < length:
+                if number == len(segments):
+                    return ''.join(decrypted), bytes([BINARY_ESCAPE]) + segment
+                raise ValueError('Truncated escape sequence in cipher text')
+            decrypted.append(segment[:length].decode('utf-8'))
+            decrypted.append(self._decrypt_codes(segment[length:]))
+        return ''.join(decrypted), b''
+
+    def _decrypt_codes(self, codes: bytes) -> str:
+        """Decrypt a run of packed positions without escapes."""
+        invalid = codes.translate(None, self.verse_key.valid_codes)
+        if invalid:
+            raise ValueError(
+                f'Malformed coordinates in cipher text: {invalid[0]:#04x}'
+            )
+        instrumentation.count('chars', len(codes))
+        with instrumentation.stage('lookup'):
+            return codes.decode('latin-1').translate(self.verse_key.code_table)
+
+
+def _check_grid(size: int, cols: int) -> None:
+    """Reject grid dimensions that are not positive or exceed MAX_GRID_CELLS."""
+    if size < 1 or cols < 1:
+        raise ValueError(
+            f'Key table needs at least one row and column, not {size}x{cols}'
+        )
+    if size * cols > MAX_GRID_CELLS:
+        raise ValueError(f'Key table of {size}x{cols} exceeds {MAX_GRID_CELLS} cells')
+
+
+def _iter_words(chunks: Iterable[str]) -> Iterator[str]:
+    """Split text delivered in chunks into words, joining words cut in two."""
+    carry = ''
+    for chunk in chunks:
+        words = (carry + chunk).split()
+        carry = ''
+        if words and not chunk[-1].isspace():
+            carry = words.pop()
+        yield from words
+    if carry:
+        yield carry
+
+
+def _little_endian(cells: Cells) -> bytes:
+    """Return the bytes of a cell array in little-endian order."""
+    if sys.byteorder == 'big':
+        cells = array(_CELL, cells)
+        cells.byteswap()
+    return cells.tobytes()
+
+
+def _read_cells(reader: BinaryIO, count: int) -> Cells:
+    """Read count little-endian cells from a key index."""
+    data = reader.read(count * _CELL_BYTES)
+    if len(data) < count * _CELL_BYTES:
+        raise ValueError('Verse key index is truncated')
+    cells = array(_CELL, data)
+    if sys.byteorder == 'big':
+        cells.byteswap()
+    return cells
+
+
+def _utf8_length(lead: int) -> int:
+    """Return the length of the UTF-8 sequence started by a lead byte."""
+    if lead < 0x80:
+        return 1
+    if lead < 0xE0:
+        return 2
+    if lead < 0xF0:
+        return 3
+    return 4
+
+
+if __name__ == "__main__":
+    # Example Usage
+    verse = "Your chosen verse here"
+    key = VerseKey(verse)
+    cipher = VerseCipher(key)
+
+    encrypted_message = cipher.encrypt("Your message here")
+    print("Encrypted:", encrypted_message)
+
+    decrypted_message = cipher.decrypt(encrypted_message)
+    print("Decrypted:", decrypted_message)
@@ -0,0 +1,322 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+import instrumentation
+from main import MAX_BINARY_SIZE, VerseCipher, VerseKey
+
+MAX_BODY_SIZE = 64 * 1024**2
+QUEUE_SIZE = 256
+BATCH_SIZE = 32
+BATCH_CHARS = 1024**2
+# The largest key table a request may ask for, in rows and in columns, so one
+# request cannot make a worker allocate an unbounded grid.
+MAX_KEY_SIZE = 1024
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    503: 'Service Unavailable',
+}
+
+
+class HttpError(Exception):
+    """An error that is reported to the client as an HTTP status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.status = status
+
+
+class Job(NamedTuple):
+    """A single encryption or decryption request."""
+
+    action: str
+    verse: str
+    size: int
+    binary: bool
+    text: Union[str, bytes]
+    cols: Optional[int] = None
+
+
+@lru_cache(maxsize=64)
+def _verse_key(verse: str, size: int, cols: Optional[int]) -> VerseKey:
+    """Build a verse key once per worker and reuse it for later requests."""
+    return VerseKey(verse, size, cols)
+
+
+instrumentation.register_cache('verse_key', _verse_key)
+
+
+def run_batch(jobs: List[Job]) -> List[Union[str, bytes, ValueError]]:
+    """Process a batch of jobs in a worker process.
+
+    Invalid keys and malformed cipher texts are returned as their ValueError
+    instead of failing the whole batch.
+    """
+    results: List[Union[str, bytes, ValueError]] = []
+    for job in jobs:
+        try:
+            cipher = VerseCipher(_verse_key(job.verse, job.size, job.cols))
+            if job.action == 'encrypt':
+                results.append(cipher.encrypt(str(job.text), job.binary))
+            else:
+                results.append(cipher.decrypt(job.text))
+        except ValueError as error:
+            results.append(error)
+    return results
+
+
+def parse_job(method: str, target: str, body: bytes) -> Job:
+    """Build a job from an HTTP request.
+
+    Requests look like `POST /encrypt?verse=...&size=10&cols=12&binary=1` with
+    the message as body; cols defaults to size. Binary cipher texts are sent
+    and returned as raw bytes.
+
+    Raises:
+        HttpError: If the request is not a valid job.
+    """
+    url = urlsplit(target)
+    action = url.path.strip('/')
+    if action not in ('encrypt', 'decrypt'):
+        raise HttpError(404, f'Unknown endpoint {url.path}')
+    if method != 'POST':
+        raise HttpError(405, 'Use POST')
+    params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+    try:
+        verse = params['verse']
+        size = int(params.get('size', '10'))
+        cols = int(params['cols']) if 'cols' in params else None
+        binary = params.get('binary', '0') == '1'
+        text: Union[str, bytes] = body
+        if not (binary and action == 'decrypt'):
+            text = body.decode('utf-8')
+    except (KeyError, ValueError) as error:
+        raise HttpError(400, f'Invalid request: {error}') from None
+    for name, value in (('size', size), ('cols', cols)):
+        if value is not None and not 1 <= value <= MAX_KEY_SIZE:
+            raise HttpError(400, f'{name} must be between 1 and {MAX_KEY_SIZE}')
+    if binary and max(size, cols or size) > MAX_BINARY_SIZE:
+        raise HttpError(400, f'Binary format supports sizes up to {MAX_BINARY_SIZE}')
+    return Job(action, verse, size, binary, text, cols)
+
+
+class CipherService:
+    """Asyncio HTTP front end that batches cipher jobs onto a process pool.
+
+    Jobs wait in a bounded queue. Whenever a worker is free, the batcher takes
+    every queued job (up to the batch limits) and sends them as one task, so
+    batches grow with the load. A full queue is answered with 503.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: int = QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        batch_chars: int = BATCH_CHARS,
+        max_body_size: int = MAX_BODY_SIZE,
+    ) -> None:
+        """Initialize the service."""
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_chars = batch_chars
+        self.max_body_size = max_body_size
+        self.queue: asyncio.Queue[Tuple[Job, asyncio.Future]] = asyncio.Queue(
+            queue_size
+        )
+        # Forked workers would inherit the sockets of open connections and keep
+        # them alive after the server closes them, so workers are spawned.
+        self._executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context('spawn')
+        )
+        self._slots = asyncio.Semaphore(self.workers)
+        self._tasks: Set[asyncio.Task] = set()
+        self.servers: List[asyncio.Server] = []
+
+    async def submit(self, job: Job) -> Union[str, bytes]:
+        """Queue a job and wait for its result.
+
+        Raises:
+            HttpError: If the queue is full or the job fails.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((job, future))
+        except asyncio.QueueFull:
+            raise HttpError(503, 'Server is busy, retry later') from None
+        return await future
+
+    async def _batcher(self) -> None:
+        """Group queued jobs into batches and dispatch them to free workers."""
+        while True:
+            batch = [await self.queue.get()]
+            await self._slots.acquire()
+            chars = len(batch[0][0].text)
+            while (
+                len(batch) < self.batch_size
+                and chars < self.batch_chars
+                and not self.queue.empty()
+            ):
+                batch.append(self.queue.get_nowait())
+                chars += len(batch[-1][0].text)
+            task = asyncio.create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Job, asyncio.Future]]) -> None:
+        """Run a batch on the process pool and resolve its futures."""
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self._executor, run_batch, [job for job, _ in batch]
+            )
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    if isinstance(result, ValueError):
+                        future.set_exception(HttpError(400, str(result)))
+                    else:
+                        future.set_result(result)
+        finally:
+            self._slots.release()
+
+    async def _read_body(
+        self, reader: asyncio.StreamReader, headers: Dict[str, str]
+    ) -> bytes:
+        """Read a Content-Length or chunked request body."""
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks: List[bytes] = []
+            size = 0
+            while True:
+                line = await reader.readuntil(b'\r\n')
+                length = int(line.split(b';')[0], 16)
+                if length == 0:
+                    while await reader.readuntil(b'\r\n') != b'\r\n':
+                        pass
+                    return b''.join(chunks)
+                size += length
+                if size > self.max_body_size:
+                    raise HttpError(413, 'Request body is too large')
+                chunks.append(await reader.readexactly(length))
+                await reader.readexactly(2)
+        length = int(headers.get('content-length', '0'))
+        if length > self.max_body_size:
+            raise HttpError(413, 'Request body is too large')
+        return await reader.readexactly(length)
+
+    async def _handle_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[int, Union[str, bytes], bool]]:
+        """Read one request and produce its status, body and keep-alive flag."""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            return 400, 'Malformed request line', False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        try:
+            body = await self._read_body(reader, headers)
+            job = parse_job(method, target, body)
+            return 200, await self.submit(job), keep_alive
+        except HttpError as error:
+            return error.status, str(error), keep_alive and error.status != 413
+        except ValueError:
+            return 400, 'Malformed request body', False
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve HTTP/1.1 requests on one connection until it is closed."""
+        try:
+            while True:
+                response = await self._handle_request(reader)
+                if response is None:
+                    break
+                status, text, keep_alive = response
+                if isinstance(text, bytes):
+                    payload, content_type = text, 'application/octet-stream'
+                else:
+                    payload = text.encode('utf-8')
+                    content_type = 'text/plain; charset=utf-8'
+                writer.write(
+                    f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                    f'Content-Type: {content_type}\r\n'
+                    f'Content-Length: {len(payload)}\r\n'
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    '\r\n'.encode('latin-1') + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+        ):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(
+        self, host: str = '127.0.0.1', port: int = 8000, unix: Optional[str] = None
+    ) -> None:
+        """Serve requests until cancelled."""
+        batcher = asyncio.create_task(self._batcher())
+        if unix is not None:
+            server = await asyncio.start_unix_server(self.handle_connection, unix)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        self.servers.append(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self._executor.shutdown(cancel_futures=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m service',
+        description='Serve verse cipher encryption over local HTTP.',
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--unix', help='listen on a Unix-domain socket path')
+    parser.add_argument('-j', '--workers', type=int, help='worker processes')
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    service = CipherService(args.workers, args.queue_size, args.batch_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import io
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+import cache as cache_module
+from cache import SALT_BYTES, ResultCache, file_digest
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, 'cache.db')
+
+    def test_lru(self):
+        """Test hits, misses and eviction of the least recently used results."""
+        with ResultCache(self.path, max_bytes=10) as cache:
+            self.assertIsNone(cache.get(b'a'))
+            self.assertTrue(cache.put(b'a', b'1234'))
+            self.assertTrue(cache.put(b'b', b'5678'))
+            self.assertEqual(cache.get(b'a'), b'1234')
+            self.assertTrue(cache.put(b'c', b'90'))
+            self.assertTrue(cache.put(b'd', b'xyz'))
+            self.assertIsNone(cache.get(b'b'))
+            self.assertEqual(cache.get(b'a'), b'1234')
+            self.assertFalse(cache.put(b'e', b'x' * 11))
+            info = cache.cache_info()
+        self.assertEqual(
+            (info.hits, info.misses, info.evictions, info.entries, info.size),
+            (2, 2, 1, 3, 9),
+        )
+
+    def test_keys_hide_parameters(self):
+        """Test that keys are salted by a private key file outside the database."""
+        secret = 'Shall I compare thee'
+        with ResultCache(self.path) as cache:
+            key = cache.key(b'digest', verse=secret, size=12)
+            self.assertNotEqual(key, cache.key(b'digest', verse=secret, size=11))
+            cache.put(key, b'cipher text')
+        key_path = self.path + '.key'
+        with open(key_path, 'rb') as reader:
+            salt = reader.read()
+        self.assertEqual(len(salt), SALT_BYTES)
+        if os.name == 'posix':
+            self.assertEqual(stat.S_IMODE(os.stat(key_path).st_mode), 0o600)
+        with open(self.path, 'rb') as reader:
+            data = reader.read()
+        self.assertNotIn(secret.encode('utf-8'), data)
+        self.assertNotIn(salt, data)
+        with ResultCache(self.path) as cache:
+            self.assertEqual(cache.get(key), b'cipher text')
+        other = os.path.join(self.directory, 'other.key')
+        with ResultCache(self.path, key_path=other) as cache:
+            self.assertNotEqual(cache.key(b'digest', verse=secret, size=12), key)
+        with open(other, 'wb') as writer:
+            writer.write(b'short')
+        with self.assertRaises(ValueError):
+            ResultCache(self.path, key_path=other)
+
+    def test_streaming(self):
+        """Test that files are stored and read back in chunks."""
+        source = os.path.join(self.directory, 'source')
+        with mock.patch.object(cache_module, 'COPY_CHUNK_SIZE', 1000):
+            with ResultCache(self.path) as cache:
+                for name, value in ((b'big', os.urandom(4500)), (b'empty', b'')):
+                    with open(source, 'wb') as writer:
+                        writer.write(value)
+                    with self.subTest(name=name):
+                        self.assertTrue(cache.put_file(name, source))
+                        writer = io.BytesIO()
+                        self.assertTrue(cache.get_file(name, writer))
+                        self.assertEqual(writer.getvalue(), value)
+                writer = io.BytesIO()
+                self.assertFalse(cache.get_file(b'missing', writer))
+                self.assertEqual(writer.getvalue(), b'')
+        self.assertEqual(len(file_digest(source)), 32)
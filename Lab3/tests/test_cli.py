@@ -0,0 +1,111 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from cache import ResultCache
+from cli import FileJob, main, process_file
+
+VERSE = 'Shall I compare thee to a summers day thou art more lovely'
+TEXTS = {
+    'a.txt': 'Thou art more lovely and more temperate\n',
+    'sub/b.txt': 'Rough winds do shake the darling buds of May, 🌞\n',
+}
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        for name, text in TEXTS.items():
+            path = self.root / 'plain' / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding='utf-8')
+
+    def run_cli(self, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main([*args, '-j', '2'])
+        return output.getvalue()
+
+    def assertRestored(self, directory):
+        for name, text in TEXTS.items():
+            path = self.root / directory / name
+            self.assertEqual(path.read_text(encoding='utf-8'), text)
+
+    def test_round_trip(self):
+        """Test text, binary and container round trips of a directory."""
+        for number, options in enumerate(
+            ([], ['-b'], ['-c'], ['-c', '-b', '--cols', '14'])
+        ):
+            encrypted = str(self.root / f'enc{number}')
+            decrypted = f'dec{number}'
+            with self.subTest(options=options):
+                self.run_cli(
+                    'encrypt', str(self.root / 'plain'), '-o', encrypted,
+                    '-v', VERSE, '-s', '12', *options,
+                )
+                self.run_cli(
+                    'decrypt', encrypted, '-o', str(self.root / decrypted),
+                    '-v', VERSE, '-s', '12', *options,
+                )
+                self.assertRestored(decrypted)
+
+    def test_key_index(self):
+        """Test that a key saved from a verse file decrypts on its own."""
+        verse_file = self.root / 'verse.txt'
+        verse_file.write_text(VERSE, encoding='utf-8')
+        index = str(self.root / 'key.vkix')
+        self.run_cli(
+            'encrypt', str(self.root / 'plain'), '-o', str(self.root / 'enc'),
+            '-f', str(verse_file), '-k', index, '-s', '12',
+        )
+        self.run_cli(
+            'decrypt', str(self.root / 'enc'), '-o', str(self.root / 'dec'),
+            '-k', index,
+        )
+        self.assertRestored('dec')
+
+    def test_cache(self):
+        """Test that encrypted outputs are reused and decrypted ones never cached."""
+        cache = str(self.root / 'cache.db')
+        encrypt = [
+            'encrypt', str(self.root / 'plain'), '-o', str(self.root / 'enc'),
+            '-v', VERSE, '--cache', cache,
+        ]
+        self.assertIn('Cache: 0 hits, 2 misses', self.run_cli(*encrypt))
+        first = sorted((self.root / 'enc').rglob('*.txt'))
+        outputs = [path.read_bytes() for path in first]
+        self.assertIn('Cache: 2 hits, 0 misses', self.run_cli(*encrypt))
+        self.assertEqual([path.read_bytes() for path in first], outputs)
+        self.assertIn(
+            'never cached',
+            self.run_cli(
+                'decrypt', str(self.root / 'enc'), '-o', str(self.root / 'dec'),
+                '-v', VERSE, '--cache', cache,
+            ),
+        )
+        self.assertRestored('dec')
+        job = FileJob(
+            self.root / 'enc' / 'a.txt', self.root / 'out.txt', VERSE, 10, True,
+            False, cache=Path(cache),
+        )
+        self.assertIsNone(process_file(job).cached)
+        self.assertEqual(job.target.read_text(encoding='utf-8'), TEXTS['a.txt'])
+        with ResultCache(cache) as stored:
+            self.assertEqual(stored.cache_info().entries, 2)
+
+    def test_errors(self):
+        """Test that missing keys and inputs are reported as usage errors."""
+        for args in (
+            ['encrypt', str(self.root / 'plain'), '-o', str(self.root / 'enc')],
+            ['encrypt', str(self.root / 'none'), '-o', str(self.root), '-v', VERSE],
+            ['encrypt', str(self.root / 'plain'), '-o', str(self.root), '-v', VERSE,
+             '-s', '0'],
+        ):
+            with self.subTest(args=args):
+                with contextlib.redirect_stderr(io.StringIO()):
+                    with self.assertRaises(SystemExit):
+                        main(args)
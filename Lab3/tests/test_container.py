@@ -0,0 +1,88 @@
+import io
+import os
+import tempfile
+import unittest
+
+from container import (
+    ContainerError,
+    Header,
+    read_container,
+    scan,
+    write_container,
+)
+from main import VerseKey
+
+VERSE = 'Shall I compare thee to a summers day thou art more lovely'
+TEXT = 'Thou art more lovely and more temperate, rough winds do shake. ' * 40
+
+
+class TestContainer(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'text.sslc')
+
+    def read(self, **kwargs):
+        writer = io.StringIO()
+        chars = read_container(self.path, writer, VERSE, **kwargs)
+        self.assertEqual(chars, len(writer.getvalue()))
+        return writer.getvalue()
+
+    def test_round_trip(self):
+        """Test text and binary containers of square and rectangular grids."""
+        for binary, size, cols in ((True, 12, None), (False, 12, None), (True, 6, 15)):
+            key = VerseKey(VERSE, size, cols)
+            with self.subTest(binary=binary, size=size, cols=cols):
+                chars = write_container(
+                    io.StringIO(TEXT), self.path, key, binary, block_chars=100
+                )
+                self.assertEqual(chars, len(TEXT))
+                header = scan(self.path).header
+                self.assertEqual(header, Header(size, binary, cols=cols))
+                self.assertEqual(self.read(), TEXT)
+                self.assertEqual(self.read(jobs=2), TEXT)
+
+    def test_resume(self):
+        """Test that an interrupted container is read partially and resumed."""
+        key = VerseKey(VERSE, 12)
+        write_container(io.StringIO(TEXT), self.path, key, block_chars=100)
+        found = scan(self.path)
+        self.assertTrue(found.complete)
+        # Cut the container in the middle of the sixth block.
+        with open(self.path, 'r+b') as writer:
+            writer.truncate(found.end // 2)
+        found = scan(self.path)
+        self.assertFalse(found.complete)
+        with self.assertRaises(ContainerError):
+            self.read()
+        self.assertEqual(self.read(partial=True), TEXT[:found.chars])
+        with self.assertRaises(ContainerError):
+            write_container(
+                io.StringIO(TEXT), self.path, VerseKey(VERSE, 11), resume=True
+            )
+        write_container(
+            io.StringIO(TEXT), self.path, key, block_chars=100, resume=True
+        )
+        self.assertEqual(self.read(), TEXT)
+        with self.assertRaises(ContainerError):
+            write_container(io.StringIO(TEXT), self.path, key, resume=True)
+
+    def test_corrupt(self):
+        """Test that damaged headers and blocks are rejected."""
+        write_container(
+            io.StringIO(TEXT), self.path, VerseKey(VERSE, 12), block_chars=100
+        )
+        with open(self.path, 'rb') as reader:
+            data = reader.read()
+        middle = len(data) // 2
+        for name, content in {
+            'short': data[:3],
+            'bad magic': b'XXXX' + data[4:],
+            'bad version': data[:4] + b'\x02' + data[5:],
+            'bad block': data[:middle] + bytes([data[middle] ^ 1]) + data[middle + 1:],
+        }.items():
+            with open(self.path, 'wb') as writer:
+                writer.write(content)
+            with self.subTest(name=name):
+                with self.assertRaises(ContainerError):
+                    self.read()
@@ -0,0 +1,208 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+from main import BINARY_ESCAPE, INDEX_MAGIC, MAX_GRID_CELLS, VerseCipher, VerseKey
+
+VERSE = 'Shall I compare thee to a summers day thou art more lovely'
+
+
+class TestVerseKey(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def assertSameKey(self, first, second):
+        self.assertEqual(
+            (first.verse, first.size, first.cols, first.key_table),
+            (second.verse, second.size, second.cols, second.key_table),
+        )
+        self.assertEqual(first.grid, second.grid)
+
+    def test_rectangular_grid(self):
+        """Test that rows hold one word each, cut to the number of columns."""
+        key = VerseKey(VERSE, 3, 5)
+        self.assertEqual((key.size, key.cols, key.verse), (3, 5, 'Shall I compare'))
+        self.assertEqual(key.get_char(1, 5), 'l')
+        self.assertEqual(key.get_char(3, 5), 'a')
+        self.assertIsNone(key.get_char(2, 2))
+        self.assertIsNone(key.get_char(4, 1))
+        self.assertIsNone(key.get_char(1, 6))
+        self.assertNotIn('r', key.positions)
+        self.assertEqual(key.get_char_positions('a'), [(1, 3), (3, 5)])
+        cipher = VerseCipher(key, seed=1)
+        self.assertEqual(cipher.decrypt(cipher.encrypt('campal')), 'campal')
+
+    def test_grid_bounds(self):
+        """Test that empty grids and grids over MAX_GRID_CELLS are rejected."""
+        for size, cols in ((0, None), (-1, None), (3, -1), (MAX_GRID_CELLS + 1, 1)):
+            with self.subTest(size=size, cols=cols):
+                with self.assertRaises(ValueError):
+                    VerseKey(VERSE, size, cols)
+        self.assertEqual(VerseKey(VERSE, 2, 0).cols, 2)
+
+    def test_from_file(self):
+        """Test that a key read from a file in chunks matches one from a string."""
+        path = self.path('verse.txt')
+        with open(path, 'w', encoding='utf-8') as writer:
+            writer.write(VERSE.replace(' ', ' \n  ') + '\n')
+        # Small chunks cut words in two, which must be joined again.
+        with mock.patch.object(main, 'KEY_CHUNK_SIZE', 3):
+            for size, cols in ((5, None), (12, 8), (40, 3)):
+                with self.subTest(size=size, cols=cols):
+                    key = VerseKey.from_file(path, size, cols)
+                    self.assertSameKey(key, VerseKey(VERSE, size, cols))
+        with self.assertRaises(ValueError):
+            VerseKey.from_file(path, 0)
+
+    def test_coverage(self):
+        """Test the characters a key covers and their share of a message."""
+        coverage = VerseKey(VERSE, 3).coverage('Shh, zzz!')
+        self.assertEqual(coverage.covered, frozenset('Sh'))
+        self.assertEqual(coverage.missing, frozenset(', z!'))
+        self.assertAlmostEqual(coverage.ratio, 3 / 9)
+        self.assertEqual(VerseKey(VERSE).coverage('').ratio, 1.0)
+
+    def test_save_load(self):
+        """Test that a saved key index loads back into the same key."""
+        for size, cols in ((12, None), (3, 5), (100, 40)):
+            path = self.path(f'{size}x{cols}.vkix')
+            key = VerseKey(VERSE + ' Zoë 🌞', size, cols)
+            key.save(path)
+            loaded = VerseKey.load(path)
+            with self.subTest(size=size, cols=cols):
+                self.assertSameKey(loaded, key)
+                cipher_text = VerseCipher(key, seed=1).encrypt(VERSE)
+                self.assertEqual(VerseCipher(loaded).decrypt(cipher_text), VERSE)
+
+    def test_load_corrupt(self):
+        """Test that files that are not complete key indexes are rejected."""
+        path = self.path('key.vkix')
+        VerseKey(VERSE, 4).save(path)
+        with open(path, 'rb') as reader:
+            data = reader.read()
+        header = main._INDEX_HEADER
+        fields = list(header.unpack(data[:header.size]))
+        corrupt = {
+            'empty': b'',
+            'short header': data[:header.size - 1],
+            'bad magic': b'XXXX' + data[len(INDEX_MAGIC):],
+            'bad version': data[:4] + bytes([main.INDEX_VERSION + 1]) + data[5:],
+            'truncated': data[:-1],
+            'empty grid': header.pack(*fields[:2], 0, *fields[3:]),
+        }
+        for name, content in corrupt.items():
+            with open(path, 'wb') as writer:
+                writer.write(content)
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError):
+                    VerseKey.load(path)
+
+
+class TestVerseCipher(unittest.TestCase):
+    def setUp(self):
+        self.key = VerseKey(VERSE, 12)
+
+    def test_round_trip(self):
+        """Test that decryption restores the message, spaces included."""
+        cipher = VerseCipher(self.key, seed=1)
+        message = 'I am a summer day'
+        self.assertEqual(cipher.decrypt(cipher.encrypt(message)), message)
+
+    def test_reverse_index(self):
+        """Test that every position of the key table decrypts to its character."""
+        # 100x100 grids parse tokens instead of building a token table.
+        for key in (self.key, VerseKey(VERSE, 100, 100)):
+            for (row, col), char in key.reverse_table.items():
+                with self.subTest(size=key.size, row=row, col=col):
+                    self.assertEqual(key.get_token_char(f'{row}/{col}'), char)
+            for token in ('0/1', '1/0', '101/1', '01/1', '1', 'a/b', '1/2/3'):
+                with self.subTest(size=key.size, token=token):
+                    self.assertIsNone(key.get_token_char(token))
+
+    def test_iter_decrypt_chunks(self):
+        """Test that tokens split across chunks of any size are carried over."""
+        cipher = VerseCipher(self.key, seed=2)
+        message = 'thou art more lovely than a summers day'
+        encrypted = cipher.encrypt(message)
+        for size in (1, 2, 3, 5, 8, len(encrypted)):
+            chunks = [
+                encrypted[start:start + size]
+                for start in range(0, len(encrypted), size)
+            ]
+            with self.subTest(size=size):
+                self.assertEqual(''.join(cipher.iter_decrypt(chunks)), message)
+        self.assertEqual(''.join(cipher.iter_decrypt([])), '')
+
+    def test_malformed_tokens(self):
+        """Test that tokens off the grid or not numeric are rejected."""
+        cipher = VerseCipher(self.key)
+        for cipher_text in ('1/1, 99/1', '1/1, x/y', '1/1, 1/1/1'):
+            with self.subTest(cipher_text=cipher_text):
+                with self.assertRaises(ValueError):
+                    cipher.decrypt(cipher_text)
+        with self.assertRaises(ValueError):
+            ''.join(cipher.iter_decrypt(['1/', '1, 0/', '3']))
+
+    def test_seeded_rotation(self):
+        """Test that a seed fixes the output and repeats cycle through homophones."""
+        message = 'eeeeeeeeee summer'
+        self.assertEqual(
+            VerseCipher(self.key, seed=3).encrypt(message),
+            VerseCipher(self.key, seed=3).encrypt(message),
+        )
+        homophones = self.key.char_tokens['e']
+        tokens = VerseCipher(self.key, seed=4).encrypt('e' * 10).split(', ')
+        start = homophones.index(tokens[0])
+        self.assertEqual(
+            tokens,
+            [homophones[(start + i) % len(homophones)] for i in range(10)],
+        )
+
+    def test_binary_round_trip(self):
+        """Test that characters off the grid are escaped in the binary format."""
+        cipher = VerseCipher(self.key, seed=5)
+        message = 'A summer day, Zoë: 5 € 🌞'
+        encrypted = cipher.encrypt(message, binary=True)
+        self.assertIsInstance(encrypted, bytes)
+        missing = self.key.coverage(message).missing
+        self.assertEqual(
+            encrypted.count(BINARY_ESCAPE), sum(char in missing for char in message)
+        )
+        self.assertEqual(cipher.decrypt(encrypted), message)
+        # One-byte chunks split every escape sequence.
+        chunks = [encrypted[i:i + 1] for i in range(len(encrypted))]
+        self.assertEqual(''.join(cipher.iter_decrypt(chunks)), message)
+
+    def test_binary_errors(self):
+        """Test that truncated escapes and codes off the grid are rejected."""
+        cipher = VerseCipher(self.key)
+        for cipher_text in (
+            bytes([BINARY_ESCAPE]),
+            bytes([BINARY_ESCAPE, 0xE2, 0x82]),
+            bytes([BINARY_ESCAPE, 0xE2, BINARY_ESCAPE, 0x41]),
+            bytes([0xEE]),
+        ):
+            with self.subTest(cipher_text=cipher_text):
+                with self.assertRaises(ValueError):
+                    cipher.decrypt(cipher_text)
+
+    def test_binary_limit(self):
+        """Test that the binary format needs a grid of at most 15x15."""
+        for size, cols in ((15, None), (4, 15), (15, 1)):
+            key = VerseKey(VERSE, size, cols)
+            with self.subTest(size=size, cols=cols):
+                self.assertTrue(key.binary_capable)
+                cipher = VerseCipher(key)
+                self.assertEqual(cipher.decrypt(cipher.encrypt(VERSE, True)), VERSE)
+        for size, cols in ((16, None), (4, 16), (16, 1)):
+            key = VerseKey(VERSE, size, cols)
+            with self.subTest(size=size, cols=cols):
+                self.assertFalse(key.binary_capable)
+                with self.assertRaises(ValueError):
+                    VerseCipher(key).encrypt('hello', binary=True)
@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+
+from main import VerseCipher, VerseKey
+from service import MAX_KEY_SIZE, CipherService, HttpError, Job, parse_job, run_batch
+
+VERSE = 'Shall I compare thee to a summers day thou art more lovely'
+
+
+class TestService(unittest.TestCase):
+    def test_parse_job(self):
+        """Test parsing of valid and invalid requests."""
+        self.assertEqual(
+            parse_job('POST', '/encrypt?verse=a+b&size=4&cols=6', b'ab'),
+            Job('encrypt', 'a b', 4, False, 'ab', 6),
+        )
+        for method, target, status in (
+            ('POST', '/encrypt', 400),
+            ('POST', '/encrypt?verse=a&size=x', 400),
+            ('POST', '/encrypt?verse=a&size=-1', 400),
+            ('POST', '/encrypt?verse=a&size=0', 400),
+            ('POST', f'/encrypt?verse=a&size={MAX_KEY_SIZE + 1}', 400),
+            ('POST', '/encrypt?verse=a&cols=0', 400),
+            ('POST', f'/encrypt?verse=a&cols={MAX_KEY_SIZE + 1}', 400),
+            ('POST', '/encrypt?verse=a&size=16&binary=1', 400),
+            ('POST', '/encrypt?verse=a&size=4&cols=16&binary=1', 400),
+            ('GET', '/decrypt?verse=a', 405),
+            ('POST', '/other?verse=a', 404),
+        ):
+            with self.subTest(target=target):
+                with self.assertRaises(HttpError) as context:
+                    parse_job(method, target, b'hello')
+                self.assertEqual(context.exception.status, status)
+
+    def test_bad_job_fails_alone(self):
+        """Test that an invalid job in a batch does not fail the others."""
+        cipher_text = VerseCipher(VerseKey(VERSE, 12), seed=1).encrypt('hello')
+        results = run_batch([
+            Job('encrypt', VERSE, -1, False, 'hello'),
+            Job('decrypt', VERSE, 12, False, cipher_text),
+            Job('decrypt', VERSE, 12, False, '99/99'),
+            Job('encrypt', VERSE, 12, False, 'hello', 0),
+        ])
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1], 'hello')
+        self.assertIsInstance(results[2], ValueError)
+        self.assertIsInstance(results[3], str)
+
+    def test_requests(self):
+        """Test a chunked request and an invalid one end to end over TCP."""
+
+        async def request(port: int, payload: bytes) -> bytes:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(payload)
+            response = await reader.read()
+            writer.close()
+            return response
+
+        async def scenario():
+            service = CipherService(workers=1)
+            server_task = asyncio.create_task(service.serve(port=0))
+            while not service.servers:
+                await asyncio.sleep(0.01)
+            port = service.servers[0].sockets[0].getsockname()[1]
+            encrypted = await request(
+                port,
+                b'POST /encrypt?verse=a+b+c&size=3 HTTP/1.1\r\n'
+                b'Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n'
+                b'2\r\nab\r\n1\r\nc\r\n0\r\n\r\n',
+            )
+            rejected = await request(
+                port,
+                b'POST /encrypt?verse=a&size=-1 HTTP/1.1\r\n'
+                b'Content-Length: 1\r\nConnection: close\r\n\r\na',
+            )
+            server_task.cancel()
+            return encrypted, rejected
+
+        encrypted, rejected = asyncio.run(scenario())
+        self.assertTrue(encrypted.startswith(b'HTTP/1.1 200 OK'))
+        self.assertTrue(encrypted.endswith(b'\r\n\r\n1/1, 2/1, 3/1'))
+        self.assertTrue(rejected.startswith(b'HTTP/1.1 400 Bad Request'))
+
+
+if __name__ == '__main__':
+    unittest.main()